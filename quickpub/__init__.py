@@ -2,6 +2,11 @@ from .structures import *
 from .strategies import *
 from .enforcers import ExitEarlyError
 from .qa import SupportsProgress
+from .qa_cache import QAResultCache
+from .env_capabilities import EnvCapabilities
+from .qa_history import QADurationHistory, PerTestDurationHistory
+from .qa_report import QAReport, QATaskResult, QATaskStatus
+from .test_impact import TestImpactAnalysis
 from .logging_ import set_log_level
 from .__main__ import publish, main
 
@@ -1,5 +1,9 @@
 import asyncio
+import functools
 import logging
+import os
+import shutil
+import tempfile
 import time
 from typing import Optional, Union, List, Any, Dict, Callable, Tuple
 
@@ -26,6 +30,11 @@ from .structures import Version, Dependency
 from .files import create_toml, create_setup, create_manifest, add_version_to_init
 from .classifiers import *
 from .qa import qa, SupportsProgress
+from .pipeline import Pipeline, run_in_thread
+from .env_capabilities import EnvCapabilities
+from .qa_cache import QAResultCache
+from .qa_history import QADurationHistory
+from .qa_report import QAReport
 from .logging_ import setup_logging
 
 setup_logging()
@@ -65,34 +74,48 @@ def _validate_publish_inputs(
     )
 
 
-def _run_constraint_enforcers(
+async def _run_constraint_enforcers(
     enforcers: Optional[List[ConstraintEnforcer]],
     name: str,
     version: Version,
     demo: bool,
 ) -> None:
-    for enforcer in enforcers or []:
-        enforcer.enforce(name=name, version=version, demo=demo)
+    await asyncio.gather(
+        *(
+            enforcer.enforce_async(name=name, version=version, demo=demo)
+            for enforcer in enforcers or []
+        )
+    )
 
 
-def _run_quality_assurance(
+async def _run_quality_assurance(
     python_interpreter_provider: PythonProvider,
     global_quality_assurance_runners: Optional[List[QualityAssuranceRunner]],
     name: str,
     explicit_src_folder_path: str,
     validated_dependencies: List[Dependency],
     pbar: Optional[SupportsProgress],
+    qa_cache: Optional[QAResultCache] = None,
+    qa_report: Optional[QAReport] = None,
+    fail_fast: bool = False,
+    num_workers: Optional[int] = None,
+    qa_history: Optional[QADurationHistory] = None,
+    env_capabilities: Optional[EnvCapabilities] = None,
 ) -> None:
     try:
-        result = asyncio.get_event_loop().run_until_complete(
-            qa(
-                python_interpreter_provider,
-                global_quality_assurance_runners or [],
-                name,
-                explicit_src_folder_path,
-                validated_dependencies,
-                pbar,
-            )
+        result = await qa(
+            python_interpreter_provider,
+            global_quality_assurance_runners or [],
+            name,
+            explicit_src_folder_path,
+            validated_dependencies,
+            pbar,
+            qa_cache,
+            qa_report,
+            fail_fast,
+            num_workers,
+            qa_history,
+            env_capabilities,
         )
         if not result:
             error(
@@ -121,8 +144,9 @@ def _create_package_files(
     validated_dependencies: List[Dependency],
     min_python: Version,
     scripts: Optional[Dict[str, Callable]],
+    directory: str = ".",
 ) -> None:
-    create_setup()
+    create_setup(directory=directory)
     create_toml(
         name=name,
         src_folder_path=explicit_src_folder_path,
@@ -143,25 +167,115 @@ def _create_package_files(
         ],
         min_python=min_python,
         scripts=scripts,
+        directory=directory,
     )
-    create_manifest(name=name)
+    create_manifest(name=name, directory=directory)
     add_version_to_init(src_folder_path=explicit_src_folder_path, version=version)
 
 
-def _build_and_upload_packages(
-    build_schemas: List[BuildSchema],
+def _stage_file(path: str, directory: str) -> str:
+    """Copy a project file into the staging directory, returning the path the staged package files should use."""
+    if os.path.isabs(path) or os.path.relpath(path).startswith(os.pardir):
+        return os.path.abspath(path)
+    staged_path = os.path.join(directory, path)
+    os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+    shutil.copyfile(path, staged_path)
+    return path
+
+
+def _stage_package(
+    directory: str,
+    name: str,
+    explicit_src_folder_path: str,
+    readme_file_path: str,
+    license_file_path: str,
+    version: Version,
+    author: str,
+    author_email: str,
+    description: str,
+    homepage: str,
+    keywords: List[str],
+    validated_dependencies: List[Dependency],
+    min_python: Version,
+    scripts: Optional[Dict[str, Callable]],
+) -> None:
+    """Copy the package into directory with its package files and version, so it can be built before QA passes."""
+    staged_src_folder_path = os.path.join(directory, name)
+    shutil.copytree(
+        explicit_src_folder_path,
+        staged_src_folder_path,
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    _create_package_files(
+        name,
+        staged_src_folder_path,
+        _stage_file(readme_file_path, directory),
+        _stage_file(license_file_path, directory),
+        version,
+        author,
+        author_email,
+        description,
+        homepage,
+        keywords,
+        validated_dependencies,
+        min_python,
+        scripts,
+        directory=directory,
+    )
+
+
+def _build_packages(
+    build_schemas: List[BuildSchema], demo: bool, directory: Optional[str] = None
+) -> None:
+    if not demo:
+        for schema in build_schemas:
+            schema.build(directory=directory)
+
+
+def _discard_built_distributions(directory: str) -> None:
+    distributions_path = os.path.join(directory, "dist")
+    if not os.path.isdir(distributions_path):
+        return
+    logger.info("Discarding unpublished distributions in '%s'", distributions_path)
+    shutil.rmtree(distributions_path, ignore_errors=True)
+
+
+def _release_distributions(directory: str, demo: bool) -> None:
+    distributions_path = os.path.join(directory, "dist")
+    if demo or not os.path.isdir(distributions_path):
+        return
+    os.makedirs("dist", exist_ok=True)
+    for file_name in sorted(os.listdir(distributions_path)):
+        logger.info("Moving built distribution '%s' into 'dist'", file_name)
+        shutil.move(
+            os.path.join(distributions_path, file_name),
+            os.path.join("dist", file_name),
+        )
+
+
+def _upload_packages(
     upload_targets: List[UploadTarget],
     name: str,
     version: Version,
     demo: bool,
 ) -> None:
     if not demo:
-        for schema in build_schemas:
-            schema.build()
         for target in upload_targets:
             target.upload(name=name, version=version)
 
 
+def _notify_runners_of_publish(
+    runners: Optional[List[QualityAssuranceRunner]],
+    name: str,
+    version: Version,
+    demo: bool,
+) -> None:
+    if demo:
+        return
+    for runner in runners or []:
+        runner.on_published(name, version)
+
+
 def publish(
     *,
     name: str,
@@ -183,6 +297,12 @@ def publish(
     explicit_src_folder_path: Optional[str] = None,
     scripts: Optional[Dict[str, Callable]] = None,
     pbar: Optional[SupportsProgress] = None,
+    qa_cache: Optional[QAResultCache] = None,
+    qa_report: Optional[QAReport] = None,
+    fail_fast: bool = False,
+    qa_num_workers: Optional[int] = None,
+    qa_history: Optional[QADurationHistory] = None,
+    env_capabilities: Optional[EnvCapabilities] = None,
     demo: bool = False,
     config: Optional[Any] = None,
 ) -> None:
@@ -198,32 +318,107 @@ def publish(
         ) = _validate_publish_inputs(
             name, version, explicit_src_folder_path, min_python, keywords, dependencies
         )
-        _run_constraint_enforcers(enforcers, name, validated_version, demo)
-        _run_quality_assurance(
-            python_interpreter_provider,
-            global_quality_assurance_runners,
-            name,
-            validated_src_path,
-            validated_deps,
-            pbar,
+        pipeline = Pipeline()
+        pipeline.add_stage(
+            "enforcers",
+            functools.partial(
+                _run_constraint_enforcers, enforcers, name, validated_version, demo
+            ),
         )
-        _create_package_files(
-            name,
-            validated_src_path,
-            readme_file_path,
-            license_file_path,
-            validated_version,
-            author,
-            author_email,
-            description,
-            homepage,
-            validated_keywords,
-            validated_deps,
-            validated_min_python,
-            scripts,
+        pipeline.add_stage(
+            "quality_assurance",
+            functools.partial(
+                _run_quality_assurance,
+                python_interpreter_provider,
+                global_quality_assurance_runners,
+                name,
+                validated_src_path,
+                validated_deps,
+                pbar,
+                qa_cache,
+                qa_report,
+                fail_fast,
+                qa_num_workers,
+                qa_history,
+                env_capabilities,
+            ),
+        )
+        staging_directory = tempfile.mkdtemp(prefix="quickpub-")
+        pipeline.add_stage(
+            "staging",
+            functools.partial(
+                run_in_thread,
+                _stage_package,
+                staging_directory,
+                name,
+                validated_src_path,
+                readme_file_path,
+                license_file_path,
+                validated_version,
+                author,
+                author_email,
+                description,
+                homepage,
+                validated_keywords,
+                validated_deps,
+                validated_min_python,
+                scripts,
+            ),
+        )
+        pipeline.add_stage(
+            "build",
+            functools.partial(
+                run_in_thread, _build_packages, build_schemas, demo, staging_directory
+            ),
+            depends_on=["staging"],
+            rollback=functools.partial(_discard_built_distributions, staging_directory),
+        )
+        pipeline.add_stage(
+            "package_files",
+            functools.partial(
+                run_in_thread,
+                _create_package_files,
+                name,
+                validated_src_path,
+                readme_file_path,
+                license_file_path,
+                validated_version,
+                author,
+                author_email,
+                description,
+                homepage,
+                validated_keywords,
+                validated_deps,
+                validated_min_python,
+                scripts,
+            ),
+            depends_on=["enforcers", "quality_assurance"],
+        )
+        pipeline.add_stage(
+            "release",
+            functools.partial(
+                run_in_thread, _release_distributions, staging_directory, demo
+            ),
+            depends_on=["package_files", "build"],
+        )
+        pipeline.add_stage(
+            "upload",
+            functools.partial(
+                run_in_thread,
+                _upload_packages,
+                upload_targets,
+                name,
+                validated_version,
+                demo,
+            ),
+            depends_on=["release"],
         )
-        _build_and_upload_packages(
-            build_schemas, upload_targets, name, validated_version, demo
+        try:
+            asyncio.run(pipeline.run())
+        finally:
+            shutil.rmtree(staging_directory, ignore_errors=True)
+        _notify_runners_of_publish(
+            global_quality_assurance_runners, name, validated_version, demo
         )
         success = True
     finally:
@@ -0,0 +1,65 @@
+"""Run by an environment's own interpreter as 'python benchmark_probe.py <target> <statistic>'.
+
+Runs the pytest-benchmark suite at target and passes its output and exit code through. The chosen statistic of every
+benchmark, in seconds, is printed as a single JSON line after a RESULT_MARKER line.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+RESULT_MARKER: str = "quickpub-benchmark-results"
+
+
+def read_results(path: str, statistic: str) -> Dict[str, float]:
+    if os.path.getsize(path) == 0:
+        return {}
+    with open(path, "r", encoding="utf8") as f:
+        data = json.load(f)
+    return {
+        benchmark["fullname"]: benchmark["stats"][statistic]
+        for benchmark in data.get("benchmarks", [])
+    }
+
+
+def main(arguments: List[str]) -> int:
+    target, statistic = arguments[0], arguments[1]
+    descriptor, path = tempfile.mkstemp(suffix=".json")
+    os.close(descriptor)
+    try:
+        returncode = subprocess.call(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                target,
+                "--benchmark-only",
+                f"--benchmark-json={path}",
+                "-p",
+                "no:cacheprovider",
+            ]
+        )
+        results = read_results(path, statistic)
+    finally:
+        os.remove(path)
+    print(RESULT_MARKER)
+    print(
+        json.dumps(
+            {
+                "python": f"{platform.python_implementation().lower()}-{sys.version_info[0]}.{sys.version_info[1]}",
+                "benchmarks": results,
+            }
+        ),
+        flush=True,
+    )
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+__all__ = ["main"]
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR: str = "./.quickpub_cache"
+
+_IGNORED_DIRECTORY_NAMES = frozenset(
+    {"__pycache__", ".mypy_cache", ".pytest_cache", os.path.basename(DEFAULT_CACHE_DIR)}
+)
+_IGNORED_SUFFIXES = frozenset({".pyc", ".pyo"})
+_VERSION_ASSIGNMENT_PATTERN: re.Pattern = re.compile(
+    rb'__version__\s*=\s*["\'].*?["\']'
+)
+
+
+class JsonFileCache:
+    """A small persistent key-value store backed by a single JSON file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache file '%s': %s", self.path, e)
+            return {}
+        if not isinstance(data, dict):
+            logger.warning("Ignoring malformed cache file '%s'", self.path)
+            return {}
+        logger.debug("Loaded %d cache entries from '%s'", len(data), self.path)
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._load().get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+        self._save()
+
+    def update(self, values: Dict[str, Any]) -> None:
+        self._load().update(values)
+        self._save()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        data = self._load()
+        if key not in data:
+            return default
+        value = data.pop(key)
+        self._save()
+        return value
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf8") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
+
+
+def hash_text(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _iter_files(path: Path) -> Iterator[Path]:
+    if path.is_file():
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _IGNORED_DIRECTORY_NAMES)
+        for file in sorted(files):
+            if Path(file).suffix not in _IGNORED_SUFFIXES:
+                yield Path(root) / file
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        content = f.read()
+    if os.path.basename(path) == "__init__.py":
+        content = _VERSION_ASSIGNMENT_PATTERN.sub(b"", content)
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_paths(paths: Iterable[str]) -> str:
+    """Hash the content of files and directory trees, ignoring '__version__' assignments in '__init__.py' files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        root = Path(path)
+        if not root.exists():
+            digest.update(f"missing:{path}".encode("utf8"))
+            continue
+        for file in _iter_files(root):
+            relative = file.relative_to(root).as_posix() if root.is_dir() else file.name
+            digest.update(relative.encode("utf8"))
+            digest.update(hash_file(str(file)).encode("utf8"))
+    return digest.hexdigest()
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "JsonFileCache",
+    "hash_text",
+    "hash_file",
+    "hash_paths",
+]
@@ -0,0 +1,57 @@
+"""Run by an environment's own interpreter as 'python capabilities_probe.py [--locate]'.
+
+Prints the location of the interpreter, its installed distributions and its site-packages directories as a single
+JSON line. With --locate only the location is printed.
+"""
+
+import json
+import os
+import re
+import sys
+import sysconfig
+from typing import Dict, List
+
+
+def normalize_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def read_distributions() -> Dict[str, str]:
+    from importlib import metadata
+
+    distributions: Dict[str, str] = {}
+    for distribution in metadata.distributions():
+        name = distribution.metadata["Name"]
+        if name:
+            distributions.setdefault(normalize_name(name), distribution.version)
+    return distributions
+
+
+def get_site_packages() -> List[str]:
+    paths = sysconfig.get_paths()
+    return sorted({paths["purelib"], paths["platlib"]})
+
+
+def get_location() -> str:
+    return f"{os.path.realpath(sys.prefix)}|{os.path.realpath(sys.executable)}"
+
+
+def main(arguments: List[str]) -> None:
+    if "--locate" in arguments:
+        print(json.dumps({"location": get_location()}))
+        return
+    print(
+        json.dumps(
+            {
+                "location": get_location(),
+                "distributions": read_distributions(),
+                "site_packages": get_site_packages(),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+__all__ = ["main"]
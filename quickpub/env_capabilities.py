@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+from . import capabilities_probe
+from .cache import JsonFileCache
+
+logger = logging.getLogger(__name__)
+
+CAPABILITIES_PROBE_PATH: str = os.path.abspath(capabilities_probe.__file__)
+
+
+class EnvCapabilities:
+    """Distributions installed in each environment, detected once per environment and interpreter by a single probe.
+
+    With a cache_dir, detections are persisted per interpreter location (its resolved prefix and executable) and
+    reused across runs for as long as the environment's site-packages directories are unmodified.
+    """
+
+    FILE_NAME: str = "env_capabilities.json"
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir = cache_dir
+        self._store: Optional[JsonFileCache] = (
+            None
+            if cache_dir is None
+            else JsonFileCache(os.path.join(cache_dir, self.FILE_NAME))
+        )
+        self._detections: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        logger.debug("Initialized EnvCapabilities with cache_dir='%s'", cache_dir)
+
+    @staticmethod
+    def _get_key(env_name: str, python: str) -> str:
+        return f"{env_name}|{python}"
+
+    async def _get_detection(
+        self, executor: AsyncLayeredCommand, env_name: str, python: str
+    ) -> Dict[str, Any]:
+        key = self._get_key(env_name, python)
+        if key not in self._detections:
+            self._detections[key] = asyncio.ensure_future(
+                self._detect(executor, env_name, python)
+            )
+        return await asyncio.shield(self._detections[key])
+
+    async def get_distributions(
+        self, executor: AsyncLayeredCommand, env_name: str, python: str = "python"
+    ) -> Dict[str, str]:
+        """Installed distributions of the environment as normalized name to version."""
+        return (await self._get_detection(executor, env_name, python))["distributions"]
+
+    async def get_location(
+        self, executor: AsyncLayeredCommand, env_name: str, python: str = "python"
+    ) -> Optional[str]:
+        """Resolved prefix and executable of the environment's interpreter, None if it couldn't be probed."""
+        return (await self._get_detection(executor, env_name, python))["location"]
+
+    async def has(
+        self,
+        executor: AsyncLayeredCommand,
+        env_name: str,
+        distribution: str,
+        python: str = "python",
+    ) -> bool:
+        distributions = await self.get_distributions(executor, env_name, python)
+        return capabilities_probe.normalize_name(distribution) in distributions
+
+    def _load(self, location: str) -> Optional[Dict[str, str]]:
+        if self._store is None:
+            return None
+        entry = self._store.get(location)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            fresh = all(
+                os.path.getmtime(path) == mtime
+                for path, mtime in entry["site_packages"].items()
+            )
+        except (OSError, KeyError, AttributeError):
+            return None
+        return entry["distributions"] if fresh else None
+
+    def _save(self, location: str, result: Dict) -> None:
+        if self._store is None:
+            return
+        try:
+            site_packages = {
+                path: os.path.getmtime(path) for path in result["site_packages"]
+            }
+        except OSError as e:
+            logger.debug("Not persisting capabilities of '%s': %s", location, e)
+            return
+        self._store.set(
+            location,
+            {
+                "site_packages": site_packages,
+                "distributions": result["distributions"],
+            },
+        )
+
+    @staticmethod
+    async def _probe(
+        executor: AsyncLayeredCommand, env_name: str, command: str
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            code, out, err = await executor(command, command_raise_on_fail=False)
+        except Exception as e:
+            logger.warning(
+                "Failed detecting capabilities of environment '%s': %s", env_name, e
+            )
+            return None
+        result = None
+        for line in reversed(out):
+            try:
+                result = json.loads(line)
+                break
+            except ValueError:
+                continue
+        if code != 0 or not isinstance(result, dict) or "location" not in result:
+            logger.warning(
+                "Failed detecting capabilities of environment '%s', probe exited with code %d: %s",
+                env_name,
+                code,
+                err,
+            )
+            return None
+        return result
+
+    async def _detect(
+        self, executor: AsyncLayeredCommand, env_name: str, python: str
+    ) -> Dict[str, Any]:
+        if self._store is not None:
+            located = await self._probe(
+                executor, env_name, f'{python} "{CAPABILITIES_PROBE_PATH}" --locate'
+            )
+            if located is not None:
+                stored = self._load(located["location"])
+                if stored is not None:
+                    logger.debug(
+                        "Reusing stored capabilities of environment '%s'", env_name
+                    )
+                    return {"location": located["location"], "distributions": stored}
+        logger.debug("Detecting capabilities of environment '%s'", env_name)
+        result = await self._probe(
+            executor, env_name, f'{python} "{CAPABILITIES_PROBE_PATH}"'
+        )
+        if result is None:
+            return {"location": None, "distributions": {}}
+        self._save(result["location"], result)
+        logger.debug(
+            "Environment '%s' has %d distributions installed",
+            env_name,
+            len(result["distributions"]),
+        )
+        return {
+            "location": result["location"],
+            "distributions": result["distributions"],
+        }
+
+
+__all__ = ["EnvCapabilities"]
@@ -0,0 +1,58 @@
+"""Run by an environment's interpreter to print distribution versions and the result of importing a package."""
+
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+IMPORT_START_MARKER: str = "quickpub-env-probe: importing package"
+
+
+def read_versions(names: List[str]) -> Dict[str, Optional[str]]:
+    from importlib import metadata
+
+    return {
+        name: next(
+            (
+                distribution.version
+                for distribution in metadata.distributions(name=name)
+            ),
+            None,
+        )
+        for name in names
+    }
+
+
+def import_package(package_name: str) -> Tuple[Optional[str], float]:
+    print(IMPORT_START_MARKER, file=sys.stderr, flush=True)
+    start_time = time.perf_counter()
+    try:
+        exec(f"from {package_name} import *", {})  # pylint: disable=exec-used
+    except BaseException:  # pylint: disable=broad-except
+        return traceback.format_exc(), time.perf_counter() - start_time
+    return None, time.perf_counter() - start_time
+
+
+def main(arguments: List[str]) -> None:
+    sys.path[0] = os.getcwd()
+    package_name, names = arguments[0], arguments[1:]
+    versions = read_versions(names)
+    import_error, import_seconds = import_package(package_name)
+    print()
+    print(
+        json.dumps(
+            {
+                "versions": versions,
+                "import_error": import_error,
+                "import_seconds": import_seconds,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+__all__ = ["main"]
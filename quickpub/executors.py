@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+logger = logging.getLogger(__name__)
+
+_STREAM_LIMIT: int = 2**24
+
+
+def _process_group_kwargs() -> Dict[str, Any]:
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}  # type: ignore[attr-defined]
+    return {"start_new_session": True}
+
+
+def kill_process_tree(process: "asyncio.subprocess.Process") -> None:
+    if process.returncode is not None:
+        return
+    logger.debug("Killing process tree rooted at pid %d", process.pid)
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError) as e:
+        logger.debug("Failed killing process tree of pid %d: %s", process.pid, e)
+
+
+async def run_cancellable_shell(
+    command: str,
+    *,
+    capture_output: bool = True,
+    environment: Optional[Mapping[str, str]] = None,
+) -> Tuple[int, Optional[bytes], Optional[bytes]]:
+    """Run a shell command in its own process group, killing the whole tree if the awaiting task is cancelled."""
+    pipe = asyncio.subprocess.PIPE if capture_output else None
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdout=pipe,
+        stderr=pipe,
+        env=None if environment is None else dict(environment),
+        **_process_group_kwargs(),
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        kill_process_tree(process)
+        await process.wait()
+        raise
+    return process.returncode or 0, stdout, stderr
+
+
+def _split_lines(data: Optional[bytes]) -> List[str]:
+    return data.decode().splitlines() if data else []
+
+
+class ShellSession:
+    """A long-lived shell process whose commands' output and exit codes are delimited by unique markers."""
+
+    def __init__(
+        self,
+        setup_command: str = "",
+        environment: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.setup_command = setup_command
+        self.environment = environment
+        self._process: Optional["asyncio.subprocess.Process"] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        logger.debug(
+            "Starting shell session with setup command '%s'", self.setup_command
+        )
+        self._process = await asyncio.create_subprocess_exec(
+            *_shell_arguments(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+            env=None if self.environment is None else dict(self.environment),
+            **_process_group_kwargs(),
+        )
+        if self.setup_command == "":
+            return
+        code, out, err = await self.run(self.setup_command, isolate=False)
+        if code != 0:
+            await self.close()
+            raise RuntimeError(
+                f"Shell session setup command '{self.setup_command}' failed with exit code {code}",
+                out + err,
+            )
+
+    async def run(
+        self, command: str, *, isolate: bool = True
+    ) -> Tuple[int, List[str], List[str]]:
+        """Run a command in the session, in a sub-shell with no stdin when isolate is set."""
+        if not self.alive:
+            raise RuntimeError("Shell session is not running")
+        process = self._process
+        assert process is not None and process.stdin is not None
+        marker = f"__quickpub_{uuid.uuid4().hex}__"
+        process.stdin.write(_wrap_command(command, marker, isolate).encode())
+        await process.stdin.drain()
+        (stdout, code), (stderr, _) = await asyncio.gather(
+            _read_until_marker(process.stdout, marker),
+            _read_until_marker(process.stderr, marker),
+        )
+        return code, stdout, stderr
+
+    async def close(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        kill_process_tree(process)
+        await process.wait()
+
+
+class ShellSessionPool:
+    """Reusable ShellSessions sharing one setup command, such as an environment activation."""
+
+    def __init__(
+        self,
+        setup_command: str = "",
+        environment: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.setup_command = setup_command
+        self.environment = environment
+        self._sessions: List[ShellSession] = []
+        self._idle: List[ShellSession] = []
+
+    async def _acquire(self) -> ShellSession:
+        while self._idle:
+            session = self._idle.pop()
+            if session.alive:
+                return session
+            await self._discard(session)
+        session = ShellSession(self.setup_command, self.environment)
+        self._sessions.append(session)
+        try:
+            await session.start()
+        except BaseException:
+            await self._discard(session)
+            raise
+        logger.debug(
+            "Started shell session %d for setup command '%s'",
+            len(self._sessions),
+            self.setup_command,
+        )
+        return session
+
+    async def _discard(self, session: ShellSession) -> None:
+        await session.close()
+        if session in self._sessions:
+            self._sessions.remove(session)
+
+    async def run(self, command: str) -> Tuple[int, List[str], List[str]]:
+        session = await self._acquire()
+        try:
+            result = await session.run(command)
+        except BaseException:
+            await self._discard(session)
+            raise
+        self._idle.append(session)
+        return result
+
+    async def close(self) -> None:
+        sessions = list(self._sessions)
+        self._sessions.clear()
+        self._idle.clear()
+        for session in sessions:
+            await session.close()
+
+
+def _shell_arguments() -> List[str]:
+    if sys.platform == "win32":
+        return ["cmd.exe", "/Q", "/D"]
+    return ["/bin/sh"]
+
+
+def _wrap_command(command: str, marker: str, isolate: bool) -> str:
+    if sys.platform == "win32":
+        if isolate:
+            command = f"({command}) < NUL"
+        return (
+            f"{command}\r\n"
+            f"1>&2 echo.\r\n"
+            f"1>&2 echo {marker}\r\n"
+            f"echo.\r\n"
+            f"echo {marker} %errorlevel%\r\n"
+        )
+    if isolate:
+        command = f"(\n{command}\n) </dev/null"
+    return (
+        f"{command}\n"
+        f"__quickpub_ret=$?\n"
+        f"printf '\\n%s\\n' '{marker}' >&2\n"
+        f"printf '\\n%s %s\\n' '{marker}' \"$__quickpub_ret\"\n"
+    )
+
+
+async def _read_until_marker(
+    stream: Optional[asyncio.StreamReader], marker: str
+) -> Tuple[List[str], int]:
+    assert stream is not None
+    lines: List[str] = []
+    while True:
+        raw = await stream.readline()
+        if raw == b"":
+            raise RuntimeError("Shell session ended unexpectedly")
+        line = raw.decode(errors="replace").rstrip("\r\n")
+        if line.startswith(marker):
+            break
+        lines.append(line)
+    if lines and lines[-1] == "":
+        lines.pop()
+    code = line[len(marker) :].strip()
+    return lines, int(code) if code else 0
+
+
+class CancellableAsyncLayeredCommand(AsyncLayeredCommand):
+    """AsyncLayeredCommand whose subprocesses are killed when the awaiting task is cancelled."""
+
+    def __init__(
+        self,
+        command: Optional[str] = None,
+        *,
+        environment: Optional[Mapping[str, str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(command, **kwargs)
+        self.environment = environment
+
+    async def execute(
+        self,
+        *commands: str,
+        command_capture_stdout: Optional[bool] = None,
+        command_capture_stderr: Optional[bool] = None,
+        command_raise_on_fail: Optional[bool] = None,
+        command_verbose: Optional[bool] = None,
+    ) -> Tuple[int, List[str], List[str]]:
+        if not self._has_entered:
+            raise RuntimeError(
+                "LayeredCommand must be used with a context manager. Use as: `with LayeredCommand(...) as l1:`"
+            )
+        capture_stdout = self._merge_values(
+            command_capture_stdout,
+            self._instance_capture_stdout,
+            self.class_capture_stdout,
+        )
+        capture_stderr = self._merge_values(
+            command_capture_stderr,
+            self._instance_capture_stderr,
+            self.class_capture_stderr,
+        )
+        raise_on_fail = self._merge_values(
+            command_raise_on_fail,
+            self._instance_raise_on_fail,
+            self.class_raise_on_fail,
+        )
+        if not (capture_stdout or capture_stderr):
+            command = self._build_command(*commands)
+            code, _, _ = await run_cancellable_shell(
+                command, capture_output=False, environment=self.environment
+            )
+            self._error(raise_on_fail and code != 0, command, code, command_verbose)
+            return code, [], []
+        return await self._run_captured(*commands)
+
+    async def _run_captured(self, *commands: str) -> Tuple[int, List[str], List[str]]:
+        code, stdout, stderr = await run_cancellable_shell(
+            self._build_command(*commands), environment=self.environment
+        )
+        return code, _split_lines(stdout), _split_lines(stderr)
+
+    async def close(self) -> None:
+        """Release the resources held by this executor."""
+
+
+class PersistentShellCommand(CancellableAsyncLayeredCommand):
+    """CancellableAsyncLayeredCommand running its commands in reusable shells where its prefix already ran."""
+
+    def __init__(
+        self,
+        command: Optional[str] = None,
+        *,
+        environment: Optional[Mapping[str, str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(command, environment=environment, **kwargs)
+        self._session_pools: Dict[str, ShellSessionPool] = {}
+
+    async def _run_captured(self, *commands: str) -> Tuple[int, List[str], List[str]]:
+        prefix = self._build_command()
+        if prefix not in self._session_pools:
+            self._session_pools[prefix] = ShellSessionPool(prefix, self.environment)
+        return await self._session_pools[prefix].run(" & ".join(commands))
+
+    async def close(self) -> None:
+        pools = list(self._session_pools.values())
+        self._session_pools.clear()
+        for pool in pools:
+            await pool.close()
+
+
+__all__ = [
+    "CancellableAsyncLayeredCommand",
+    "PersistentShellCommand",
+    "ShellSession",
+    "ShellSessionPool",
+    "run_cancellable_shell",
+    "kill_process_tree",
+]
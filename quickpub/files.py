@@ -1,4 +1,5 @@
 import logging
+import os
 import re
 from pathlib import Path
 from typing import List, Optional, Dict, Callable
@@ -101,6 +102,7 @@ def create_toml(
     dependencies: List[Dependency],
     classifiers: List[Classifier],
     scripts: Optional[Dict[str, Callable]] = None,
+    directory: str = ".",
 ) -> None:
     logger.info("Creating pyproject.toml for package '%s' version '%s'", name, version)
     classifiers_string = _format_classifiers_string(classifiers)
@@ -124,21 +126,21 @@ def create_toml(
         py_typed,
         homepage,
     )
-    with open("pyproject.toml", "w", encoding="utf8") as f:
+    with open(os.path.join(directory, "pyproject.toml"), "w", encoding="utf8") as f:
         f.write(toml_content)
     logger.info("Successfully created pyproject.toml")
 
 
-def create_setup() -> None:
+def create_setup(directory: str = ".") -> None:
     logger.info("Creating setup.py file")
-    with open("./setup.py", "w", encoding="utf8") as f:
+    with open(os.path.join(directory, "setup.py"), "w", encoding="utf8") as f:
         f.write("from setuptools import setup\n\nsetup()\n")
     logger.info("Successfully created setup.py")
 
 
-def create_manifest(*, name: str) -> None:
+def create_manifest(*, name: str, directory: str = ".") -> None:
     logger.info("Creating MANIFEST.in for package '%s'", name)
-    with open("./MANIFEST.in", "w", encoding="utf8") as f:
+    with open(os.path.join(directory, "MANIFEST.in"), "w", encoding="utf8") as f:
         f.write(f"recursive-include {name} *.py")
     logger.info("Successfully created MANIFEST.in")
 
@@ -0,0 +1,308 @@
+"""Runs only the tests affected by the latest changes in an environment's own interpreter.
+
+Run as 'python impact_probe.py --index <path> --source <dir> --tests <dir> --framework pytest|unittest
+[--input <file> ...] -- <module> [<argument> ...]'. Selects the test files affected by the files under source and
+tests that changed since the last green run recorded in the index, and runs 'python -m <module>' on them in-process
+under coverage with per-test contexts. The whole test target runs instead when the index is missing or stale, which
+includes any change to the installed distributions. The index is updated from the measured coverage and the selection
+is printed as a single JSON line after a RESULT_MARKER line.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import runpy
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+RESULT_MARKER: str = "quickpub-impact-results"
+INDEX_FORMAT: str = "1"
+UNKEYED_ARGUMENT_PREFIXES = ("--junitxml=", "--junit-xml=")
+IGNORED_DIRECTORIES = frozenset(
+    {"__pycache__", ".mypy_cache", ".pytest_cache", ".quickpub_cache"}
+)
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def find_files(directories: List[str]) -> List[str]:
+    files: Set[str] = set()
+    for directory in directories:
+        for root, dirs, names in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRECTORIES]
+            files.update(
+                os.path.abspath(os.path.join(root, name))
+                for name in names
+                if name.endswith(".py")
+            )
+    return sorted(files)
+
+
+def read_distributions() -> List[str]:
+    from importlib import metadata
+
+    return sorted(
+        {
+            f"{distribution.metadata['Name']}=={distribution.version}"
+            for distribution in metadata.distributions()
+            if distribution.metadata["Name"]
+        }
+    )
+
+
+def get_inputs_key(
+    framework: str, command: List[str], inputs: List[str], distributions: List[str]
+) -> str:
+    """Key of everything besides the files under source and tests that the recorded index depends on.
+
+    Includes the installed distributions, so upgrading a dependency reruns the whole test target.
+    """
+    arguments = [a for a in command if not a.startswith(UNKEYED_ARGUMENT_PREFIXES)]
+    digest = hashlib.sha256(
+        "\0".join(
+            [INDEX_FORMAT, sys.version, framework, *arguments, *distributions]
+        ).encode("utf8")
+    )
+    for path in inputs:
+        digest.update(hash_file(path).encode("utf8") if os.path.isfile(path) else b"-")
+    return digest.hexdigest()
+
+
+def load_index(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_index(path: str, data: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf8") as f:
+        json.dump(data, f)
+    os.replace(temporary_path, path)
+
+
+def select(
+    index: Dict[str, Any], inputs_key: str, hashes: Dict[str, str]
+) -> Tuple[Optional[List[str]], str]:
+    """Test files affected by the changes since the last green run and the reason for the selection.
+
+    The test files are None when the whole target has to run.
+    """
+    if index.get("inputs") != inputs_key:
+        return None, "no index was recorded for this configuration"
+    baseline: Dict[str, str] = index.get("baseline", {})
+    tests: Dict[str, List[str]] = index.get("tests", {})
+    if not baseline:
+        return None, "no green run was recorded"
+    added = [path for path in hashes if path not in baseline]
+    if added:
+        return None, f"'{added[0]}' is new since the last green run"
+    changed = sorted(
+        path for path, digest in baseline.items() if hashes.get(path) != digest
+    )
+    selected: Set[str] = set()
+    for path in changed:
+        if os.path.basename(path) == "conftest.py":
+            return None, f"'{path}' changed"
+        users = [test for test, files in tests.items() if path in files]
+        if path not in tests and not users:
+            return None, f"no recorded test exercises '{path}'"
+        if path in tests:
+            selected.add(path)
+        selected.update(users)
+    return (
+        sorted(test for test in selected if test in hashes),
+        f"{len(changed)} files changed since the last green run",
+    )
+
+
+def get_module_name(path: str, tests: str) -> str:
+    relative = os.path.splitext(os.path.relpath(path, tests))[0]
+    return relative.replace(os.sep, ".")
+
+
+def get_owner(context: str, files: Set[str], tests: str) -> Optional[str]:
+    """The test file defining the test of a coverage context.
+
+    Matched on the context's dotted module name.
+    """
+    owner, length = None, -1
+    for path in files:
+        if not path.startswith(tests + os.sep):
+            continue
+        module = get_module_name(path, tests)
+        if f".{module}." in f".{context}" and len(module) > length:
+            owner, length = path, len(module)
+    return owner
+
+
+def get_tests_map(data: Any, tests: str) -> Dict[str, Set[str]]:
+    """The measured files of every test file that ran.
+
+    Each per-test context is attributed to the test file defining it.
+    """
+    files_of_context: Dict[str, Set[str]] = {}
+    for measured in data.measured_files():
+        path = os.path.abspath(measured)
+        for contexts in data.contexts_by_lineno(measured).values():
+            for context in contexts:
+                if context:
+                    files_of_context.setdefault(context, set()).add(path)
+    tests_map: Dict[str, Set[str]] = {}
+    for context, files in files_of_context.items():
+        owner = get_owner(context, files, tests)
+        if owner is not None:
+            tests_map.setdefault(owner, set()).update(files)
+    return tests_map
+
+
+def get_unittest_names(selected: List[str], tests: str) -> List[str]:
+    """Ids of the tests defined in the selected test files, as accepted by 'python -m unittest'.
+
+    A file whose tests can't be loaded is named by its module, so unittest reports the error.
+    """
+    import unittest
+
+    if tests not in sys.path:
+        sys.path.insert(1, tests)
+    names: List[str] = []
+
+    def collect(suite: "unittest.TestSuite") -> List[str]:
+        ids: List[str] = []
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                ids.extend(collect(test))
+            else:
+                ids.append(test.id())
+        return ids
+
+    for path in selected:
+        module = get_module_name(path, tests)
+        try:
+            ids = collect(unittest.defaultTestLoader.loadTestsFromName(module))
+        except Exception:  # pylint: disable=broad-except
+            ids = []
+        if not ids or any(i.startswith("unittest.loader.") for i in ids):
+            ids = [module]
+        names.extend(ids)
+    return names
+
+
+def apply_selection(
+    framework: str, command: List[str], selected: List[str], tests: str
+) -> List[str]:
+    if framework == "unittest":
+        return [command[0], *get_unittest_names(selected, tests)]
+    result: List[str] = []
+    for argument in command:
+        if os.path.abspath(argument) == tests:
+            result.extend(selected)
+        else:
+            result.append(argument)
+    return result
+
+
+def run_module(command: List[str]) -> int:
+    sys.argv = list(command)
+    sys.path[0] = os.getcwd()
+    try:
+        runpy.run_module(command[0], run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def report(mode: str, reason: str, selected: List[str]) -> None:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    print(RESULT_MARKER)
+    print(
+        json.dumps({"mode": mode, "reason": reason, "tests": selected}),
+        flush=True,
+    )
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index", required=True)
+    parser.add_argument("--source", required=True)
+    parser.add_argument("--tests", required=True)
+    parser.add_argument("--framework", choices=["pytest", "unittest"], required=True)
+    parser.add_argument("--input", action="append", default=[])
+    split = arguments.index("--")
+    options = parser.parse_args(arguments[:split])
+    command = arguments[split + 1 :]
+    source, tests = os.path.abspath(options.source), os.path.abspath(options.tests)
+
+    try:
+        import coverage
+    except ImportError:
+        returncode = run_module(command)
+        report("full", "coverage is not installed", [])
+        return returncode
+
+    hashes = {path: hash_file(path) for path in find_files([source, tests])}
+    inputs_key = get_inputs_key(
+        options.framework, command, options.input, read_distributions()
+    )
+    index = load_index(options.index)
+    selected, reason = select(index, inputs_key, hashes)
+    if selected is not None and not selected:
+        report("skipped", reason, [])
+        return 0
+    if selected is not None:
+        command = apply_selection(options.framework, command, selected, tests)
+
+    measurement = coverage.Coverage(
+        data_file=None, source=[source, tests], config_file=False
+    )
+    measurement.set_option("run:dynamic_context", "test_function")
+    measurement.start()
+    try:
+        returncode = run_module(command)
+    finally:
+        measurement.stop()
+
+    valid = index.get("inputs") == inputs_key
+    tests_map: Dict[str, List[str]] = (
+        dict(index.get("tests", {})) if valid and selected is not None else {}
+    )
+    for path in selected or []:
+        tests_map.pop(path, None)
+    for path, files in get_tests_map(measurement.get_data(), tests).items():
+        tests_map[path] = sorted(files)
+    save_index(
+        options.index,
+        {
+            "inputs": inputs_key,
+            "baseline": (
+                hashes
+                if returncode == 0
+                else (index.get("baseline", {}) if valid else {})
+            ),
+            "tests": {
+                path: files for path, files in tests_map.items() if path in hashes
+            },
+        },
+    )
+    report("full" if selected is None else "selected", reason, selected or [])
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+__all__ = ["main"]
@@ -0,0 +1,72 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TIME_LINE_PATTERN: re.Pattern = re.compile(
+    r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S.*?)\s*$"
+)
+
+
+@dataclass
+class ImportTiming:
+    """Time spent importing a single module, as reported by 'python -X importtime'."""
+
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+    depth: int
+
+
+def parse_import_times(
+    lines: List[str], start_marker: Optional[str] = None
+) -> List[ImportTiming]:
+    """Parse the stderr of 'python -X importtime', only after the last start_marker line if given."""
+    if start_marker is not None:
+        stripped = [line.strip() for line in lines]
+        if start_marker in stripped:
+            start = len(stripped) - stripped[::-1].index(start_marker)
+            lines = lines[start:]
+    timings = []
+    for line in lines:
+        match = IMPORT_TIME_LINE_PATTERN.match(line.rstrip())
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_seconds=int(self_us) / 1_000_000,
+                cumulative_seconds=int(cumulative_us) / 1_000_000,
+                depth=max(len(indent) - 1, 0) // 2,
+            )
+        )
+    logger.debug("Parsed %d import timings", len(timings))
+    return timings
+
+
+def get_total_import_seconds(timings: List[ImportTiming]) -> float:
+    """Sum of the cumulative times of top-level imports, i.e. the import time of everything that was parsed."""
+    return sum(timing.cumulative_seconds for timing in timings if timing.depth == 0)
+
+
+def format_slowest_imports(timings: List[ImportTiming], limit: int = 10) -> List[str]:
+    slowest = sorted(
+        timings, key=lambda timing: timing.cumulative_seconds, reverse=True
+    )
+    return [
+        f"{timing.cumulative_seconds * 1000:9.1f} ms cumulative "
+        f"{timing.self_seconds * 1000:9.1f} ms self  {timing.module}"
+        for timing in slowest[:limit]
+    ]
+
+
+__all__ = [
+    "IMPORT_TIME_LINE_PATTERN",
+    "ImportTiming",
+    "parse_import_times",
+    "get_total_import_seconds",
+    "format_slowest_imports",
+]
@@ -0,0 +1,32 @@
+"""Run by an environment's own interpreter as 'python import_time_probe.py <package> <runs> <directory>'.
+
+Imports the package in a fresh 'python -X importtime' process per run, from the given directory. Each run's exit code
+and importtime output are printed after a RUN_MARKER line naming the package, the run and the exit code.
+"""
+
+import subprocess
+import sys
+from typing import List
+
+RUN_MARKER: str = "quickpub-import-time-run"
+
+
+def main(arguments: List[str]) -> None:
+    package_name, runs, directory = arguments[0], int(arguments[1]), arguments[2]
+    for run in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {package_name}"],
+            cwd=directory,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=False,
+        )
+        print(f"{RUN_MARKER} {package_name} {run} {process.returncode}")
+        print(process.stderr, end="", flush=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+
+__all__ = ["main"]
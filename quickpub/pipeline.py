@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+StageFunction = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    """A named unit of work in a Pipeline, together with the stages it waits for."""
+
+    name: str
+    func: StageFunction
+    depends_on: Sequence[str] = ()
+    rollback: Optional[Callable[[], None]] = None
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function in a worker thread.
+
+    A thread can't be interrupted, so on cancellation this waits for it to finish before re-raising.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
+
+
+class Pipeline:
+    """Dependency graph of stages.
+
+    Every stage starts as soon as all of its dependencies finished, so independent stages overlap.
+
+    The first failing stage cancels all running stages. Every started stage whose dependents never started is then
+    rolled back.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, Stage] = {}
+        self.started: List[str] = []
+        self.completed: List[str] = []
+
+    def add_stage(
+        self,
+        name: str,
+        func: StageFunction,
+        *,
+        depends_on: Sequence[str] = (),
+        rollback: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        missing = [
+            dependency for dependency in depends_on if dependency not in self._stages
+        ]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undefined stages {missing}")
+        self._stages[name] = Stage(name, func, tuple(depends_on), rollback)
+
+    async def run(self) -> None:
+        tasks: Dict[str, "asyncio.Future[None]"] = {}
+        for stage in self._stages.values():
+            tasks[stage.name] = asyncio.ensure_future(
+                self._run_stage(stage, [tasks[name] for name in stage.depends_on])
+            )
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            self._rollback()
+            raise
+
+    async def _run_stage(
+        self, stage: Stage, dependencies: List["asyncio.Future[None]"]
+    ) -> None:
+        if dependencies:
+            await asyncio.wait(dependencies)
+            if any(
+                dependency.cancelled() or dependency.exception() is not None
+                for dependency in dependencies
+            ):
+                logger.debug(
+                    "Skipping stage '%s' because a dependency did not succeed",
+                    stage.name,
+                )
+                return
+        self.started.append(stage.name)
+        logger.info("Stage '%s' started", stage.name)
+        start_time = time.perf_counter()
+        await stage.func()
+        self.completed.append(stage.name)
+        logger.info(
+            "Stage '%s' finished in %.3fs",
+            stage.name,
+            time.perf_counter() - start_time,
+        )
+
+    def _has_started_dependents(self, name: str) -> bool:
+        return any(
+            name in stage.depends_on and stage.name in self.started
+            for stage in self._stages.values()
+        )
+
+    def _rollback(self) -> None:
+        for name in reversed(self.started):
+            stage = self._stages[name]
+            if stage.rollback is None or self._has_started_dependents(name):
+                continue
+            logger.info("Rolling back stage '%s'", name)
+            try:
+                stage.rollback()
+            except Exception as e:
+                logger.error("Failed rolling back stage '%s': %s", name, e)
+
+
+__all__ = ["Pipeline", "Stage", "run_in_thread"]
@@ -0,0 +1,211 @@
+"""Lints a target with an environment's interpreter, reusing the cached report while nothing changed.
+
+Run as 'python pylint_probe.py --cache <path> --jobs <n> [--rcfile <path>] <target>'. The whole target is linted again
+whenever any file under it, the rcfile or the pylint version changed, since messages such as import-error, no-member
+or duplicate-code in one file depend on the others. The report is printed as one JSON line shaped like pylint's json2
+output.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_FORMAT: str = "3"
+CATEGORIES: List[str] = [
+    "fatal",
+    "error",
+    "warning",
+    "refactor",
+    "convention",
+    "info",
+    "statement",
+]
+IGNORED_DIRECTORIES = frozenset({"__pycache__", ".mypy_cache", ".quickpub_cache"})
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_config_key(version: str, rcfile: Optional[str]) -> str:
+    digest = hashlib.sha256(f"{CACHE_FORMAT}:{version}".encode("utf8"))
+    if rcfile is not None:
+        digest.update(hash_file(rcfile).encode("utf8"))
+    return digest.hexdigest()
+
+
+def find_files(target: str) -> List[str]:
+    if os.path.isfile(target):
+        return [os.path.abspath(target)]
+    files: List[str] = []
+    for root, dirs, names in os.walk(target):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRECTORIES)
+        files.extend(
+            os.path.abspath(os.path.join(root, name))
+            for name in sorted(names)
+            if name.endswith(".py")
+        )
+    return files
+
+
+def load_cache(path: str, config_key: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("config") != config_key:
+        return {}
+    return data
+
+
+def save_cache(path: str, data: Dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf8") as f:
+        json.dump(data, f)
+    os.replace(temporary_path, path)
+
+
+def lint(
+    files: List[str], jobs: int, rcfile: Optional[str]
+) -> Tuple[Dict[str, Dict], str]:
+    """Lint files, returning the messages and statistics of every file and the configured evaluation."""
+    from pylint.lint import Run
+    from pylint.reporters import BaseReporter
+
+    paths: Dict[str, str] = {}
+    messages: Dict[str, List[Dict]] = {}
+
+    class _Reporter(BaseReporter):
+        name = "quickpub"
+
+        def on_set_current_module(self, module: str, filepath: Optional[str]) -> None:
+            super().on_set_current_module(module, filepath)
+            if filepath:
+                paths[module] = os.path.abspath(filepath)
+
+        def handle_message(self, msg: Any) -> None:
+            messages.setdefault(os.path.abspath(msg.abspath), []).append(
+                {
+                    "type": msg.category,
+                    "symbol": msg.symbol,
+                    "message": msg.msg or "",
+                    "messageId": msg.msg_id,
+                    "module": msg.module,
+                    "obj": msg.obj,
+                    "line": msg.line,
+                    "column": msg.column,
+                    "path": msg.path,
+                    "absolutePath": msg.abspath,
+                }
+            )
+
+        def display_messages(self, layout: Any) -> None:
+            return None
+
+        def display_reports(self, layout: Any) -> None:
+            return None
+
+        def _display(self, layout: Any) -> None:
+            return None
+
+    arguments = ["--jobs", str(jobs), "--score", "n"]
+    if rcfile is not None:
+        arguments += ["--rcfile", rcfile]
+    run = Run(arguments + files, reporter=_Reporter(), exit=False)
+    results: Dict[str, Dict] = {}
+    for module, stats in dict(run.linter.stats.by_module).items():
+        if module in paths:
+            results[paths[module]] = {
+                "stats": {category: stats.get(category, 0) for category in CATEGORIES},
+                "messages": messages.get(paths[module], []),
+            }
+    return results, run.linter.config.evaluation
+
+
+def get_totals(files: Dict[str, Dict]) -> Dict[str, int]:
+    totals = {category: 0 for category in CATEGORIES}
+    for entry in files.values():
+        for category in CATEGORIES:
+            totals[category] += entry["stats"][category]
+    return totals
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache", required=True)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--rcfile", default=None)
+    parser.add_argument("target")
+    options = parser.parse_args(arguments)
+    try:
+        import pylint
+    except ImportError:
+        print("No module named pylint")
+        return 1
+
+    config_key = get_config_key(pylint.__version__, options.rcfile)
+    cache = load_cache(options.cache, config_key)
+    cached = cache.get("files", {})
+    hashes = {path: hash_file(path) for path in find_files(options.target)}
+    if hashes == {path: entry.get("hash") for path, entry in cached.items()}:
+        files: Dict[str, Dict] = cached
+        score: Optional[float] = cache.get("score")
+    else:
+        paths = list(hashes)
+        results, evaluation = lint(paths, min(options.jobs, len(paths)), options.rcfile)
+        files = {
+            path: {
+                "hash": hashes[path],
+                **results.get(
+                    path,
+                    {
+                        "stats": {category: 0 for category in CATEGORIES},
+                        "messages": [],
+                    },
+                ),
+            }
+            for path in paths
+        }
+        totals = get_totals(files)
+        score = None
+        if totals["statement"] > 0:
+            score = eval(evaluation, {}, totals)  # pylint: disable=eval-used
+        save_cache(
+            options.cache, {"config": config_key, "score": score, "files": files}
+        )
+
+    totals = get_totals(files)
+    print(
+        json.dumps(
+            {
+                "messages": [
+                    message for entry in files.values() for message in entry["messages"]
+                ],
+                "statistics": {
+                    "messageTypeCount": {
+                        category: totals[category]
+                        for category in CATEGORIES
+                        if category != "statement"
+                    },
+                    "modulesLinted": len(files),
+                    "statementCount": totals["statement"],
+                    "score": score,
+                },
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+__all__ = ["main"]
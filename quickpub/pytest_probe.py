@@ -0,0 +1,99 @@
+"""Run by an environment's interpreter as 'python pytest_probe.py <tail> [--impact <argument> ... --] [<argument> ...]'.
+
+Runs pytest with a JUnit XML report written to a temporary file, echoing only the last <tail> lines of its output. With
+--impact, pytest runs through impact_probe.py to select only the affected tests. Once pytest exits the report is parsed
+with iterparse and the outcome counts, null if pytest wrote no report, and per-test durations are printed as a single
+JSON line after a RESULT_MARKER line.
+"""
+
+import collections
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+RESULT_MARKER: str = "quickpub-pytest-results"
+IMPACT_PROBE_PATH: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "impact_probe.py"
+)
+OUTCOMES: Dict[str, str] = {
+    "failure": "failed",
+    "error": "errors",
+    "skipped": "skipped",
+}
+
+
+def run_pytest(
+    arguments: List[str],
+    report_path: str,
+    tail: int,
+    impact_arguments: Optional[List[str]] = None,
+) -> int:
+    runner = (
+        ["-m", "pytest"]
+        if impact_arguments is None
+        else [IMPACT_PROBE_PATH, *impact_arguments, "--", "pytest"]
+    )
+    process = subprocess.Popen(
+        [sys.executable, *runner, *arguments, f"--junitxml={report_path}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    lines: "collections.deque[str]" = collections.deque(maxlen=tail)
+    assert process.stdout is not None
+    for line in process.stdout:
+        lines.append(line)
+    returncode = process.wait()
+    print("".join(lines), end="")
+    return returncode
+
+
+def read_report(path: str) -> Tuple[Optional[Dict[str, int]], Dict[str, float]]:
+    """Outcome counts and per-test durations of a JUnit XML report, with counts of None if pytest didn't write one."""
+    counts = {"passed": 0, "failed": 0, "errors": 0, "skipped": 0}
+    durations: Dict[str, float] = {}
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return None, durations
+    for _, element in ElementTree.iterparse(path):
+        if element.tag != "testcase":
+            continue
+        outcome = "passed"
+        for child in element:
+            if child.tag in OUTCOMES and outcome in ("passed", "skipped"):
+                outcome = OUTCOMES[child.tag]
+        counts[outcome] += 1
+        test_id = ".".join(
+            part for part in (element.get("classname"), element.get("name")) if part
+        )
+        durations[test_id] = float(element.get("time") or 0)
+        element.clear()
+    return counts, durations
+
+
+def main(arguments: List[str]) -> int:
+    tail, pytest_arguments = int(arguments[0]), arguments[1:]
+    impact_arguments = None
+    if pytest_arguments[:1] == ["--impact"]:
+        end = pytest_arguments.index("--")
+        impact_arguments = pytest_arguments[1:end]
+        pytest_arguments = pytest_arguments[end + 1 :]
+    descriptor, path = tempfile.mkstemp(suffix=".xml")
+    os.close(descriptor)
+    try:
+        returncode = run_pytest(pytest_arguments, path, tail, impact_arguments)
+        counts, durations = read_report(path)
+    finally:
+        os.remove(path)
+    print(RESULT_MARKER)
+    print(json.dumps({"counts": counts, "durations": durations}), flush=True)
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+__all__ = ["main"]
@@ -1,8 +1,11 @@
+import json
 import logging
+import os
 import re
 import sys
 import time
 from abc import abstractmethod
+from dataclasses import dataclass, field
 from typing import (
     ContextManager,
     List,
@@ -16,16 +19,28 @@ from typing import (
     Protocol,
     runtime_checkable,
 )
-from danielutils import TemporaryFile, AsyncWorkerPool, RandomDataGenerator
+from danielutils import AsyncWorkerPool
 from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
+from . import env_probe
 from .enforcers import ExitEarlyError
+from .import_time import (
+    IMPORT_TIME_LINE_PATTERN,
+    ImportTiming,
+    format_slowest_imports,
+    parse_import_times,
+)
+from .executors import CancellableAsyncLayeredCommand
 from .strategies import (
     PythonProvider,
     QualityAssuranceRunner,
 )  # pylint: disable=relative-beyond-top-level
 from .structures import Dependency, Version  # pylint: disable=relative-beyond-top-level
 from .enforcers import exit_if  # pylint: disable=relative-beyond-top-level
+from .env_capabilities import EnvCapabilities
+from .qa_cache import QAResultCache
+from .qa_history import QADurationHistory
+from .qa_report import QAReport, QATaskStatus
 from .worker_pool import WorkerPool
 
 logger = logging.getLogger(__name__)
@@ -79,88 +94,89 @@ class SupportsProgress(Protocol):
         """Set the total number of items to process."""
 
 
-async def global_import_sanity_check(
-    package_name: str,
-    executor: AsyncLayeredCommand,
-    is_system_interpreter: bool,
-    env_name: str,
-    task_id: int,
-    pbar: Optional[SupportsProgress] = None,
-) -> None:
-    logger.info(
-        "Running global import sanity check for package '%s' on environment '%s'",
-        package_name,
-        env_name,
-    )
-    try:
-        p = sys.executable if is_system_interpreter else "python"
-        file_name = f"./{RandomDataGenerator().name(15)}__sanity_check_main.py"
-        with TemporaryFile(file_name) as f:
-            f.writelines([f"from {package_name} import *"])
-            cmd = f"{p} {file_name}"
-            logger.debug("Executing sanity check command: %s", cmd)
-            code, stdout, stderr = await executor(cmd)
-
-            if code != 0:
-                logger.error(
-                    "Sanity check failed for package '%s' on environment '%s' with return code %d",
-                    package_name,
-                    env_name,
-                    code,
-                )
-                is_task_run_success[task_id] = False
-            else:
-                logger.debug(
-                    "Sanity check passed for package '%s' on environment '%s'",
-                    package_name,
-                    env_name,
-                )
-                is_task_run_success[task_id] = True
-
-            msg = f"Env '{env_name}' failed sanity check."
-            if stderr:
-                if stderr[0] == "Traceback (most recent call last):":
-                    msg += f" Got error '{stderr[-1]}' when tried 'from {package_name} import *'"
-            else:
-                msg += f" Try manually running the following script 'from {package_name} import *'"
-            exit_if(code != 0, msg)
-    except Exception as e:
-        logger.error(
-            "Sanity check encountered unexpected error for package '%s' on environment '%s': %s",
-            package_name,
-            env_name,
-            e,
-        )
-        is_task_run_success[task_id] = False
-        raise
-    finally:
-        if pbar is not None:
-            pbar.update(1)
+VERSION_REGEX: re.Pattern = re.compile(r"^(\d+)(?:\.(\d+))?(?:\.(\d+))?")
+ENV_PROBE_PATH: str = os.path.abspath(env_probe.__file__)
+
 
+@dataclass
+class EnvProbeResult:
+    """Installed dependency versions and package import outcome reported by one run of the env probe."""
 
-VERSION_REGEX: re.Pattern = re.compile(r"^\d+\.\d+\.\d+$")
+    installed: Dict[str, Union[str, Dependency]]
+    import_error: Optional[str]
+    import_seconds: float
+    import_timings: List[ImportTiming] = field(default_factory=list)
 
 
-async def _get_installed_packages(
-    executor: AsyncLayeredCommand, env_name: str
+def _parse_installed_version(version: str) -> Optional[Version]:
+    """Version from the leading release segment of a version string, e.g. 1.26 from '1.26.post1'."""
+    match = VERSION_REGEX.match(version)
+    if match is None:
+        return None
+    return Version(*(int(part) for part in match.groups() if part is not None))
+
+
+def _parse_installed_versions(
+    versions: Dict[str, Any],
 ) -> Dict[str, Union[str, Dependency]]:
-    logger.debug("Executing 'pip list' on environment '%s'", env_name)
-    code, out, err = await executor("pip list")
+    installed: Dict[str, Union[str, Dependency]] = {}
+    for name, version in versions.items():
+        if not isinstance(version, str):
+            continue
+        parsed = _parse_installed_version(version)
+        installed[name] = version if parsed is None else Dependency(name, "==", parsed)
+    return installed
+
+
+def _build_env_probe_command(python: str, package_name: str, names: List[str]) -> str:
+    arguments = " ".join(f'"{argument}"' for argument in [package_name, *names])
+    return f'{python} -X importtime "{ENV_PROBE_PATH}" {arguments}'
+
+
+def _parse_env_probe_output(lines: List[str]) -> Optional[Dict[str, Any]]:
+    for line in reversed(lines):
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(result, dict):
+            return result
+    return None
+
+
+async def _run_env_probe(
+    executor: AsyncLayeredCommand,
+    env_name: str,
+    package_name: str,
+    names: List[str],
+    python: str = "python",
+) -> EnvProbeResult:
+    """Read the installed versions of names and import package_name in one launch of the env's interpreter."""
+    logger.debug(
+        "Probing environment '%s' for package '%s' and dependencies %s",
+        env_name,
+        package_name,
+        names,
+    )
+    code, out, err = await executor(
+        _build_env_probe_command(python, package_name, names),
+        command_raise_on_fail=False,
+    )
+    probed = _parse_env_probe_output(out)
+    errors = [line for line in err if not IMPORT_TIME_LINE_PATTERN.match(line)]
     exit_if(
-        code != 0,
-        f"Failed executing 'pip list' at env '{env_name}'",
+        probed is None,
+        f"Failed probing env '{env_name}', exited with code {code}: {errors}",
     )
-    split_lines = (line.split(" ") for line in out[2:])
-    version_tuples = [(s[0], s[-1].strip()) for s in split_lines]
-    filtered_tuples = [t for t in version_tuples if VERSION_REGEX.match(t[1])]
-    currently_installed: Dict[str, Union[str, Dependency]] = {
-        s[0]: Dependency(s[0], "==", Version.from_str(s[-1])) for s in filtered_tuples
-    }
-    currently_installed.update(
-        **{t[0]: t[1] for t in version_tuples if not VERSION_REGEX.match(t[1])}
+    assert probed is not None
+    installed = _parse_installed_versions(probed.get("versions") or {})
+    logger.debug("Found %d installed packages", len(installed))
+    return EnvProbeResult(
+        installed,
+        probed.get("import_error"),
+        float(probed.get("import_seconds", 0.0)),
+        parse_import_times(err, env_probe.IMPORT_START_MARKER),
     )
-    logger.debug("Found %d installed packages", len(currently_installed))
-    return currently_installed
 
 
 def _check_dependency_satisfaction(
@@ -186,54 +202,102 @@ def _check_dependency_satisfaction(
     return not_installed_properly
 
 
-async def validate_dependencies(
+async def probe_environment(
     validation_exit_on_fail: bool,
+    package_name: str,
     required_dependencies: List[Dependency],
     executor: AsyncLayeredCommand,
+    is_system_interpreter: bool,
     env_name: str,
-    task_id: int,
+    report: QAReport,
+    dependencies_task_id: int,
+    import_task_id: int,
     pbar: Optional[SupportsProgress] = None,
 ) -> None:
-    logger.info("Validating dependencies on environment '%s'", env_name)
+    """Validate dependencies and run the global import sanity check of package_name on one env."""
+    logger.info(
+        "Probing environment '%s' for dependencies and import of package '%s'",
+        env_name,
+        package_name,
+    )
+    report.start(dependencies_task_id)
+    report.start(import_task_id)
     try:
-        if validation_exit_on_fail:
-            currently_installed = await _get_installed_packages(executor, env_name)
-            not_installed_properly = _check_dependency_satisfaction(
-                required_dependencies, currently_installed
+        names = (
+            [dependency.name for dependency in required_dependencies]
+            if validation_exit_on_fail
+            else []
+        )
+        result = await _run_env_probe(
+            executor,
+            env_name,
+            package_name,
+            names,
+            sys.executable if is_system_interpreter else "python",
+        )
+
+        not_installed_properly = (
+            _check_dependency_satisfaction(required_dependencies, result.installed)
+            if validation_exit_on_fail
+            else []
+        )
+        if not_installed_properly:
+            logger.error(
+                "Dependency validation failed on environment '%s': %s",
+                env_name,
+                not_installed_properly,
+            )
+            report.mark_failed(
+                dependencies_task_id,
+                output=[f"{req}: {reason}" for req, reason in not_installed_properly],
             )
+        else:
+            logger.debug("Dependency validation passed on environment '%s'", env_name)
+            report.mark_passed(dependencies_task_id)
 
-            if not_installed_properly:
-                logger.error(
-                    "Dependency validation failed on environment '%s': %s",
-                    env_name,
-                    not_installed_properly,
-                )
-                is_task_run_success[task_id] = False
-            else:
-                logger.debug(
-                    "Dependency validation passed on environment '%s'", env_name
-                )
-                is_task_run_success[task_id] = True
+        logger.info(
+            "Importing package '%s' on environment '%s' took %.3fs",
+            package_name,
+            env_name,
+            result.import_seconds,
+        )
+        import_output = [
+            f"Imported '{package_name}' in {result.import_seconds:.3f}s",
+            *format_slowest_imports(result.import_timings),
+        ]
+        if result.import_error is None:
+            report.mark_passed(import_task_id, output=import_output)
+        else:
+            logger.error(
+                "Sanity check failed for package '%s' on environment '%s'",
+                package_name,
+                env_name,
+            )
+            report.mark_failed(import_task_id, output=result.import_error.splitlines())
 
+        exit_if(
+            bool(not_installed_properly),
+            f"On env '{env_name}' the following dependencies have problems: {(not_installed_properly)}",
+        )
+        if result.import_error is not None:
+            error_lines = result.import_error.strip().splitlines()
+            error = error_lines[-1] if error_lines else ""
             exit_if(
-                bool(not_installed_properly),
-                f"On env '{env_name}' the following dependencies have problems: {(not_installed_properly)}",
+                True,
+                f"Env '{env_name}' failed sanity check. Got error '{error}' "
+                f"when tried 'from {package_name} import *'",
             )
     except Exception as e:
         logger.error(
-            "Dependency validation encountered unexpected error on environment '%s': %s",
-            env_name,
-            e,
+            "Probing environment '%s' encountered unexpected error: %s", env_name, e
         )
-        is_task_run_success[task_id] = False
+        for task_id in (dependencies_task_id, import_task_id):
+            if report[task_id].status == QATaskStatus.PENDING:
+                report.mark_failed(task_id, error=str(e))
         raise
     finally:
         if pbar is not None:
-            pbar.update(1)
-
-
-# Track all QA tasks (dependencies, sanity checks, QA runners)
-is_task_run_success: List[bool] = []
+            pbar.update(2)
 
 
 async def run_config(
@@ -241,12 +305,15 @@ async def run_config(
     async_executor: AsyncLayeredCommand,
     runner: QualityAssuranceRunner,
     config_id: int,
+    report: QAReport,
     task_id: int,
     *,
     is_system_interpreter: bool,
     validation_exit_on_fail: bool,
     src_folder_path: str,
     pbar: Optional[SupportsProgress] = None,
+    cache: Optional[QAResultCache] = None,
+    capabilities: Optional[EnvCapabilities] = None,
 ) -> None:
     logger.info(
         "Running QA config %d on environment '%s' with runner '%s'",
@@ -254,24 +321,29 @@ async def run_config(
         env_name,
         runner.__class__.__name__,
     )
+    report.start(task_id)
     try:
-        await runner.run(
+        result = await runner.run(
             src_folder_path,
             async_executor,
             use_system_interpreter=is_system_interpreter,
             env_name=env_name,
+            cache=cache,
+            capabilities=capabilities,
         )
         logger.debug(
             "QA config %d completed successfully on environment '%s'",
             config_id,
             env_name,
         )
-        is_task_run_success[task_id] = True
+        report.mark_passed(
+            task_id, score=result.score, output=result.output, cached=result.cached
+        )
     except ExitEarlyError as e:
         logger.error(
             "QA config %d failed on environment '%s': %s", config_id, env_name, e
         )
-        is_task_run_success[task_id] = False
+        report.mark_failed(task_id, error=str(e))
         raise e
     except Exception as e:
         logger.error(
@@ -280,7 +352,7 @@ async def run_config(
             env_name,
             e,
         )
-        is_task_run_success[task_id] = False
+        report.mark_failed(task_id, error=str(e))
         if validation_exit_on_fail:
             raise RuntimeError(
                 f"QA config {config_id} failed on environment '{env_name}': {e}"
@@ -291,12 +363,10 @@ async def run_config(
             pbar.update(1)
 
 
-def _setup_qa_environment(
-    python_provider: PythonProvider,
-) -> bool:
-    from .strategies import DefaultPythonProvider
-
-    return isinstance(python_provider, DefaultPythonProvider)
+def _get_priority(history: Optional[QADurationHistory], task_name: str) -> float:
+    if history is None:
+        return 0
+    return history.get_priority(task_name)
 
 
 async def _submit_qa_tasks(
@@ -305,81 +375,109 @@ async def _submit_qa_tasks(
     package_name: str,
     src_folder_path: str,
     dependencies: List[Dependency],
-    is_system_interpreter: bool,
     pool: WorkerPool,
+    report: QAReport,
     pbar: Optional[SupportsProgress],
+    cache: Optional[QAResultCache] = None,
+    history: Optional[QADurationHistory] = None,
+    executors: Optional[List[AsyncLayeredCommand]] = None,
+    capabilities: Optional[EnvCapabilities] = None,
 ) -> int:
     total = 0
-    task_id = 0
     with AsyncLayeredCommand() as base:
         async for env_name, async_executor in python_provider:
             logger.debug("Setting up QA tasks for environment '%s'", env_name)
+            if executors is not None:
+                executors.append(async_executor)
+            if pool.cancelled:
+                logger.info(
+                    "Not submitting QA tasks for environment '%s', QA was cancelled",
+                    env_name,
+                )
+                continue
+            is_system_interpreter = python_provider.is_system_interpreter(env_name)
             with async_executor:
                 async_executor.prev = base
+                dependencies_name = f"Validate dependencies for env '{env_name}'"
+                import_name = f"Global Import Sanity Check for env '{env_name}'"
                 await pool.submit(
-                    validate_dependencies,
-                    args=[
-                        python_provider.exit_on_fail,
-                        dependencies,
-                        async_executor,
-                        env_name,
-                        task_id,
-                        pbar,
-                    ],
-                    name=f"Validate dependencies for env '{env_name}'",
-                )
-                total += 1
-                task_id += 1
-                await pool.submit(
-                    global_import_sanity_check,
+                    probe_environment,
                     args=[
+                        python_provider.get_exit_on_fail(env_name),
                         package_name,
+                        dependencies,
                         async_executor,
                         is_system_interpreter,
                         env_name,
-                        task_id,
+                        report,
+                        report.add_task(dependencies_name, env_name),
+                        report.add_task(import_name, env_name),
                         pbar,
                     ],
-                    name=f"Global Import Sanity Check for env '{env_name}'",
+                    name=f"Probe env '{env_name}'",
+                    priority=_get_priority(history, dependencies_name),
                 )
-                total += 1
-                task_id += 1
+                total += 2
                 for runner in quality_assurance_strategies:
+                    runner_name = runner.__class__.__qualname__
+                    name = f"Run config for '{env_name}' + '{runner_name}'"
+                    task_id = report.add_task(name, env_name, runner_name)
                     await pool.submit(
                         run_config,
-                        args=[env_name, async_executor, runner, task_id, task_id],
+                        args=[
+                            env_name,
+                            async_executor,
+                            runner,
+                            task_id,
+                            report,
+                            task_id,
+                        ],
                         kwargs=dict(
                             src_folder_path=src_folder_path,
                             is_system_interpreter=is_system_interpreter,
-                            validation_exit_on_fail=python_provider.exit_on_fail,
+                            validation_exit_on_fail=python_provider.get_exit_on_fail(env_name),
                             pbar=pbar,
+                            cache=cache,
+                            capabilities=capabilities,
                         ),
-                        name=f"Run config for '{env_name}' + '{runner.__class__.__qualname__}'",
+                        name=name,
+                        weight=runner.get_cpu_weight(),
+                        priority=_get_priority(history, name),
                     )
                     total += 1
-                    task_id += 1
+            if not pool.started:
+                await pool.start()
     if pbar is not None:
         pbar.total = total
-    for _ in range(task_id):
-        is_task_run_success.append(False)
     return total
 
 
 async def _execute_qa_tasks(
     pool: WorkerPool,
-    total: int,
+    report: QAReport,
     qa_start_time: float,
+    history: Optional[QADurationHistory] = None,
 ) -> bool:
-    logger.info("Starting QA worker pool with %d total tasks", total)
-    await pool.start()
+    logger.info("Waiting for %d QA tasks to finish", len(report))
     await pool.join()
-    success = all(is_task_run_success)
+    if pool.cancelled:
+        report.cancel_pending()
+    if history is not None:
+        history.record(report)
+    success = report.success
     elapsed = time.perf_counter() - qa_start_time
     logger.info("QA process completed in %.3fs. Success: %s", elapsed, success)
-    logger.debug("Task success breakdown: %s", is_task_run_success)
+    for task in report.failed_tasks:
+        logger.debug("QA task '%s' did not pass: %s", task.name, task.status.value)
     return success
 
 
+async def _close_executors(executors: List[AsyncLayeredCommand]) -> None:
+    for executor in executors:
+        if isinstance(executor, CancellableAsyncLayeredCommand):
+            await executor.close()
+
+
 async def qa(
     python_provider: PythonProvider,
     quality_assurance_strategies: List[QualityAssuranceRunner],
@@ -387,6 +485,12 @@ async def qa(
     src_folder_path: str,
     dependencies: List[Dependency],
     pbar: Optional[SupportsProgress] = None,
+    cache: Optional[QAResultCache] = None,
+    report: Optional[QAReport] = None,
+    fail_fast: bool = False,
+    num_workers: Optional[int] = None,
+    history: Optional[QADurationHistory] = None,
+    capabilities: Optional[EnvCapabilities] = None,
 ) -> bool:
     logger.info(
         "Starting QA process for package '%s' with %d QA strategies",
@@ -394,20 +498,48 @@ async def qa(
         len(quality_assurance_strategies),
     )
     qa_start_time = time.perf_counter()
-    is_task_run_success.clear()
-    is_system_interpreter = _setup_qa_environment(python_provider)
-    pool = WorkerPool(ASYNC_POOL_NAME, num_workers=5)
-    total = await _submit_qa_tasks(
-        python_provider,
-        quality_assurance_strategies,
-        package_name,
-        src_folder_path,
-        dependencies,
-        is_system_interpreter,
-        pool,
-        pbar,
+    report = report if report is not None else QAReport()
+    python_provider.add_requirements(
+        list(
+            dict.fromkeys(
+                [str(dependency) for dependency in dependencies]
+                + [
+                    requirement
+                    for runner in quality_assurance_strategies
+                    for requirement in runner.get_requirements()
+                ]
+            )
+        )
     )
-    return await _execute_qa_tasks(pool, total, qa_start_time)
+    pool = WorkerPool(ASYNC_POOL_NAME, fail_fast=fail_fast, cpu_budget=num_workers)
+    executors: List[AsyncLayeredCommand] = []
+    capabilities = capabilities if capabilities is not None else EnvCapabilities()
+    try:
+        try:
+            await _submit_qa_tasks(
+                python_provider,
+                quality_assurance_strategies,
+                package_name,
+                src_folder_path,
+                dependencies,
+                pool,
+                report,
+                pbar,
+                cache,
+                history,
+                executors,
+                capabilities,
+            )
+        except BaseException as e:
+            pool.cancel(f"providing environments failed: {e!r}")
+            await pool.join()
+            report.cancel_pending()
+            raise
+        if not pool.started:
+            await pool.start()
+        return await _execute_qa_tasks(pool, report, qa_start_time, history)
+    finally:
+        await _close_executors(executors)
 
 
 __all__ = ["qa", "SupportsProgress"]
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+import sys
+from typing import Dict, Optional, TYPE_CHECKING
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+from .cache import DEFAULT_CACHE_DIR, JsonFileCache, hash_paths, hash_text
+from .env_capabilities import EnvCapabilities
+
+if TYPE_CHECKING:
+    from .strategies import QualityAssuranceRunner
+
+logger = logging.getLogger(__name__)
+
+
+class QAResultCache:
+    """Persistent cache of QA runner scores.
+
+    A run is keyed on its input files, command, bound and the environment's interpreter location and installed packages.
+    """
+
+    FILE_NAME: str = "qa_results.json"
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self._store = JsonFileCache(os.path.join(cache_dir, self.FILE_NAME))
+        self._env_fingerprints: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        logger.debug("Initialized QAResultCache at '%s'", cache_dir)
+
+    async def get_env_fingerprint(
+        self,
+        executor: AsyncLayeredCommand,
+        env_name: str,
+        use_system_interpreter: bool = False,
+        capabilities: Optional[EnvCapabilities] = None,
+    ) -> Optional[str]:
+        if env_name not in self._env_fingerprints:
+            self._env_fingerprints[env_name] = asyncio.ensure_future(
+                self._compute_env_fingerprint(
+                    executor,
+                    env_name,
+                    use_system_interpreter,
+                    capabilities if capabilities is not None else EnvCapabilities(),
+                )
+            )
+        return await asyncio.shield(self._env_fingerprints[env_name])
+
+    @staticmethod
+    async def _compute_env_fingerprint(
+        executor: AsyncLayeredCommand,
+        env_name: str,
+        use_system_interpreter: bool,
+        capabilities: EnvCapabilities,
+    ) -> Optional[str]:
+        logger.debug("Fingerprinting installed packages on environment '%s'", env_name)
+        python = sys.executable if use_system_interpreter else "python"
+        distributions = await capabilities.get_distributions(
+            executor, env_name, python=python
+        )
+        location = await capabilities.get_location(executor, env_name, python=python)
+        if not distributions or location is None:
+            logger.warning(
+                "Failed fingerprinting environment '%s', no installed distributions were detected",
+                env_name,
+            )
+            return None
+        return hash_text(
+            location,
+            *(f"{name}=={version}" for name, version in sorted(distributions.items())),
+        )
+
+    async def build_key(
+        self,
+        runner: "QualityAssuranceRunner",
+        target: str,
+        command: str,
+        executor: AsyncLayeredCommand,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+        capabilities: Optional[EnvCapabilities] = None,
+    ) -> Optional[str]:
+        fingerprint = await self.get_env_fingerprint(
+            executor, env_name, use_system_interpreter, capabilities
+        )
+        if fingerprint is None:
+            return None
+        return hash_text(
+            runner.__class__.__qualname__,
+            command,
+            str(runner.bound),
+            hash_paths(runner._get_cache_inputs(target)),
+            fingerprint,
+        )
+
+    def get_score(self, key: str) -> Optional[float]:
+        score = self._store.get(key)
+        return None if score is None else float(score)
+
+    def store_score(self, key: str, score: float) -> None:
+        logger.debug("Caching QA score %s under key %s", score, key)
+        self._store.set(key, score)
+
+
+__all__ = ["QAResultCache"]
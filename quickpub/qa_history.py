@@ -0,0 +1,67 @@
+import logging
+import math
+import os
+from typing import Dict, Optional
+
+from .cache import DEFAULT_CACHE_DIR, JsonFileCache
+from .qa_report import QAReport, QATaskStatus
+
+logger = logging.getLogger(__name__)
+
+
+class QADurationHistory:
+    """Persistent record of how long each QA task took, used to start the longest-expected tasks first."""
+
+    FILE_NAME: str = "qa_durations.json"
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self._store = JsonFileCache(os.path.join(cache_dir, self.FILE_NAME))
+        logger.debug("Initialized QADurationHistory at '%s'", cache_dir)
+
+    def get_expected_duration(self, task_name: str) -> Optional[float]:
+        duration = self._store.get(task_name)
+        return float(duration) if isinstance(duration, (int, float)) else None
+
+    def get_priority(self, task_name: str) -> float:
+        """Scheduling priority of a task: its expected duration, or infinity if it was never measured."""
+        duration = self.get_expected_duration(task_name)
+        return math.inf if duration is None else duration
+
+    def record(self, report: QAReport) -> None:
+        durations: Dict[str, float] = {
+            task.name: task.duration
+            for task in report
+            if task.duration is not None
+            and not task.cached
+            and task.status in (QATaskStatus.PASSED, QATaskStatus.FAILED)
+        }
+        if not durations:
+            return
+        logger.debug("Recording durations of %d QA tasks", len(durations))
+        self._store.update(durations)
+
+
+class PerTestDurationHistory:
+    """Persistent record of how long each individual test took, keyed by its dotted test id."""
+
+    FILE_NAME: str = "test_durations.json"
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, self.FILE_NAME)
+        self._store = JsonFileCache(self.path)
+        logger.debug("Initialized PerTestDurationHistory at '%s'", cache_dir)
+
+    def get_expected_duration(self, test_id: str) -> Optional[float]:
+        duration = self._store.get(test_id)
+        return float(duration) if isinstance(duration, (int, float)) else None
+
+    def record(self, durations: Dict[str, float]) -> None:
+        if not durations:
+            return
+        logger.debug("Recording durations of %d tests", len(durations))
+        self._store.update(durations)
+
+
+__all__ = ["QADurationHistory", "PerTestDurationHistory"]
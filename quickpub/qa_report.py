@@ -0,0 +1,115 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QATaskStatus(Enum):
+    PENDING = "pending"
+    PASSED = "passed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class QATaskResult:
+    """Outcome of a single QA task (dependency validation, sanity check or a runner) on one environment."""
+
+    name: str
+    env_name: str
+    runner_name: Optional[str] = None
+    status: QATaskStatus = QATaskStatus.PENDING
+    score: Optional[float] = None
+    duration: Optional[float] = None
+    output: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    cached: bool = False
+    _start_time: Optional[float] = field(default=None, repr=False, compare=False)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == QATaskStatus.PASSED
+
+
+class QAReport:
+    """Per-invocation store of QA task outcomes. Each qa() call owns its own report."""
+
+    def __init__(self) -> None:
+        self.tasks: List[QATaskResult] = []
+
+    def add_task(
+        self, name: str, env_name: str, runner_name: Optional[str] = None
+    ) -> int:
+        self.tasks.append(QATaskResult(name, env_name, runner_name))
+        return len(self.tasks) - 1
+
+    def start(self, task_id: int) -> None:
+        self.tasks[task_id]._start_time = time.perf_counter()
+
+    def mark_passed(
+        self,
+        task_id: int,
+        *,
+        score: Optional[float] = None,
+        output: Optional[List[str]] = None,
+        cached: bool = False,
+    ) -> None:
+        self.tasks[task_id].cached = cached
+        self._finish(task_id, QATaskStatus.PASSED, score, output, None)
+
+    def mark_failed(
+        self,
+        task_id: int,
+        *,
+        output: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self._finish(task_id, QATaskStatus.FAILED, None, output, error)
+
+    def _finish(
+        self,
+        task_id: int,
+        status: QATaskStatus,
+        score: Optional[float],
+        output: Optional[List[str]],
+        error: Optional[str],
+    ) -> None:
+        task = self.tasks[task_id]
+        task.status = status
+        if score is not None:
+            task.score = score
+        if output is not None:
+            task.output = output
+        if error is not None:
+            task.error = error
+        if task._start_time is not None:
+            task.duration = time.perf_counter() - task._start_time
+        logger.debug("QA task '%s' finished with status '%s'", task.name, status.value)
+
+    def cancel_pending(self) -> None:
+        for task in self.tasks:
+            if task.status == QATaskStatus.PENDING:
+                task.status = QATaskStatus.CANCELLED
+
+    @property
+    def success(self) -> bool:
+        return all(task.passed for task in self.tasks)
+
+    @property
+    def failed_tasks(self) -> List[QATaskResult]:
+        return [task for task in self.tasks if not task.passed]
+
+    def __getitem__(self, task_id: int) -> QATaskResult:
+        return self.tasks[task_id]
+
+    def __iter__(self) -> Iterator[QATaskResult]:
+        return iter(self.tasks)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+
+__all__ = ["QAReport", "QATaskResult", "QATaskStatus"]
@@ -15,7 +15,8 @@ class BuildSchema(QuickpubStrategy):
         logger.debug("BuildSchema initialized with verbose=%s", verbose)
 
     @abstractmethod
-    def build(self, *args: Any, **kwargs: Any) -> None: ...
+    def build(self, *args: Any, **kwargs: Any) -> None:
+        """Build the project found in the directory keyword (the current directory if None) into its dist folder."""
 
 
 __all__ = ["BuildSchema"]
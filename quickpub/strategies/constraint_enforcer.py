@@ -1,3 +1,5 @@
+import asyncio
+import functools
 from abc import abstractmethod
 from typing import Any, Type
 
@@ -13,5 +15,10 @@ class ConstraintEnforcer(QuickpubStrategy):
     @abstractmethod
     def enforce(self, **kwargs: Any) -> None: ...
 
+    async def enforce_async(self, **kwargs: Any) -> None:
+        """Awaitable variant of enforce, run in a worker thread unless overridden."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.enforce, **kwargs))
+
 
 __all__ = ["ConstraintEnforcer"]
@@ -1,10 +1,11 @@
 import logging
 import os
+import subprocess
 import sys
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
-from danielutils import file_exists, LayeredCommand, delete_file
+from danielutils import file_exists, delete_file
 
 from ...build_schema import BuildSchema
 
@@ -20,31 +21,50 @@ class SetuptoolsBuildSchema(BuildSchema):
         self._backend = backend
         self._setup_file_path = setup_file_path
 
-    def build(self, verbose: bool = False, *args, **kwargs) -> None:
-        if not file_exists(self._setup_file_path):
-            logger.error("Setup file not found: %s", self._setup_file_path)
-            raise self.EXCEPTION_TYPE(f"Could not find {self._setup_file_path} file")
+    def build(
+        self,
+        verbose: bool = False,
+        *args,
+        directory: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        setup_file_path = self._setup_file_path
+        if directory is not None:
+            setup_file_path = os.path.join(
+                directory, os.path.basename(self._setup_file_path)
+            )
+        if not file_exists(setup_file_path):
+            logger.error("Setup file not found: %s", setup_file_path)
+            raise self.EXCEPTION_TYPE(f"Could not find {setup_file_path} file")
 
         if verbose:
             logger.info("Creating new distribution...")
 
         sources_file_path: str = str(
             os.path.join(
-                str(Path(self._setup_file_path).parent.resolve()),
+                str(Path(setup_file_path).parent.resolve()),
                 "quickpub.egg-info/SOURCES.txt",
             )
         )
 
         delete_file(sources_file_path)
 
-        with LayeredCommand() as exc:
-            ret, stdout, stderr = exc(
-                sys.executable + " " + self._setup_file_path + " sdist"
-            )
+        process = subprocess.run(
+            [sys.executable, setup_file_path, "sdist"],
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=False,
+        )
 
-        if ret != 0:
-            logger.error("Build command failed with return code %d: %s", ret, stderr)
-            raise self.EXCEPTION_TYPE(stderr)
+        if process.returncode != 0:
+            logger.error(
+                "Build command failed with return code %d: %s",
+                process.returncode,
+                process.stderr,
+            )
+            raise self.EXCEPTION_TYPE(process.stderr)
 
 
 __all__ = [
@@ -1,3 +1,7 @@
+from .conda_env_list_cache import *
 from .conda_python_provider import *
 from .default_python_provider import *
 from .union_provider import *
+from .venv_pool import *
+from .venv_python_provider import *
+from .uv_python_provider import *
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, ClassVar, Dict, List, Optional
+
+from ....cache import DEFAULT_CACHE_DIR, JsonFileCache, hash_text
+
+logger = logging.getLogger(__name__)
+
+EnvListFetcher = Callable[[], Awaitable[Optional[Dict[str, str]]]]
+
+
+def get_conda_metadata_paths() -> List[str]:
+    """Paths whose modification time changes whenever a conda environment is created or removed."""
+    home_conda = os.path.join(os.path.expanduser("~"), ".conda")
+    paths = [
+        os.path.join(home_conda, "environments.txt"),
+        os.path.join(home_conda, "envs"),
+    ]
+    conda_exe = os.environ.get("CONDA_EXE")
+    if conda_exe:
+        paths.append(os.path.join(os.path.dirname(os.path.dirname(conda_exe)), "envs"))
+    envs_path = os.environ.get("CONDA_ENVS_PATH") or os.environ.get("CONDA_ENVS_DIRS")
+    if envs_path:
+        paths.extend(path for path in envs_path.split(os.pathsep) if path)
+    return paths
+
+
+def get_conda_metadata_fingerprint() -> Optional[str]:
+    entries = []
+    for path in get_conda_metadata_paths():
+        try:
+            entries.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            continue
+    if not entries:
+        return None
+    return hash_text(*entries)
+
+
+class CondaEnvListCache:
+    """Process-wide and on-disk cache of parsed 'conda env list' output.
+
+    Entries are invalidated when conda's environments.txt or envs directories change.
+    """
+
+    FILE_NAME: str = "conda_envs.json"
+    KEY: str = "conda_env_list"
+    _memory: ClassVar[Dict[Optional[str], Dict[str, str]]] = {}
+    _pending: ClassVar[
+        Dict[Optional[str], "asyncio.Future[Optional[Dict[str, str]]]"]
+    ] = {}
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self._store = (
+            None
+            if cache_dir is None
+            else JsonFileCache(os.path.join(cache_dir, self.FILE_NAME))
+        )
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        cls._memory.clear()
+        cls._pending.clear()
+
+    def _read_disk(self, fingerprint: Optional[str]) -> Optional[Dict[str, str]]:
+        if self._store is None or fingerprint is None:
+            return None
+        entry = self._store.get(self.KEY)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        prefixes = entry.get("prefixes")
+        return prefixes if isinstance(prefixes, dict) else None
+
+    def _write_disk(self, fingerprint: Optional[str], prefixes: Dict[str, str]) -> None:
+        if self._store is None or fingerprint is None:
+            return
+        try:
+            self._store.set(
+                self.KEY, {"fingerprint": fingerprint, "prefixes": prefixes}
+            )
+        except OSError as e:
+            logger.warning("Failed writing conda environments cache: %s", e)
+
+    async def get(self, fetch: EnvListFetcher) -> Dict[str, str]:
+        fingerprint = get_conda_metadata_fingerprint()
+        if fingerprint in self._memory:
+            logger.debug("Using process-wide cache of conda environments")
+            return self._memory[fingerprint]
+
+        prefixes = self._read_disk(fingerprint)
+        if prefixes is not None:
+            logger.debug("Using on-disk cache of conda environments")
+            self._memory[fingerprint] = prefixes
+            return prefixes
+
+        pending = self._pending.get(fingerprint)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            pending = asyncio.ensure_future(fetch())
+            self._pending[fingerprint] = pending
+        try:
+            fetched = await asyncio.shield(pending)
+        finally:
+            if self._pending.get(fingerprint) is pending and pending.done():
+                del self._pending[fingerprint]
+        if fetched is None:
+            return {}
+        self._memory[fingerprint] = fetched
+        self._write_disk(fingerprint, fetched)
+        logger.debug("Cached %d conda environments: %s", len(fetched), sorted(fetched))
+        return fetched
+
+
+__all__ = ["CondaEnvListCache"]
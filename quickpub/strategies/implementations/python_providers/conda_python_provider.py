@@ -1,31 +1,128 @@
 import logging
-from typing import Tuple, Optional, Set, List
+import os
+import re
+import sys
+from typing import Tuple, Optional, Set, List, Dict
 from danielutils import AsyncLayeredCommand
 
 from ....enforcers import ExitEarlyError
+from ....executors import CancellableAsyncLayeredCommand, PersistentShellCommand
 from ...python_provider import PythonProvider
+from .conda_env_list_cache import CondaEnvListCache
 
 logger = logging.getLogger(__name__)
 
+ENV_LIST_LINE_PATTERN: re.Pattern = re.compile(r"^(\S+)\s+(?:\*\s+)?(\S.*?)\s*$")
+
+
+def parse_conda_env_list(lines: List[str]) -> Dict[str, str]:
+    """Map each named environment in the output of 'conda env list' to its prefix path."""
+    prefixes: Dict[str, str] = {}
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        match = ENV_LIST_LINE_PATTERN.match(line)
+        if match is None:
+            continue
+        name, prefix = match.groups()
+        prefixes[name] = prefix
+    return prefixes
+
+
+def get_conda_path_entries(prefix: str) -> List[str]:
+    if sys.platform == "win32":
+        return [
+            prefix,
+            os.path.join(prefix, "Library", "mingw-w64", "bin"),
+            os.path.join(prefix, "Library", "usr", "bin"),
+            os.path.join(prefix, "Library", "bin"),
+            os.path.join(prefix, "Scripts"),
+            os.path.join(prefix, "bin"),
+        ]
+    return [os.path.join(prefix, "bin")]
+
+
+def get_conda_environment(name: str, prefix: str) -> Dict[str, str]:
+    """Environment variables equivalent to 'conda activate', without running the activation hook."""
+    environment = dict(os.environ)
+    path_entries = get_conda_path_entries(prefix)
+    current_path = environment.get("PATH", "")
+    environment["PATH"] = os.pathsep.join(
+        path_entries + ([current_path] if current_path else [])
+    )
+    environment["CONDA_PREFIX"] = prefix
+    environment["CONDA_DEFAULT_ENV"] = name
+    environment.pop("PYTHONHOME", None)
+    return environment
+
 
 class CondaPythonProvider(PythonProvider):
-    """Python provider implementation using conda environments. Iterates over specified conda environment names."""
+    """Python provider implementation using conda environments. Iterates over specified conda environment names.
+
+    Commands run directly against each environment's prefix with a computed PATH. Set activate to run 'conda activate'
+    instead, e.g. for environments that rely on activate.d scripts. With persistent_shell, each environment gets
+    long-lived shells that all of its commands reuse. The output of 'conda env list' is shared through env_list_cache.
+    """
 
     def get_python_executable_name(self) -> str:
         return "python"
 
-    def __init__(self, env_names: List[str]) -> None:
+    def __init__(
+        self,
+        env_names: List[str],
+        persistent_shell: bool = True,
+        activate: bool = False,
+        env_list_cache: Optional[CondaEnvListCache] = None,
+    ) -> None:
         PythonProvider.__init__(
             self, requested_envs=env_names, explicit_versions=[], exit_on_fail=True
         )
-        self._cached_available_envs: Optional[Set[str]] = None
+        self.persistent_shell = persistent_shell
+        self.activate = activate
+        self.env_list_cache = (
+            env_list_cache if env_list_cache is not None else CondaEnvListCache()
+        )
+        self._env_prefixes: Optional[Dict[str, str]] = None
         logger.info("Initialized CondaPythonProvider with environments: %s", env_names)
 
-    async def _get_available_envs_impl(self) -> Set[str]:
+    @staticmethod
+    async def _fetch_env_prefixes() -> Optional[Dict[str, str]]:
         logger.info("Fetching available conda environments")
         with AsyncLayeredCommand() as base:
             code, out, err = await base("conda env list")
-        return set([line.split(" ")[0] for line in out[2:] if len(line.split(" ")) > 1])
+        if code != 0:
+            logger.warning("'conda env list' failed with exit code %d: %s", code, err)
+            return None
+        return parse_conda_env_list(out)
+
+    async def _get_env_prefixes(self) -> Dict[str, str]:
+        if self._env_prefixes is None:
+            self._env_prefixes = await self.env_list_cache.get(self._fetch_env_prefixes)
+        return self._env_prefixes
+
+    async def _get_available_envs_impl(self) -> Set[str]:
+        return set(await self._get_env_prefixes())
+
+    def get_python_executable(self, prefix: str) -> str:
+        if sys.platform == "win32":
+            return os.path.join(prefix, "python.exe")
+        return os.path.join(prefix, "bin", "python")
+
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        prefix = (await self._get_env_prefixes()).get(env_name)
+        if prefix is None:
+            return None
+        return self.get_python_executable(prefix)
+
+    def _create_executor(self, name: str, prefix: str) -> AsyncLayeredCommand:
+        executor_type = (
+            PersistentShellCommand
+            if self.persistent_shell
+            else CancellableAsyncLayeredCommand
+        )
+        if self.activate:
+            return executor_type(f"conda activate {name}")
+        return executor_type(environment=get_conda_environment(name, prefix))
 
     async def __anext__(self) -> Tuple[str, AsyncLayeredCommand]:
         if self.aiter_index >= len(self.requested_envs):
@@ -35,7 +132,7 @@ class CondaPythonProvider(PythonProvider):
         self.aiter_index += 1
         name = self.requested_envs[self.aiter_index - 1]
 
-        logger.debug("Activating conda environment: %s", name)
+        logger.debug("Resolving conda environment: %s", name)
 
         if name not in available_envs:
             logger.error(
@@ -45,8 +142,13 @@ class CondaPythonProvider(PythonProvider):
                 f"Can't find env '{name}' in list of conda environments, try 'conda env list'"
             )
 
-        logger.debug("Successfully activated conda environment: %s", name)
-        return name, AsyncLayeredCommand(f"conda activate {name}")
+        prefix = (await self._get_env_prefixes())[name]
+        logger.debug(
+            "Resolved conda environment '%s' to interpreter '%s'",
+            name,
+            self.get_python_executable(prefix),
+        )
+        return name, self._create_executor(name, prefix)
 
 
 __all__ = [
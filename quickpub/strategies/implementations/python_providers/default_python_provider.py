@@ -1,9 +1,10 @@
 import logging
 import sys
-from typing import Set, Tuple, AsyncIterator, Iterable, Any
+from typing import Set, Tuple, AsyncIterator, Iterable, Any, Optional
 
 from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
+from ....executors import CancellableAsyncLayeredCommand
 from ...python_provider import PythonProvider
 
 logger = logging.getLogger(__name__)
@@ -32,9 +33,15 @@ class DefaultPythonProvider(PythonProvider):
         if self.aiter_index == 0:
             self.aiter_index += 1
             logger.info("Using system Python environment")
-            return "system", AsyncLayeredCommand()
+            return "system", CancellableAsyncLayeredCommand()
         raise StopAsyncIteration
 
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        return sys.executable
+
+    def is_system_interpreter(self, env_name: str) -> bool:
+        return env_name == "system"
+
     @classmethod
     async def _get_available_envs_impl(cls) -> Set[str]:
         return {"system"}
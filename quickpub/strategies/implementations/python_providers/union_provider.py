@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+from ....executors import CancellableAsyncLayeredCommand
+from ...python_provider import PythonProvider
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_interpreter_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class UnionProvider(PythonProvider):
+    """Python provider that chains several providers.
+
+    Discovery of all child providers runs concurrently, and each child's environments are yielded as soon as its own
+    discovery finished.
+
+    An environment whose interpreter is also provided by an earlier child, or by an earlier environment of the same
+    child, is skipped, so the first child in order always wins. Dependency failures are fatal as each env's child says.
+    """
+
+    def __init__(self, providers: List[PythonProvider]) -> None:
+        requested_envs = [
+            env for provider in providers for env in provider.requested_envs
+        ]
+        PythonProvider.__init__(
+            self,
+            requested_envs=requested_envs,
+            explicit_versions=[],
+            exit_on_fail=all(provider.exit_on_fail for provider in providers),
+        )
+        self.providers = providers
+        self._discoveries: List["asyncio.Future[Set[str]]"] = []
+        self._pending: Set[int] = set()
+        self._ready: Deque[
+            Tuple[int, AsyncIterator[Tuple[str, AsyncLayeredCommand]]]
+        ] = deque()
+        self._seen_interpreters: Set[str] = set()
+        self._env_owners: Dict[str, PythonProvider] = {}
+        logger.info("Initialized UnionProvider with %d child providers", len(providers))
+
+    def get_python_executable_name(self) -> str:
+        if not self.providers:
+            raise RuntimeError("UnionProvider has no child providers")
+        return self.providers[0].get_python_executable_name()
+
+    def __aiter__(self) -> "UnionProvider":
+        self._cancel_discoveries()
+        PythonProvider.__aiter__(self)
+        self._discoveries = []
+        self._pending = set()
+        self._ready.clear()
+        self._seen_interpreters.clear()
+        self._env_owners.clear()
+        return self
+
+    def _start_discoveries(self) -> None:
+        logger.debug(
+            "Starting environment discovery for %d providers", len(self.providers)
+        )
+        self._discoveries = [
+            asyncio.ensure_future(provider._get_available_envs())
+            for provider in self.providers
+        ]
+        self._pending = set(range(len(self.providers)))
+
+    def _cancel_discoveries(self) -> None:
+        for discovery in self._discoveries:
+            discovery.cancel()
+
+    @staticmethod
+    async def _iterate(
+        provider: PythonProvider,
+    ) -> AsyncIterator[Tuple[str, AsyncLayeredCommand]]:
+        async for env in provider:
+            yield env
+
+    async def _wait_for_ready_provider(self) -> None:
+        pending = [
+            self._discoveries[index]
+            for index in self._pending
+            if not self._discoveries[index].done()
+        ]
+        if pending:
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for index in sorted(i for i in self._pending if self._discoveries[i].done()):
+            self._pending.discard(index)
+            provider = self.providers[index]
+            try:
+                self._discoveries[index].result()
+            except BaseException:
+                self._cancel_discoveries()
+                raise
+            logger.debug("Discovery finished for %s", provider.__class__.__name__)
+            self._ready.append((index, self._iterate(provider)))
+
+    async def _get_interpreters(self, index: int) -> Set[str]:
+        """Interpreters of the requested and available environments of a child."""
+        provider = self.providers[index]
+        available_envs = await asyncio.shield(self._discoveries[index])
+        paths = await asyncio.gather(
+            *(
+                provider.get_interpreter_path(env)
+                for env in provider.requested_envs
+                if env in available_envs
+            )
+        )
+        return {_normalize_interpreter_path(path) for path in paths if path is not None}
+
+    async def _is_duplicate(self, index: int, env_name: str) -> bool:
+        interpreter = await self.providers[index].get_interpreter_path(env_name)
+        if interpreter is None:
+            return False
+        key = _normalize_interpreter_path(interpreter)
+        for earlier in range(index):
+            if key in await self._get_interpreters(earlier):
+                return True
+        if key in self._seen_interpreters:
+            return True
+        self._seen_interpreters.add(key)
+        return False
+
+    @staticmethod
+    async def _discard_executor(executor: AsyncLayeredCommand) -> None:
+        with executor:
+            pass
+        if isinstance(executor, CancellableAsyncLayeredCommand):
+            await executor.close()
+
+    async def __anext__(self) -> Tuple[str, AsyncLayeredCommand]:
+        if len(self._discoveries) != len(self.providers):
+            self._start_discoveries()
+        self.aiter_index += 1
+
+        while True:
+            if not self._ready:
+                if not self._pending:
+                    raise StopAsyncIteration
+                await self._wait_for_ready_provider()
+                continue
+            index, envs = self._ready[0]
+            provider = self.providers[index]
+
+            try:
+                env_name, executor = await envs.__anext__()
+            except StopAsyncIteration:
+                self._ready.popleft()
+                continue
+            except BaseException:
+                self._cancel_discoveries()
+                raise
+
+            if await self._is_duplicate(index, env_name):
+                logger.info(
+                    "Skipping environment '%s' of %s because its interpreter is provided by an earlier environment",
+                    env_name,
+                    provider.__class__.__name__,
+                )
+                await self._discard_executor(executor)
+                continue
+            self._env_owners[env_name] = provider
+            return env_name, executor
+
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        provider = self._env_owners.get(env_name)
+        if provider is None:
+            return None
+        return await provider.get_interpreter_path(env_name)
+
+    def add_requirements(self, requirements: List[str]) -> None:
+        for provider in self.providers:
+            provider.add_requirements(requirements)
+
+    def is_system_interpreter(self, env_name: str) -> bool:
+        provider = self._env_owners.get(env_name)
+        return provider is not None and provider.is_system_interpreter(env_name)
+
+    def get_exit_on_fail(self, env_name: str) -> bool:
+        provider = self._env_owners.get(env_name)
+        if provider is None:
+            return self.exit_on_fail
+        return provider.get_exit_on_fail(env_name)
+
+    async def _get_available_envs_impl(self) -> Set[str]:
+        available_envs: Set[str] = set()
+        for envs in await asyncio.gather(
+            *(provider._get_available_envs() for provider in self.providers)
+        ):
+            available_envs.update(envs)
+        return available_envs
+
+
+__all__ = ["UnionProvider"]
@@ -0,0 +1,79 @@
+import logging
+import os
+from typing import List, Optional
+
+from ....cache import DEFAULT_CACHE_DIR
+from .venv_pool import VenvPool
+from .venv_python_provider import VenvPythonProvider, quote_argument
+
+logger = logging.getLogger(__name__)
+
+
+class UvPythonProvider(VenvPythonProvider):
+    """VenvPythonProvider that creates environments and installs requirements with uv.
+
+    All environments share uv's local wheel cache. With offline, uv only installs packages already in its cache.
+    """
+
+    BACKEND: str = "uv"
+
+    def __init__(
+        self,
+        interpreters: List[str],
+        requirements: Optional[List[str]] = None,
+        pool: Optional[VenvPool] = None,
+        persistent_shell: bool = True,
+        auto_install_dependencies: bool = True,
+        *,
+        uv_executable: str = "uv",
+        cache_dir: Optional[str] = os.path.join(DEFAULT_CACHE_DIR, "uv"),
+        offline: bool = False,
+    ) -> None:
+        VenvPythonProvider.__init__(
+            self,
+            interpreters,
+            requirements=requirements,
+            pool=pool,
+            persistent_shell=persistent_shell,
+            auto_install_dependencies=auto_install_dependencies,
+        )
+        self.uv_executable = uv_executable
+        self.cache_dir = cache_dir
+        self.offline = offline
+
+    def _get_uv_options(self) -> str:
+        options = []
+        if self.cache_dir is not None:
+            options.append(
+                f"--cache-dir {quote_argument(os.path.abspath(self.cache_dir))}"
+            )
+        if self.offline:
+            options.append("--offline")
+        return " ".join(options)
+
+    def _get_uv_command(self, subcommand: str, arguments: str) -> str:
+        return " ".join(
+            part
+            for part in (
+                quote_argument(self.uv_executable),
+                subcommand,
+                self._get_uv_options(),
+                arguments,
+            )
+            if part
+        )
+
+    def _get_create_command(self, interpreter: str, path: str) -> str:
+        return self._get_uv_command(
+            "venv",
+            f"--seed --python {quote_argument(interpreter)} {quote_argument(path)}",
+        )
+
+    def _get_install_command(self, python: str) -> str:
+        requirements = " ".join(quote_argument(r) for r in self.requirements)
+        return self._get_uv_command(
+            "pip install", f"--python {quote_argument(python)} {requirements}"
+        )
+
+
+__all__ = ["UvPythonProvider"]
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from ....cache import DEFAULT_CACHE_DIR, hash_text
+
+logger = logging.getLogger(__name__)
+
+VenvBuilder = Callable[[str], Awaitable[None]]
+
+
+def get_venv_bin_dir(path: str) -> str:
+    return os.path.join(path, "Scripts" if sys.platform == "win32" else "bin")
+
+
+def get_venv_python(path: str) -> str:
+    return os.path.join(
+        get_venv_bin_dir(path), "python.exe" if sys.platform == "win32" else "python"
+    )
+
+
+def get_venv_environment(path: str) -> Dict[str, str]:
+    """Environment variables equivalent to activating the virtual environment at path."""
+    environment = dict(os.environ)
+    current_path = environment.get("PATH", "")
+    environment["PATH"] = os.pathsep.join(
+        [get_venv_bin_dir(path)] + ([current_path] if current_path else [])
+    )
+    environment["VIRTUAL_ENV"] = path
+    environment.pop("PYTHONHOME", None)
+    return environment
+
+
+class VenvPool:
+    """On-disk pool of virtual environments keyed by interpreter and requirements, reused across runs."""
+
+    MARKER_FILE_NAME: str = "quickpub_venv.json"
+    LOCK_TIMEOUT: float = 1800.0
+    LOCK_POLL_INTERVAL: float = 0.5
+
+    def __init__(
+        self, pool_dir: str = os.path.join(DEFAULT_CACHE_DIR, "venvs")
+    ) -> None:
+        self.pool_dir = pool_dir
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def get_key(interpreter: str, requirements: Iterable[str], *extra: str) -> str:
+        """Key of the environment built from interpreter with requirements, changing with the interpreter binary."""
+        interpreter = os.path.realpath(interpreter)
+        try:
+            interpreter_mtime = str(os.stat(interpreter).st_mtime_ns)
+        except OSError:
+            interpreter_mtime = "missing"
+        return hash_text(
+            interpreter,
+            interpreter_mtime,
+            *sorted(requirement.strip() for requirement in requirements),
+            *extra,
+        )[:16]
+
+    def get_path(self, key: str) -> str:
+        return os.path.abspath(os.path.join(self.pool_dir, key))
+
+    def _marker_path(self, key: str) -> str:
+        return os.path.join(self.get_path(key), self.MARKER_FILE_NAME)
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.pool_dir, f"{key}.lock")
+
+    def is_ready(self, key: str) -> bool:
+        return os.path.isfile(self._marker_path(key))
+
+    async def acquire(
+        self,
+        key: str,
+        build: VenvBuilder,
+        metadata: Optional[Dict[str, object]] = None,
+    ) -> str:
+        """Path of the environment for key, calling build with that path first if it isn't in the pool yet."""
+        path = self.get_path(key)
+        if self.is_ready(key):
+            logger.debug("Reusing pooled virtual environment '%s'", path)
+            return path
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self.is_ready(key):
+                return path
+            await self._acquire_file_lock(key)
+            try:
+                if self.is_ready(key):
+                    return path
+                await self._build(key, build, metadata or {})
+            finally:
+                self._release_file_lock(key)
+        return path
+
+    async def _build(
+        self, key: str, build: VenvBuilder, metadata: Dict[str, object]
+    ) -> None:
+        path = self.get_path(key)
+        if os.path.exists(path):
+            logger.info("Removing incomplete virtual environment '%s'", path)
+            shutil.rmtree(path, ignore_errors=True)
+        logger.info("Building virtual environment '%s'", path)
+        start_time = time.perf_counter()
+        try:
+            await build(path)
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        with open(self._marker_path(key), "w", encoding="utf8") as f:
+            json.dump(metadata, f, indent=2, sort_keys=True)
+        logger.info(
+            "Built virtual environment '%s' in %.3fs",
+            path,
+            time.perf_counter() - start_time,
+        )
+
+    async def _acquire_file_lock(self, key: str) -> None:
+        os.makedirs(self.pool_dir, exist_ok=True)
+        lock_path = self._lock_path(key)
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - os.stat(lock_path).st_mtime
+                except OSError:
+                    continue
+                if age > self.LOCK_TIMEOUT:
+                    logger.warning(
+                        "Removing stale virtual environment lock '%s'", lock_path
+                    )
+                    try:
+                        os.remove(lock_path)
+                    except OSError:
+                        pass
+                    continue
+                await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return
+
+    def _release_file_lock(self, key: str) -> None:
+        try:
+            os.remove(self._lock_path(key))
+        except OSError as e:
+            logger.warning("Failed removing virtual environment lock: %s", e)
+
+
+__all__ = ["VenvPool"]
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+import shutil
+from typing import Dict, List, Optional, Set, Tuple
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+from ....enforcers import ExitEarlyError
+from ....executors import (
+    CancellableAsyncLayeredCommand,
+    PersistentShellCommand,
+    run_cancellable_shell,
+)
+from ...python_provider import PythonProvider
+from .venv_pool import VenvPool, get_venv_environment, get_venv_python
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_interpreter(interpreter: str) -> Optional[str]:
+    """Absolute path of an interpreter given by path or by a name on PATH, or None if it doesn't exist."""
+    if os.path.isfile(interpreter):
+        return os.path.abspath(interpreter)
+    return shutil.which(interpreter)
+
+
+def quote_argument(argument: str) -> str:
+    return f'"{argument}"'
+
+
+class VenvPythonProvider(PythonProvider):
+    """Python provider running each requested interpreter in a pooled virtual environment with the requirements."""
+
+    BACKEND: str = "venv"
+
+    def get_python_executable_name(self) -> str:
+        return "python"
+
+    def __init__(
+        self,
+        interpreters: List[str],
+        requirements: Optional[List[str]] = None,
+        pool: Optional[VenvPool] = None,
+        persistent_shell: bool = True,
+        auto_install_dependencies: bool = True,
+    ) -> None:
+        PythonProvider.__init__(
+            self,
+            auto_install_dependencies,
+            requested_envs=interpreters,
+            explicit_versions=[],
+            exit_on_fail=True,
+        )
+        self.requirements = list(requirements or [])
+        self.pool = pool if pool is not None else VenvPool()
+        self.persistent_shell = persistent_shell
+        self._interpreters: Dict[str, Optional[str]] = {}
+        self._venvs: Dict[str, "asyncio.Future[str]"] = {}
+        logger.info(
+            "Initialized %s with interpreters %s and requirements %s",
+            self.__class__.__name__,
+            interpreters,
+            self.requirements,
+        )
+
+    def _resolve(self, name: str) -> Optional[str]:
+        if name not in self._interpreters:
+            self._interpreters[name] = resolve_interpreter(name)
+        return self._interpreters[name]
+
+    async def _get_available_envs_impl(self) -> Set[str]:
+        return {name for name in self.requested_envs if self._resolve(name) is not None}
+
+    def add_requirements(self, requirements: List[str]) -> None:
+        if not self.auto_install_dependencies:
+            return
+        added = [r for r in requirements if r not in self.requirements]
+        if not added:
+            return
+        logger.info("Adding requirements %s to %s", added, self.__class__.__name__)
+        self.requirements.extend(added)
+        self._cancel_venv_builds()
+        self._venvs.clear()
+
+    def _get_key(self, interpreter: str) -> str:
+        return VenvPool.get_key(interpreter, self.requirements, self.BACKEND)
+
+    def _get_create_command(self, interpreter: str, path: str) -> str:
+        return f"{quote_argument(interpreter)} -m venv {quote_argument(path)}"
+
+    def _get_install_command(self, python: str) -> str:
+        requirements = " ".join(quote_argument(r) for r in self.requirements)
+        return f"{quote_argument(python)} -m pip install --disable-pip-version-check {requirements}"
+
+    async def _run_build_step(self, command: str) -> None:
+        logger.debug("Running virtual environment build step: %s", command)
+        code, out, err = await run_cancellable_shell(command)
+        if code != 0:
+            output = (out or b"").decode(errors="replace") + (err or b"").decode(
+                errors="replace"
+            )
+            raise RuntimeError(
+                f"Failed building virtual environment, command '{command}' exited with code {code}",
+                output.splitlines(),
+            )
+
+    async def _build_venv(self, interpreter: str, path: str) -> None:
+        await self._run_build_step(self._get_create_command(interpreter, path))
+        if self.requirements:
+            await self._run_build_step(self._get_install_command(get_venv_python(path)))
+
+    async def _acquire_venv(self, interpreter: str) -> str:
+        async def build(path: str) -> None:
+            await self._build_venv(interpreter, path)
+
+        return await self.pool.acquire(
+            self._get_key(interpreter),
+            build,
+            {
+                "backend": self.BACKEND,
+                "interpreter": interpreter,
+                "requirements": self.requirements,
+            },
+        )
+
+    def _start_venv_builds(self, available_envs: Set[str]) -> None:
+        for name in self.requested_envs:
+            if name in available_envs and name not in self._venvs:
+                self._venvs[name] = asyncio.ensure_future(
+                    self._acquire_venv(self._resolve(name))  # type: ignore
+                )
+
+    def _cancel_venv_builds(self) -> None:
+        for name, venv in list(self._venvs.items()):
+            if not venv.done():
+                venv.cancel()
+            elif not venv.cancelled() and venv.exception() is None:
+                continue
+            del self._venvs[name]
+
+    def _create_executor(self, path: str) -> AsyncLayeredCommand:
+        executor_type = (
+            PersistentShellCommand
+            if self.persistent_shell
+            else CancellableAsyncLayeredCommand
+        )
+        return executor_type(environment=get_venv_environment(path))
+
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        interpreter = self._resolve(env_name)
+        if interpreter is None:
+            return None
+        return get_venv_python(self.pool.get_path(self._get_key(interpreter)))
+
+    async def __anext__(self) -> Tuple[str, AsyncLayeredCommand]:
+        if self.aiter_index >= len(self.requested_envs):
+            raise StopAsyncIteration
+
+        available_envs = await self._get_available_envs()
+        self.aiter_index += 1
+        name = self.requested_envs[self.aiter_index - 1]
+
+        if name not in available_envs:
+            logger.error("Interpreter '%s' not found", name)
+            raise ExitEarlyError(
+                f"Can't find interpreter '{name}', pass a path or a name found on PATH"
+            )
+
+        self._start_venv_builds(available_envs)
+        try:
+            path = await asyncio.shield(self._venvs[name])
+        except BaseException:
+            self._cancel_venv_builds()
+            raise
+        logger.debug("Using virtual environment '%s' for interpreter '%s'", path, name)
+        return name, self._create_executor(path)
+
+
+__all__ = ["VenvPythonProvider"]
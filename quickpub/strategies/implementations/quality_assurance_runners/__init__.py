@@ -2,3 +2,5 @@ from .mypy_qa_runner import *
 from .pylint_qa_runner import *
 from .pytest_qa_runner import *
 from .unittest_qa_runner import *
+from .import_time_qa_runner import *
+from .benchmark_qa_runner import *
@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+from danielutils import LayeredCommand
+
+from .... import benchmark_probe
+from ....cache import JsonFileCache
+from ....enforcers import ExitEarlyError
+from ....structures import Bound, Version
+from ...quality_assurance_runner import QualityAssuranceRunner
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PROBE_PATH: str = os.path.abspath(benchmark_probe.__file__)
+DEFAULT_BASELINE_DIR: str = "./.quickpub_benchmarks"
+PYTEST_NO_TESTS_COLLECTED: int = 5
+
+
+class BenchmarkRunner(QualityAssuranceRunner):
+    """Quality assurance runner for pytest-benchmark suites.
+
+    Scores the worst slowdown of any benchmark relative to the last published version. Baselines are stored per version
+    and per python implementation under baseline_dir. Runs that pass the bound become the baseline of the published
+    version, or of version if it is given, once publish() uploaded it.
+
+    With exclusive, the runner occupies the whole CPU budget so other QA tasks don't skew its measurement.
+    """
+
+    STATISTICS: Tuple[str, ...] = ("min", "max", "mean", "median")
+
+    def __init__(
+        self,
+        *,
+        bound: Union[str, Bound] = "<=1.2",
+        target: str = "./benchmarks",
+        version: Optional[Union[str, Version]] = None,
+        baseline_dir: str = DEFAULT_BASELINE_DIR,
+        statistic: str = "median",
+        exclusive: bool = True,
+    ) -> None:
+        super().__init__(name="benchmark", bound=bound, target=target)
+        if statistic not in self.STATISTICS:
+            raise ValueError(
+                f"statistic must be one of {', '.join(self.STATISTICS)}, got '{statistic}'"
+            )
+        self.version: Optional[Version] = (
+            Version.from_str(version) if isinstance(version, str) else version
+        )
+        self.baseline_dir = baseline_dir
+        self.statistic = statistic
+        self.exclusive = exclusive
+        self._passed_results: Dict[str, Dict[str, float]] = {}
+        logger.info(
+            "Initialized BenchmarkRunner with bound='%s', target='%s', version='%s', baseline_dir='%s'",
+            bound,
+            target,
+            self.version,
+            baseline_dir,
+        )
+
+    def get_cpu_weight(self) -> int:
+        if self.exclusive:
+            return os.cpu_count() or 1
+        return 1
+
+    def is_cacheable(self) -> bool:
+        return False
+
+    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
+        python = sys.executable if use_system_interpreter else "python"
+        return f'{python} "{BENCHMARK_PROBE_PATH}" "{self.target}" {self.statistic}'
+
+    def _install_dependencies(self, base: LayeredCommand) -> None:
+        logger.info("Installing benchmark dependencies")
+        with base:
+            base(f"{sys.executable} -m pip install pytest pytest-benchmark")
+
+    def get_requirements(self) -> List[str]:
+        return ["pytest", "pytest-benchmark"]
+
+    def _get_baseline_path(self, python: str, version: Version) -> str:
+        return os.path.join(self.baseline_dir, python, f"{version}.json")
+
+    def load_baseline(self, python: str) -> Optional[Tuple[Version, Dict[str, float]]]:
+        """The stored results of the latest version below self.version, or of the latest version if none was given."""
+        directory = os.path.join(self.baseline_dir, python)
+        if not os.path.isdir(directory):
+            return None
+        versions: List[Version] = []
+        for file_name in os.listdir(directory):
+            stem, extension = os.path.splitext(file_name)
+            if extension != ".json":
+                continue
+            try:
+                versions.append(Version.from_str(stem))
+            except ValueError:
+                logger.warning("Ignoring unrecognized baseline file '%s'", file_name)
+        if self.version is not None:
+            versions = [version for version in versions if version < self.version]
+        if not versions:
+            return None
+        version = max(versions)
+        results = JsonFileCache(self._get_baseline_path(python, version)).get(
+            "benchmarks", {}
+        )
+        return version, results
+
+    def store_baseline(
+        self, python: str, version: Version, results: Dict[str, float]
+    ) -> None:
+        path = self._get_baseline_path(python, version)
+        logger.info("Storing %d benchmark results as '%s'", len(results), path)
+        JsonFileCache(path).update({"statistic": self.statistic, "benchmarks": results})
+
+    def on_published(self, name: str, version: Version) -> None:
+        baseline_version = self.version if self.version is not None else version
+        for python, results in self._passed_results.items():
+            self.store_baseline(python, baseline_version, results)
+        self._passed_results.clear()
+
+    @staticmethod
+    def get_slowdowns(
+        results: Dict[str, float], baseline: Dict[str, float]
+    ) -> Dict[str, float]:
+        return {
+            name: seconds / baseline[name]
+            for name, seconds in results.items()
+            if baseline.get(name, 0) > 0
+        }
+
+    def _parse_results(
+        self, ret: int, lines: List[str]
+    ) -> Tuple[str, Dict[str, float]]:
+        stripped = [line.strip() for line in lines]
+        if benchmark_probe.RESULT_MARKER not in stripped:
+            raise ExitEarlyError(
+                f"Failed running benchmarks, got exit code {ret}. "
+                f"try running manually using: {self._build_command('TARGET')}"
+            )
+        start = stripped.index(benchmark_probe.RESULT_MARKER) + 1
+        try:
+            data = json.loads(stripped[start])
+        except (IndexError, ValueError) as e:
+            raise ExitEarlyError(
+                f"Can't parse benchmark results: {lines[start:]}"
+            ) from e
+        if ret not in (0, PYTEST_NO_TESTS_COLLECTED):
+            raise ExitEarlyError(f"Benchmark suite failed with exit code {ret}")
+        return data["python"], data["benchmarks"]
+
+    def _calculate_score(
+        self, ret: int, command_output: List[str], *, verbose: bool = False
+    ) -> float:
+        logger.info("Calculating benchmark score")
+        python, results = self._parse_results(ret, command_output)
+        if not results:
+            logger.warning("No benchmarks ran on '%s'", python)
+        baseline = self.load_baseline(python)
+        if baseline is None:
+            logger.warning(
+                "No benchmark baseline found for '%s', nothing to compare against",
+                python,
+            )
+            score = 1.0
+        else:
+            baseline_version, baseline_results = baseline
+            slowdowns = self.get_slowdowns(results, baseline_results)
+            for name, slowdown in sorted(
+                slowdowns.items(), key=lambda item: item[1], reverse=True
+            ):
+                logger.info(
+                    "Benchmark '%s' on '%s': %.3fx of version %s",
+                    name,
+                    python,
+                    slowdown,
+                    baseline_version,
+                )
+            score = max(slowdowns.values(), default=1.0)
+        if self.bound.compare_against(score):
+            self._passed_results[python] = results
+        logger.info("Benchmark score calculated: %.3f on '%s'", score, python)
+        return score
+
+
+__all__ = [
+    "BenchmarkRunner",
+]
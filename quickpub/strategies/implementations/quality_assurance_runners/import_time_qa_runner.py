@@ -0,0 +1,125 @@
+import logging
+import os
+import statistics
+import sys
+from typing import Dict, List, Optional
+
+from danielutils import LayeredCommand
+
+from .... import import_time_probe
+from ....enforcers import ExitEarlyError
+from ....import_time import get_total_import_seconds, parse_import_times
+from ...quality_assurance_runner import QualityAssuranceRunner
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TIME_PROBE_PATH: str = os.path.abspath(import_time_probe.__file__)
+
+
+class ImportTimeRunner(QualityAssuranceRunner):
+    """Quality assurance runner for import latency.
+
+    Scores the median cumulative time in seconds of 'import <package>' over several fresh interpreters.
+
+    With exclusive, the runner occupies the whole CPU budget so other QA tasks don't skew its measurement.
+    """
+
+    def _install_dependencies(self, base: LayeredCommand) -> None:
+        return None
+
+    def __init__(
+        self,
+        bound: str = "<=1.0",
+        package: Optional[str] = None,
+        runs: int = 5,
+        exclusive: bool = False,
+    ) -> None:
+        if runs < 1:
+            raise ValueError("ImportTimeRunner needs at least one run")
+        QualityAssuranceRunner.__init__(self, name="importtime", bound=bound)
+        self.package = package
+        self.runs = runs
+        self.exclusive = exclusive
+        logger.info(
+            "Initialized ImportTimeRunner with bound='%s', package='%s', runs=%d",
+            bound,
+            package,
+            runs,
+        )
+
+    def get_cpu_weight(self) -> int:
+        if self.exclusive:
+            return os.cpu_count() or 1
+        return 1
+
+    def is_cacheable(self) -> bool:
+        return False
+
+    def _get_package_name(self, target: str) -> str:
+        if self.package is not None:
+            return self.package
+        return os.path.basename(os.path.normpath(target))
+
+    def _format_command(self, python: str, package: str, directory: str) -> str:
+        return (
+            f'{python} "{IMPORT_TIME_PROBE_PATH}" {package} {self.runs} "{directory}"'
+        )
+
+    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
+        python = sys.executable if use_system_interpreter else "python"
+        directory = os.path.dirname(os.path.abspath(os.path.normpath(target)))
+        return self._format_command(python, self._get_package_name(target), directory)
+
+    def _split_runs(self, lines: List[str]) -> List[Dict[str, object]]:
+        runs: List[Dict[str, object]] = []
+        for line in lines:
+            if line.startswith(import_time_probe.RUN_MARKER):
+                _, package, _, code = line.split()
+                runs.append({"package": package, "code": int(code), "lines": []})
+            elif runs:
+                runs[-1]["lines"].append(line)  # type: ignore[attr-defined]
+        return runs
+
+    @staticmethod
+    def _get_run_seconds(package: str, lines: List[str]) -> float:
+        timings = parse_import_times(lines)
+        for timing in timings:
+            if timing.depth == 0 and timing.module == package:
+                return timing.cumulative_seconds
+        return get_total_import_seconds(timings)
+
+    def _calculate_score(
+        self, ret: int, command_output: List[str], *, verbose: bool = False
+    ) -> float:
+        logger.debug("Calculating import time score")
+        runs = self._split_runs(command_output)
+        if ret != 0 or not runs:
+            command = self._format_command(
+                "python", self.package or "PACKAGE", "TARGET_PARENT"
+            )
+            raise ExitEarlyError(
+                f"Failed measuring import time, got exit code {ret}. "
+                f"try running manually using: {command}"
+            )
+        package = str(runs[0]["package"])
+        for run in runs:
+            if run["code"] != 0:
+                run_lines: List[str] = run["lines"]  # type: ignore[assignment]
+                raise ExitEarlyError(
+                    f"Failed importing '{package}': {run_lines[-1] if run_lines else run['code']}"
+                )
+        seconds = [self._get_run_seconds(package, run["lines"]) for run in runs]  # type: ignore[arg-type]
+        score = statistics.median(seconds)
+        logger.info(
+            "Median import time of '%s' over %d runs: %.4fs (all runs: %s)",
+            package,
+            len(seconds),
+            score,
+            ", ".join(f"{s:.4f}" for s in seconds),
+        )
+        return score
+
+
+__all__ = [
+    "ImportTimeRunner",
+]
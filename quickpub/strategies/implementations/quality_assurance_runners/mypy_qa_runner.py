@@ -1,17 +1,29 @@
 import logging
+import os
 import re
-from typing import Optional, List
+import sys
+from typing import Optional, List, cast
 
 from danielutils import LayeredCommand
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
+from ....cache import DEFAULT_CACHE_DIR
 from ....enforcers import ExitEarlyError
+from ....env_capabilities import EnvCapabilities
 from ...quality_assurance_runner import QualityAssuranceRunner
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MYPY_CACHE_DIR: str = os.path.join(DEFAULT_CACHE_DIR, "mypy")
+
 
 class MypyRunner(QualityAssuranceRunner):
-    """Quality assurance runner for mypy type checking. Scores based on the number of type errors found."""
+    """Quality assurance runner for mypy type checking. Scores based on the number of type errors found.
+
+    Each environment and configuration gets its own persistent mypy cache under cache_dir, so repeated publishes check
+    incrementally. With daemon, checks go through a dmypy server per environment and configuration that stays alive for
+    daemon_timeout seconds of inactivity.
+    """
 
     NO_TESTS_PATTERN: re.Pattern = re.compile(
         r"There are no \.py\[i\] files in directory '[\w\.\\\/]+'"
@@ -25,18 +37,61 @@ class MypyRunner(QualityAssuranceRunner):
         with base:
             base("pip install mypy")
 
-    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
-        command: str = self.get_executable(use_system_interpreter)
+    def get_requirements(self) -> List[str]:
+        return [] if self.use_executable else ["mypy"]
+
+    def get_env_dir(self, env_name: str) -> Optional[str]:
+        """Directory holding the mypy cache and dmypy status file of an environment and configuration pair."""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, self._get_env_cache_name(env_name))
+
+    def _build_command(
+        self,
+        target: str,
+        use_system_interpreter: bool = False,
+        *,
+        env_name: Optional[str] = None,
+    ) -> str:
+        env_dir = None if env_name is None else self.get_env_dir(env_name)
+        if self.daemon:
+            python = sys.executable if use_system_interpreter else "python"
+            status_file = os.path.join(
+                env_dir or cast(str, self.cache_dir), "dmypy.json"
+            )
+            command = f'{python} -m mypy.dmypy --status-file "{status_file}" run --timeout {self.daemon_timeout} --'
+        else:
+            command = self.get_executable(use_system_interpreter)
         if self.has_config:
             command += f" --config-file {self.config_path}"
+        if env_dir is not None:
+            command += f' --cache-dir "{env_dir}"'
         command += f" {target}"
         return command
 
+    async def _build_command_for_env(
+        self,
+        target: str,
+        executor: AsyncLayeredCommand,
+        capabilities: EnvCapabilities,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+    ) -> str:
+        env_dir = self.get_env_dir(env_name)
+        if env_dir is not None:
+            os.makedirs(env_dir, exist_ok=True)
+        return self._build_command(target, use_system_interpreter, env_name=env_name)
+
     def __init__(
         self,
         bound: str = "<15",
         configuration_path: Optional[str] = None,
         executable_path: Optional[str] = None,
+        *,
+        cache_dir: Optional[str] = DEFAULT_MYPY_CACHE_DIR,
+        daemon: bool = False,
+        daemon_timeout: int = 3600,
     ) -> None:
         QualityAssuranceRunner.__init__(
             self,
@@ -45,11 +100,20 @@ class MypyRunner(QualityAssuranceRunner):
             configuration_path=configuration_path,
             executable_path=executable_path,
         )
+        if daemon and self.use_executable:
+            raise ValueError("MypyRunner can't use daemon mode with an executable_path")
+        if daemon and cache_dir is None:
+            raise ValueError("MypyRunner needs a cache_dir to use daemon mode")
+        self.cache_dir = cache_dir
+        self.daemon = daemon
+        self.daemon_timeout = daemon_timeout
         logger.info(
-            "Initialized MypyRunner with bound='%s', config='%s', executable='%s'",
+            "Initialized MypyRunner with bound='%s', config='%s', executable='%s', cache_dir='%s', daemon=%s",
             bound,
             configuration_path,
             executable_path,
+            cache_dir,
+            daemon,
         )
 
     def _calculate_score(
@@ -1,23 +1,44 @@
+import json
 import logging
+import os
 import re
-from typing import Optional, List
+import sys
+from typing import Any, Dict, Optional, List
 
 from danielutils import LayeredCommand
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
+from .... import pylint_probe
+from ....cache import DEFAULT_CACHE_DIR
 from ....enforcers import ExitEarlyError
+from ....env_capabilities import EnvCapabilities
 from ...quality_assurance_runner import QualityAssuranceRunner
 
 logger = logging.getLogger(__name__)
 
+PYLINT_PROBE_PATH: str = os.path.abspath(pylint_probe.__file__)
+DEFAULT_PYLINT_CACHE_DIR: str = os.path.join(DEFAULT_CACHE_DIR, "pylint")
+JSON2_MIN_MAJOR_VERSION: int = 3
+
 
 class PylintRunner(QualityAssuranceRunner):
-    """Quality assurance runner for pylint code analysis. Scores based on pylint rating (0.0 to 10.0)."""
+    """Quality assurance runner for pylint code analysis. Scores based on pylint rating (0.0 to 10.0).
+
+    The rating and a per-file breakdown are read from a json2 report. By default the report is cached per environment
+    under cache_dir, keyed on the content of every file, the rcfile and the pylint version, so an unchanged target isn't
+    linted again; the cached run always prints a json2-shaped report, whatever the pylint version. With
+    cache_dir=None pylint itself is asked for --output-format=json2 from pylint 3.0 on, and the text report is parsed
+    for older pylint or an executable_path. Pylint runs with jobs processes.
+    """
 
     def _install_dependencies(self, base: LayeredCommand) -> None:
         logger.info("Installing pylint dependencies")
         with base:
             base("pip install pylint")
 
+    def get_requirements(self) -> List[str]:
+        return [] if self.use_executable else ["pylint"]
+
     RATING_PATTERN: re.Pattern = re.compile(r".*?([\d\.\/]+)")
 
     def __init__(
@@ -25,6 +46,9 @@ class PylintRunner(QualityAssuranceRunner):
         bound: str = ">=0.8",
         configuration_path: Optional[str] = None,
         executable_path: Optional[str] = None,
+        *,
+        jobs: Optional[int] = None,
+        cache_dir: Optional[str] = DEFAULT_PYLINT_CACHE_DIR,
     ) -> None:
         QualityAssuranceRunner.__init__(
             self,
@@ -33,20 +57,128 @@ class PylintRunner(QualityAssuranceRunner):
             configuration_path=configuration_path,
             executable_path=executable_path,
         )
+        if jobs is not None and jobs <= 0:
+            raise RuntimeError("jobs must be a positive integer or None.")
+        self.jobs = jobs
+        self.cache_dir = cache_dir
         logger.info(
-            "Initialized PylintRunner with bound='%s', config='%s', executable='%s'",
+            "Initialized PylintRunner with bound='%s', config='%s', executable='%s', jobs=%s, cache_dir='%s'",
             bound,
             configuration_path,
             executable_path,
+            jobs,
+            cache_dir,
+        )
+
+    def get_cpu_weight(self) -> int:
+        """The jobs pylint may use; claimed even when the cached report means nothing is linted."""
+        return self.jobs or os.cpu_count() or 1
+
+    def get_cache_path(self, env_name: str) -> Optional[str]:
+        """File holding the per-file results of an environment.
+
+        None when results aren't cached.
+        """
+        if self.cache_dir is None or self.use_executable:
+            return None
+        return os.path.join(
+            self.cache_dir, f"{self._get_env_cache_name(env_name)}.json"
         )
 
-    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
-        command: str = self.get_executable()
+    def _build_command(
+        self,
+        target: str,
+        use_system_interpreter: bool = False,
+        *,
+        env_name: Optional[str] = None,
+        json_report: bool = False,
+    ) -> str:
+        cache_path = None if env_name is None else self.get_cache_path(env_name)
+        if cache_path is not None:
+            python = sys.executable if use_system_interpreter else "python"
+            command = f'{python} "{PYLINT_PROBE_PATH}" --cache "{cache_path}"'
+        else:
+            command = self.get_executable()
+            if json_report:
+                command += " --output-format=json2"
+        command += f" --jobs {self.get_cpu_weight()}"
         if self.has_config:
             command += f" --rcfile {self.config_path}"
         command += f" {target}"
         return command
 
+    async def _build_command_for_env(
+        self,
+        target: str,
+        executor: AsyncLayeredCommand,
+        capabilities: EnvCapabilities,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+    ) -> str:
+        json_report = False
+        if self.get_cache_path(env_name) is None and not self.use_executable:
+            python = sys.executable if use_system_interpreter else "python"
+            distributions = await capabilities.get_distributions(
+                executor, env_name, python=python
+            )
+            major = re.match(r"\d+", distributions.get("pylint", ""))
+            json_report = (
+                major is not None and int(major.group()) >= JSON2_MIN_MAJOR_VERSION
+            )
+        return self._build_command(
+            target, use_system_interpreter, env_name=env_name, json_report=json_report
+        )
+
+    @staticmethod
+    def _parse_report(lines: List[str]) -> Optional[Dict[str, Any]]:
+        """The json2 report in pylint's output.
+
+        None if the output is pylint's text report.
+        """
+        for index, line in enumerate(lines):
+            if not line.lstrip().startswith("{"):
+                continue
+            try:
+                report, _ = json.JSONDecoder().raw_decode(
+                    "\n".join(lines[index:]).lstrip()
+                )
+            except ValueError:
+                return None
+            if isinstance(report, dict) and "statistics" in report:
+                return report
+            return None
+        return None
+
+    @staticmethod
+    def get_file_breakdown(report: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        """Number of messages of every type in each file of a json2 report."""
+        breakdown: Dict[str, Dict[str, int]] = {}
+        for message in report.get("messages", []):
+            counts = breakdown.setdefault(message.get("path", ""), {})
+            counts[message["type"]] = counts.get(message["type"], 0) + 1
+        return breakdown
+
+    def _score_report(self, report: Dict[str, Any]) -> float:
+        for path, counts in sorted(self.get_file_breakdown(report).items()):
+            logger.info(
+                "Pylint messages in '%s': %s",
+                path,
+                ", ".join(f"{kind}={count}" for kind, count in sorted(counts.items())),
+            )
+        statistics = report["statistics"]
+        rating = statistics.get("score")
+        if rating is None:
+            logger.debug("No statements were linted, returning perfect score: 1.0")
+            return 1
+        score = float(rating) / 10
+        logger.debug(
+            "Pylint score calculated: %.3f from %s",
+            score,
+            statistics.get("messageTypeCount"),
+        )
+        return score
+
     def _calculate_score(
         self, ret: int, lines: List[str], verbose: bool = False
     ) -> float:
@@ -57,6 +189,9 @@ class PylintRunner(QualityAssuranceRunner):
         if len(lines) == 0:
             logger.debug("No pylint output, returning perfect score: 1.0")
             return 1
+        report = self._parse_report(lines)
+        if report is not None:
+            return self._score_report(report)
         if len(lines) == 1:
             if lines[0].endswith("No module named pylint"):
                 logger.error("Pylint module not found")
@@ -1,27 +1,39 @@
+import json
 import logging
-import re
-import subprocess
+import os
 import sys
-from typing import List, Union, Literal
+from typing import Dict, List, Literal, Optional, Union
 
 from danielutils import LayeredCommand
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
+from .... import pytest_probe
 from ....enforcers import ExitEarlyError
+from ....env_capabilities import EnvCapabilities
+from ....qa_history import PerTestDurationHistory
+from ....test_impact import TestImpactAnalysis
 from ....structures import Bound
 from ...quality_assurance_runner import QualityAssuranceRunner
 
 logger = logging.getLogger(__name__)
 
+PYTEST_PROBE_PATH: str = os.path.abspath(pytest_probe.__file__)
+PYTEST_NO_TESTS_COLLECTED: int = 5
+PYTEST_ERROR_EXIT_CODES: Dict[int, str] = {
+    2: "test execution was interrupted",
+    3: "internal error",
+    4: "usage error",
+}
+
 
 class PytestRunner(QualityAssuranceRunner):
-    """Quality assurance runner for pytest testing. Scores based on the ratio of passed tests to total tests."""
+    """Quality assurance runner for pytest testing. Scores based on the ratio of passed tests to total tests.
 
-    PYTEST_SUMMARY_REGEX: re.Pattern = re.compile(
-        r"=+ .*?in [\d\.]+s(?: \([^)]+\))? =+"
-    )
-    PYTEST_FAILED_REGEX: re.Pattern = re.compile(r"(\d+) failed")
-    PYTEST_PASSED_REGEX: re.Pattern = re.compile(r"(\d+) passed")
-    PYTEST_SKIPPED_REGEX: re.Pattern = re.compile(r"(\d+) skipped")
+    Outcomes are read from pytest's JUnit XML report; only the last output_tail lines of pytest's output are kept. Only
+    pytest's "no tests collected" exit code scores no_tests_score, while an interrupted run, an internal or usage error
+    or a run that produced no report fails. With test_impact, only the tests affected by the changes since the last
+    green run are run, without pytest-xdist.
+    """
 
     def __init__(
         self,
@@ -31,6 +43,9 @@ class PytestRunner(QualityAssuranceRunner):
         no_output_score: float = 0.0,
         no_tests_score: float = 1.0,
         xdist_workers: Union[int, Literal["auto"]] = "auto",
+        output_tail: int = 200,
+        test_durations: Optional[PerTestDurationHistory] = None,
+        test_impact: Optional[TestImpactAnalysis] = None,
     ) -> None:
         super().__init__(name="pytest", bound=bound, target=target)
         if not (0.0 <= no_tests_score <= 1.0):
@@ -49,6 +64,11 @@ class PytestRunner(QualityAssuranceRunner):
         if isinstance(xdist_workers, str) and xdist_workers != "auto":
             raise RuntimeError("xdist_workers must be a positive integer or 'auto'.")
         self.xdist_workers = xdist_workers
+        if output_tail <= 0:
+            raise RuntimeError("output_tail must be a positive integer.")
+        self.output_tail = output_tail
+        self.test_durations = test_durations
+        self.test_impact = test_impact
 
         logger.info(
             "Initialized PytestRunner with bound='%s', target='%s', no_tests_score=%s, no_output_score=%s",
@@ -58,90 +78,79 @@ class PytestRunner(QualityAssuranceRunner):
             no_output_score,
         )
 
-    @staticmethod
-    def _is_xdist_installed() -> bool:
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "show", "pytest-xdist"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=False,
-            )
-            installed = result.returncode == 0
-            logger.debug(
-                "pytest-xdist availability check returned code %d (installed=%s)",
-                result.returncode,
-                installed,
-            )
-            return installed
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.debug("pytest-xdist availability check failed: %s", exc)
-            return False
+    def get_cpu_weight(self) -> int:
+        if self.test_impact is not None:
+            return 1
+        if self.xdist_workers == "auto":
+            return os.cpu_count() or 1
+        return self.xdist_workers
 
-    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
-        base_command = f"{sys.executable} -m pytest"
+    def _build_command(
+        self,
+        target: str,
+        use_system_interpreter: bool = False,
+        *,
+        use_xdist: bool = False,
+        env_name: Optional[str] = None,
+    ) -> str:
+        python = sys.executable if use_system_interpreter else "python"
+        base_command = f'{python} "{PYTEST_PROBE_PATH}" {self.output_tail}'
+        if self.test_impact is not None and env_name is not None:
+            impact_arguments = self.test_impact.get_probe_arguments(
+                f"{self.name}-{self._get_env_cache_name(env_name)}",
+                str(self.target),
+                "pytest",
+                [self.config_path] if self.config_path is not None else [],
+            )
+            base_command += f" --impact {impact_arguments} --"
         if self.has_config:
             base_command += f" -c {self.config_path}"
-        if self._is_xdist_installed():
-            logger.debug("pytest-xdist detected; enabling distributed execution")
+        if use_xdist:
             return f"{base_command} -n {self.xdist_workers} {self.target}"
-        logger.debug("pytest-xdist not detected; running without distribution")
         return f"{base_command} {self.target}"
 
+    async def _build_command_for_env(
+        self,
+        target: str,
+        executor: AsyncLayeredCommand,
+        capabilities: EnvCapabilities,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+    ) -> str:
+        if self.test_impact is not None:
+            logger.debug(
+                "Test impact analysis enabled on env '%s'; not using pytest-xdist",
+                env_name,
+            )
+            return self._build_command(
+                target, use_system_interpreter, env_name=env_name
+            )
+        use_xdist = await capabilities.has(
+            executor,
+            env_name,
+            "pytest-xdist",
+            python=sys.executable if use_system_interpreter else "python",
+        )
+        logger.debug(
+            "pytest-xdist %s on env '%s'",
+            "detected; enabling distributed execution" if use_xdist else "not detected",
+            env_name,
+        )
+        return self._build_command(target, use_system_interpreter, use_xdist=use_xdist)
+
     def _install_dependencies(self, base: LayeredCommand) -> None:
         logger.info("Installing pytest dependencies")
         with base:
             base(f"{sys.executable} -m pip install pytest")
 
-    def _calculate_score(
-        self, ret: int, command_output: List[str], *, verbose: bool = False
-    ) -> float:
-        logger.info("Calculating pytest score from test results")
-
-        if len(command_output) == 0:
-            logger.info(
-                "No pytest output, returning no_output_score: %s", self.no_output_score
-            )
-            return self.no_output_score
-
-        # Find the actual summary line by looking for the regex pattern
-        # (pytest output may have warnings or other lines after the summary)
-        rating_line = None
-        for line in reversed(command_output):
-            if "no tests ran" in line.lower():
-                logger.info(
-                    "No tests ran, returning no_tests_score: %s", self.no_tests_score
-                )
-                return self.no_tests_score
-            if self.PYTEST_SUMMARY_REGEX.match(line):
-                rating_line = line
-                break
-
-        if rating_line is None:
-            # Fallback to last line if no match found
-            rating_line = command_output[-1]
-            if "no tests ran" in rating_line.lower():
-                logger.info(
-                    "No tests ran, returning no_tests_score: %s", self.no_tests_score
-                )
-                return self.no_tests_score
-
-        if not self.PYTEST_SUMMARY_REGEX.match(rating_line):
-            logger.error("Failed to parse pytest output: %s", rating_line)
-            raise ExitEarlyError(
-                f"Can't calculate score for pytest on the following line: {rating_line}"
-            )
-
-        failed_match = self.PYTEST_FAILED_REGEX.search(rating_line)
-        passed_match = self.PYTEST_PASSED_REGEX.search(rating_line)
-        skipped_match = self.PYTEST_SKIPPED_REGEX.search(rating_line)
-        failed = int(failed_match.group(1)) if failed_match else 0
-        passed = int(passed_match.group(1)) if passed_match else 0
-        skipped = int(skipped_match.group(1)) if skipped_match else 0
-        assert failed >= 0
-        assert passed >= 0
-        assert skipped >= 0
+    def get_requirements(self) -> List[str]:
+        return ["pytest"]
 
+    def _score_report(self, counts: Dict[str, int]) -> float:
+        passed = counts.get("passed", 0)
+        failed = counts.get("failed", 0) + counts.get("errors", 0)
+        skipped = counts.get("skipped", 0)
         total_tests = passed + failed + skipped
         if total_tests == 0:
             logger.info(
@@ -149,7 +158,6 @@ class PytestRunner(QualityAssuranceRunner):
                 self.no_tests_score,
             )
             return self.no_tests_score
-
         score = passed / total_tests
         logger.info(
             "Pytest score calculated: %.3f (passed: %d, failed: %d, skipped: %d)",
@@ -159,3 +167,55 @@ class PytestRunner(QualityAssuranceRunner):
             skipped,
         )
         return score
+
+    def _calculate_score(
+        self, ret: int, command_output: List[str], *, verbose: bool = False
+    ) -> float:
+        logger.info("Calculating pytest score from test results")
+
+        if ret in PYTEST_ERROR_EXIT_CODES:
+            raise ExitEarlyError(
+                f"pytest failed with exit code {ret} ({PYTEST_ERROR_EXIT_CODES[ret]}): "
+                f"{command_output[-1].strip() if command_output else 'no output'}"
+            )
+        if ret == PYTEST_NO_TESTS_COLLECTED:
+            logger.info(
+                "pytest collected no tests, returning no_tests_score: %s",
+                self.no_tests_score,
+            )
+            return self.no_tests_score
+
+        if len(command_output) == 0:
+            logger.info(
+                "No pytest output, returning no_output_score: %s", self.no_output_score
+            )
+            return self.no_output_score
+
+        impact = TestImpactAnalysis.read_report(command_output)
+        if impact is not None and impact["mode"] == "skipped":
+            logger.info("No tests affected since the last green run, returning 1.0")
+            return 1.0
+
+        stripped = [line.strip() for line in command_output]
+        if pytest_probe.RESULT_MARKER not in stripped:
+            logger.error("No pytest report in output: %s", command_output[-1])
+            raise ExitEarlyError(
+                f"pytest exited with code {ret} and printed no pytest report, "
+                f"try running manually using: {self._build_command('TARGET')}"
+            )
+        start = len(stripped) - stripped[::-1].index(pytest_probe.RESULT_MARKER)
+        try:
+            report = json.loads(stripped[start])
+        except (IndexError, ValueError) as e:
+            raise ExitEarlyError(
+                f"Can't parse pytest report: {command_output[start:]}"
+            ) from e
+        counts = report["counts"]
+        if counts is None or not any(counts.values()):
+            raise ExitEarlyError(
+                f"pytest exited with code {ret} without reporting any test results, "
+                f"try running manually using: {self._build_command('TARGET')}"
+            )
+        if self.test_durations is not None:
+            self.test_durations.record(report["durations"])
+        return self._score_report(counts)
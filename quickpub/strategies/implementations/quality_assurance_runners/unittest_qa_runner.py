@@ -1,15 +1,24 @@
+import json
 import logging
 import os
 import re
+import sys
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Literal, Union
 from danielutils import LayeredCommand
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
 from ....enforcers import ExitEarlyError
+from .... import unittest_probe
+from ....env_capabilities import EnvCapabilities
+from ....qa_history import PerTestDurationHistory
+from ....test_impact import IMPACT_PROBE_PATH, TestImpactAnalysis
 from ...quality_assurance_runner import QualityAssuranceRunner
 
 logger = logging.getLogger(__name__)
 
+UNITTEST_PROBE_PATH: str = os.path.abspath(unittest_probe.__file__)
+
 
 def _removesuffix(string: str, suffix: str) -> str:
     if suffix and string.endswith(suffix):
@@ -18,7 +27,12 @@ def _removesuffix(string: str, suffix: str) -> str:
 
 
 class UnittestRunner(QualityAssuranceRunner):
-    """Quality assurance runner for unittest testing. Scores based on the ratio of passed tests to total tests."""
+    """Quality assurance runner for unittest testing. Scores based on the ratio of passed tests to total tests.
+
+    With shards other than 1, test case classes are split into shards balanced by the durations in test_durations
+    and run in parallel processes. With test_impact, only the tests affected by the changes since the last green run
+    are run, in a single process.
+    """
 
     NUM_TESTS_PATTERN: re.Pattern = re.compile(r"Ran (\d+) tests? in \d+\.\d+s")
     NUM_FAILED_PATTERN: re.Pattern = re.compile(
@@ -42,11 +56,22 @@ class UnittestRunner(QualityAssuranceRunner):
         target: Optional[str] = "./tests",
         bound: str = ">=0.8",
         no_tests_score: float = 0,
+        *,
+        shards: Union[int, Literal["auto"]] = 1,
+        test_durations: Optional[PerTestDurationHistory] = None,
+        test_impact: Optional[TestImpactAnalysis] = None,
     ) -> None:
         QualityAssuranceRunner.__init__(
             self, name="unittest", bound=bound, target=target
         )
         self.no_tests_score = no_tests_score
+        if isinstance(shards, int) and shards <= 0:
+            raise RuntimeError("shards must be a positive integer or 'auto'.")
+        if isinstance(shards, str) and shards != "auto":
+            raise RuntimeError("shards must be a positive integer or 'auto'.")
+        self.shards = shards
+        self.test_durations = test_durations
+        self.test_impact = test_impact
         logger.info(
             "Initialized UnittestRunner with target='%s', bound='%s', no_tests_score=%s",
             target,
@@ -54,9 +79,27 @@ class UnittestRunner(QualityAssuranceRunner):
             no_tests_score,
         )
 
+    def get_shard_count(self) -> int:
+        if self.test_impact is not None:
+            return 1
+        if self.shards == "auto":
+            return os.cpu_count() or 1
+        return self.shards
+
+    def get_cpu_weight(self) -> int:
+        return self.get_shard_count()
+
     def _build_command(
         self, src: str, *args: Any, use_system_interpreter: bool = False
     ) -> str:
+        python = sys.executable if use_system_interpreter else "python"
+        if self.get_shard_count() > 1:
+            probe_command = f'{python} "{UNITTEST_PROBE_PATH}" --shards {self.get_shard_count()}'
+            if self.test_durations is not None:
+                probe_command += (
+                    f' --durations "{os.path.abspath(self.test_durations.path)}"'
+                )
+            return f"{probe_command} {self.target or './tests'}"
         command: str = self.get_executable()
         target = self.target or "./tests"
         rel = _removesuffix(os.path.relpath(src, target), src.lstrip("./\\"))
@@ -65,11 +108,44 @@ class UnittestRunner(QualityAssuranceRunner):
         # This is for concurrency reasons
         return f"cd {normalized_target_path} & {command} & cd {Path(os.getcwd()).resolve()}"
 
+    async def _build_command_for_env(
+        self,
+        target: str,
+        executor: AsyncLayeredCommand,
+        capabilities: EnvCapabilities,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+    ) -> str:
+        if self.test_impact is None:
+            return self._build_command(
+                target, use_system_interpreter=use_system_interpreter
+            )
+        tests = self.target or "./tests"
+        impact_arguments = self.test_impact.get_probe_arguments(
+            f"{self.name}-{self._get_env_cache_name(env_name)}", tests, "unittest", []
+        )
+        python = sys.executable if use_system_interpreter else "python"
+        return f'{python} "{IMPACT_PROBE_PATH}" {impact_arguments} -- unittest discover -s {tests}'
+
     def _calculate_score(
         self, ret: int, lines: List[str], *, verbose: bool = False
     ) -> float:
         logger.info("Calculating unittest score from test results")
 
+        impact = TestImpactAnalysis.read_report(lines)
+        if impact is not None and impact["mode"] == "skipped":
+            logger.info("No tests affected since the last green run, returning 1.0")
+            return 1.0
+
+        stripped = [line.strip() for line in lines]
+        if unittest_probe.RESULT_MARKER in stripped and self.test_durations is not None:
+            start = stripped.index(unittest_probe.RESULT_MARKER) + 1
+            try:
+                self.test_durations.record(json.loads(stripped[start])["durations"])
+            except (IndexError, ValueError, KeyError) as e:
+                logger.warning("Can't read unittest durations: %s", e)
+
         try:
             num_tests_ran_line = lines[-3]
             num_tests_failed_line = lines[-1]
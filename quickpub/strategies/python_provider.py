@@ -1,6 +1,6 @@
 import logging
 from abc import abstractmethod
-from typing import Tuple, Set, List, AsyncIterator
+from typing import Tuple, Set, List, AsyncIterator, Optional
 
 from .quickpub_strategy import QuickpubStrategy
 from danielutils.async_.async_layered_command import AsyncLayeredCommand
@@ -56,5 +56,23 @@ class PythonProvider(AsyncIterator, QuickpubStrategy):
     @abstractmethod
     def get_python_executable_name(self) -> str: ...
 
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        """Path of the interpreter behind env_name, or None if it can't be known without running a command."""
+        return None
+
+    def add_requirements(self, requirements: List[str]) -> None:
+        """Requirements, such as the package's dependencies and the QA tools, to install in every environment.
+
+        Providers that don't build their environments ignore them.
+        """
+
+    def get_exit_on_fail(self, env_name: str) -> bool:
+        """Whether a failed dependency validation or QA error on env_name aborts QA."""
+        return self.exit_on_fail
+
+    def is_system_interpreter(self, env_name: str) -> bool:
+        """Whether env_name runs on the interpreter running quickpub, so its commands have to use sys.executable."""
+        return False
+
 
 __all__ = ["PythonProvider"]
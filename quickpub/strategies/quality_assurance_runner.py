@@ -1,12 +1,20 @@
 import logging
+import os
+import re
 import sys
 import time
 from abc import abstractmethod
-from typing import Union, List, Optional, cast, Dict, Tuple
+from dataclasses import dataclass
+from typing import Union, List, Optional, cast, Dict, Tuple, TYPE_CHECKING
 from danielutils import LayeredCommand, file_exists
 from danielutils.async_.async_layered_command import AsyncLayeredCommand
 
-from quickpub import Bound
+from quickpub import Bound, Version
+from ..cache import hash_text
+from ..env_capabilities import EnvCapabilities
+
+if TYPE_CHECKING:
+    from ..qa_cache import QAResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +73,15 @@ SPEICLA_EXIT_CODES: Dict[int, Tuple[str, str]] = {
 }
 
 
+@dataclass
+class QARunResult:
+    """Score and captured output of a single QualityAssuranceRunner.run call."""
+
+    score: float
+    output: List[str]
+    cached: bool = False
+
+
 class QualityAssuranceRunner(Configurable, HasOptionalExecutable):
     def __init__(
         self,
@@ -93,9 +110,52 @@ class QualityAssuranceRunner(Configurable, HasOptionalExecutable):
         self, target: str, use_system_interpreter: bool = False
     ) -> str: ...
 
+    async def _build_command_for_env(
+        self,
+        target: str,
+        executor: AsyncLayeredCommand,
+        capabilities: EnvCapabilities,
+        *,
+        env_name: str,
+        use_system_interpreter: bool = False,
+    ) -> str:
+        """Build the command for a specific environment.
+
+        Override to adapt the command to what the environment has installed.
+        """
+        return self._build_command(target, use_system_interpreter)
+
     @abstractmethod
     def _install_dependencies(self, base: LayeredCommand) -> None: ...
 
+    def get_requirements(self) -> List[str]:
+        """Requirements of the tool this runner runs, installed by providers that build their environments."""
+        return []
+
+    def get_cpu_weight(self) -> int:
+        """Number of CPU cores a single run of this runner is expected to occupy."""
+        return 1
+
+    def _get_env_cache_name(self, env_name: str) -> str:
+        """File name safe key of an environment and configuration pair, for runners that keep state per environment."""
+        config = os.path.abspath(cast(str, self.config_path)) if self.has_config else ""
+        return re.sub(r"[^\w.-]", "_", env_name) + "-" + hash_text(config)[:8]
+
+    def is_cacheable(self) -> bool:
+        """Whether a score may be reused from a QAResultCache when the runner's inputs are unchanged."""
+        return True
+
+    def on_published(self, name: str, version: Version) -> None:
+        """Called once publish() uploaded version of name, for runners that keep state across releases."""
+
+    def _get_cache_inputs(self, target: str) -> List[str]:
+        inputs = [target]
+        if self.target is not None:
+            inputs.append(self.target)
+        if self.config_path is not None:
+            inputs.append(self.config_path)
+        return inputs
+
     def _pre_command(self) -> None: ...
 
     def _post_command(self) -> None: ...
@@ -146,7 +206,9 @@ class QualityAssuranceRunner(Configurable, HasOptionalExecutable):
         verbose: bool = True,  # type: ignore
         use_system_interpreter: bool = False,
         env_name: str,
-    ) -> None:
+        cache: Optional["QAResultCache"] = None,
+        capabilities: Optional[EnvCapabilities] = None,
+    ) -> QARunResult:
         logger.debug(
             "Running %s on environment '%s' with target '%s'",
             self.__class__.__name__,
@@ -154,17 +216,51 @@ class QualityAssuranceRunner(Configurable, HasOptionalExecutable):
             target,
         )
 
-        command = self._build_command(target, use_system_interpreter)
+        if capabilities is None:
+            capabilities = EnvCapabilities()
+        command = await self._build_command_for_env(
+            target,
+            executor,
+            capabilities,
+            env_name=env_name,
+            use_system_interpreter=use_system_interpreter,
+        )
         logger.debug("Built command: %s", command)
 
+        cache_key: Optional[str] = None
+        if cache is not None and self.is_cacheable():
+            cache_key = await cache.build_key(
+                self,
+                target,
+                command,
+                executor,
+                env_name=env_name,
+                use_system_interpreter=use_system_interpreter,
+                capabilities=capabilities,
+            )
+            cached_score = None if cache_key is None else cache.get_score(cache_key)
+            if cached_score is not None:
+                logger.info(
+                    "QA runner '%s' reused cached score %s on env '%s'",
+                    self.__class__.__name__,
+                    cached_score,
+                    env_name,
+                )
+                self._validate_score_against_bound(cached_score, env_name, verbose)
+                return QARunResult(cached_score, [], cached=True)
+
         self._pre_command()
         start_time = time.perf_counter()
         try:
             ret, out, err = await executor(command, command_raise_on_fail=False)
             self._handle_special_exit_codes(ret, command)
 
-            score = self._calculate_score(ret, out + err, verbose=verbose)
+            output = out + err
+            score = self._calculate_score(ret, output, verbose=verbose)
             self._validate_score_against_bound(score, env_name, verbose)
+            if cache is not None and cache_key is not None:
+                cache.store_score(cache_key, score)
+            return QARunResult(score, output)
         except Exception as e:
             logger.error(
                 "QA runner '%s' failed on env '%s': %s",
@@ -191,4 +287,4 @@ class QualityAssuranceRunner(Configurable, HasOptionalExecutable):
     ) -> float: ...
 
 
-__all__ = ["QualityAssuranceRunner"]
+__all__ = ["QualityAssuranceRunner", "QARunResult"]
@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from . import impact_probe
+from .cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+IMPACT_PROBE_PATH: str = os.path.abspath(impact_probe.__file__)
+
+
+class TestImpactAnalysis:
+    """Opt-in selection of only the tests affected by the files changed since the last green run.
+
+    Test runs are measured under coverage with per-test contexts into an index of the files each test file exercises,
+    kept per environment. The whole test target runs and the index is rebuilt whenever it is missing or stale, such as
+    after the runner's configuration or the environment's installed distributions change.
+    """
+
+    __test__ = False
+    DIRECTORY_NAME: str = "test_impact"
+
+    def __init__(self, source: str, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.source = source
+        self.cache_dir = cache_dir
+        logger.debug(
+            "Initialized TestImpactAnalysis of '%s' at '%s'", source, cache_dir
+        )
+
+    def get_index_path(self, name: str) -> str:
+        return os.path.abspath(
+            os.path.join(self.cache_dir, self.DIRECTORY_NAME, f"{name}.json")
+        )
+
+    def get_probe_arguments(
+        self, name: str, tests: str, framework: str, inputs: List[str]
+    ) -> str:
+        arguments = (
+            f'--index "{self.get_index_path(name)}" --source "{self.source}" '
+            f'--tests "{tests}" --framework {framework}'
+        )
+        for path in inputs:
+            arguments += f' --input "{path}"'
+        return arguments
+
+    @staticmethod
+    def read_report(lines: List[str]) -> Optional[Dict[str, Any]]:
+        """The selection reported by the impact probe in a runner's output, if it ran."""
+        stripped = [line.strip() for line in lines]
+        if impact_probe.RESULT_MARKER not in stripped:
+            return None
+        start = stripped.index(impact_probe.RESULT_MARKER) + 1
+        try:
+            report = json.loads(stripped[start])
+        except (IndexError, ValueError):
+            logger.warning("Can't parse test impact report: %s", lines[start:])
+            return None
+        ran = {
+            "full": "the whole test target",
+            "skipped": "no tests",
+        }.get(report["mode"], f"{len(report['tests'])} affected test files")
+        logger.info("Test impact analysis ran %s: %s", ran, report["reason"])
+        return report
+
+
+__all__ = ["TestImpactAnalysis"]
@@ -0,0 +1,206 @@
+"""Runs a unittest target in parallel shards in an environment's own interpreter.
+
+Run as 'python unittest_probe.py --shards <n> [--durations <path>] <start directory>'. Discovers the tests under the
+start directory like 'python -m unittest discover -s <start directory>', splits their test case classes into shards
+balanced by the per-test durations recorded in the durations JSON file, and runs every shard in a parallel subprocess.
+The shards' output is echoed followed by an aggregated unittest summary, and the measured per-test durations are
+printed as a single JSON line after a RESULT_MARKER line.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple, cast
+
+RESULT_MARKER: str = "quickpub-unittest-results"
+COUNTS: List[str] = [
+    "run",
+    "failures",
+    "errors",
+    "skipped",
+    "expected failures",
+    "unexpected successes",
+]
+
+
+class _TimedResult(unittest.TextTestResult):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.test_durations: Dict[str, float] = {}
+        self._started = 0.0
+
+    def startTest(self, test: unittest.TestCase) -> None:
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test: unittest.TestCase) -> None:
+        super().stopTest(test)
+        self.test_durations[test.id()] = time.perf_counter() - self._started
+
+
+def iterate_tests(suite: unittest.TestSuite) -> Iterator[unittest.TestCase]:
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iterate_tests(test)
+        else:
+            yield test
+
+
+def split_into_shards(
+    test_cases: Dict[str, List[str]], durations: Dict[str, float], shards: int
+) -> List[List[str]]:
+    """Split test case classes into at most shards lists of test ids.
+
+    The longest expected class is assigned to the least loaded shard first.
+    """
+    known = [
+        durations[test]
+        for tests in test_cases.values()
+        for test in tests
+        if test in durations
+    ]
+    default = sum(known) / len(known) if known else 1.0
+    costs = sorted(
+        (
+            (sum(durations.get(test, default) for test in tests), name)
+            for name, tests in test_cases.items()
+        ),
+        reverse=True,
+    )
+    loads: List[Tuple[float, int]] = [(0.0, i) for i in range(min(shards, len(costs)))]
+    result: List[List[str]] = [[] for _ in loads]
+    for cost, name in costs:
+        load, i = heapq.heappop(loads)
+        result[i].extend(test_cases[name])
+        heapq.heappush(loads, (load + cost, i))
+    return result
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    try:
+        with open(path, "r", encoding="utf8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def run_suite(suite: unittest.TestSuite) -> _TimedResult:
+    runner = unittest.TextTestRunner(stream=sys.stderr, resultclass=_TimedResult)
+    return cast(_TimedResult, runner.run(suite))
+
+
+def get_counts(result: _TimedResult) -> Dict[str, Any]:
+    return {
+        "run": result.testsRun,
+        "failures": len(result.failures),
+        "errors": len(result.errors),
+        "skipped": len(result.skipped),
+        "expected failures": len(result.expectedFailures),
+        "unexpected successes": len(result.unexpectedSuccesses),
+        "durations": result.test_durations,
+    }
+
+
+def run_shard(ids_path: str, start: str) -> int:
+    """Run the tests of a shard in this process and print their counts as a single JSON line."""
+    sys.path.insert(0, start)
+    with open(ids_path, "r", encoding="utf8") as f:
+        ids = json.load(f)
+    result = run_suite(unittest.defaultTestLoader.loadTestsFromNames(ids))
+    print(json.dumps(get_counts(result)), flush=True)
+    return 0 if result.wasSuccessful() else 1
+
+
+def spawn_shard(ids: List[str], start: str) -> Tuple[Dict[str, Any], str]:
+    descriptor, ids_path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(descriptor, "w", encoding="utf8") as f:
+        json.dump(ids, f)
+    try:
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run", ids_path, start],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=False,
+        )
+    finally:
+        os.remove(ids_path)
+    try:
+        counts = json.loads(process.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        counts = {"run": len(ids), "errors": len(ids), "durations": {}}
+        return counts, process.stderr + process.stdout
+    return counts, process.stderr
+
+
+def format_summary(counts: Dict[str, Any], elapsed: float) -> str:
+    run = counts["run"]
+    infos = ", ".join(
+        f"{name}={counts[name]}" for name in COUNTS[1:] if counts.get(name)
+    )
+    failed = counts.get("failures") or counts.get("errors")
+    status = ("FAILED" if failed else "OK") + (f" ({infos})" if infos else "")
+    return f"{'-' * 70}\nRan {run} test{'' if run == 1 else 's'} in {elapsed:.3f}s\n\n{status}"
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--durations", default=None)
+    parser.add_argument("--run", default=None)
+    parser.add_argument("start")
+    options = parser.parse_args(arguments)
+    start = os.path.abspath(options.start)
+    if options.run is not None:
+        return run_shard(options.run, start)
+
+    started = time.perf_counter()
+    suite = unittest.defaultTestLoader.discover(start, top_level_dir=start)
+    test_cases: Dict[str, List[str]] = {}
+    local = unittest.TestSuite()
+    for test in iterate_tests(suite):
+        if type(test).__module__ == "unittest.loader":
+            local.addTest(test)
+            continue
+        name = f"{type(test).__module__}.{type(test).__qualname__}"
+        test_cases.setdefault(name, []).append(test.id())
+    durations = {} if options.durations is None else load_durations(options.durations)
+    shards = split_into_shards(test_cases, durations, max(1, options.shards))
+
+    totals: Dict[str, Any] = {name: 0 for name in COUNTS}
+    totals["durations"] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(shards))) as pool:
+        outcomes = list(pool.map(lambda ids: spawn_shard(ids, start), shards))
+    for i, (counts, output) in enumerate(outcomes):
+        print(
+            f"Shard {i + 1} of {len(shards)} ({len(shards[i])} tests):", file=sys.stderr
+        )
+        print(output, file=sys.stderr, end="")
+        for name in COUNTS:
+            totals[name] += counts.get(name, 0)
+        totals["durations"].update(counts.get("durations", {}))
+    if local.countTestCases():
+        counts = get_counts(run_suite(local))
+        for name in COUNTS:
+            totals[name] += counts[name]
+
+    print(RESULT_MARKER)
+    print(json.dumps({"durations": totals["durations"]}), flush=True)
+    print(format_summary(totals, time.perf_counter() - started), file=sys.stderr)
+    return 1 if totals["failures"] or totals["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+__all__ = ["main"]
@@ -1,16 +1,250 @@
+import asyncio
+import itertools
 import logging
-from typing import Any
+import math
+import os
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
 from danielutils import AsyncWorkerPool
 
 logger = logging.getLogger(__name__)
 
 
+def get_default_cpu_budget() -> int:
+    return os.cpu_count() or 1
+
+
+class CpuBudget:
+    """Weighted FIFO semaphore over CPU cores. A task acquires as many cores as its weight, capped at the total."""
+
+    def __init__(self, total: int) -> None:
+        if total <= 0:
+            raise ValueError("CPU budget must be a positive integer")
+        self.total = total
+        self._available = total
+        self._waiters: Deque[Tuple[int, "asyncio.Future[None]"]] = deque()
+
+    @property
+    def available(self) -> int:
+        return self._available
+
+    async def acquire(self, weight: int) -> int:
+        weight = max(1, min(weight, self.total))
+        if not self._waiters and self._available >= weight:
+            self._available -= weight
+            return weight
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append((weight, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                self._available += weight
+            elif (weight, waiter) in self._waiters:
+                self._waiters.remove((weight, waiter))
+            self._wake_waiters()
+            raise
+        return weight
+
+    async def release(self, weight: int) -> None:
+        self._available += weight
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters:
+            weight, waiter = self._waiters[0]
+            if not waiter.done() and weight > self._available:
+                break
+            self._waiters.popleft()
+            if not waiter.done():
+                self._available -= weight
+                waiter.set_result(None)
+
+
+_QueuedTask = Tuple[
+    Callable[..., Coroutine[None, None, None]],
+    Iterable[Any],
+    Mapping[Any, Any],
+    Optional[str],
+    int,
+]
+_QueueItem = Tuple[float, int, Optional[_QueuedTask]]
+
+
 class WorkerPool(AsyncWorkerPool):
+    """AsyncWorkerPool that starts tasks by priority once their CPU weight fits and can cancel its remaining work."""
+
+    def __init__(
+        self,
+        pool_name: str,
+        num_workers: Optional[int] = None,
+        show_pbar: bool = False,
+        *,
+        fail_fast: bool = False,
+        cpu_budget: Optional[int] = None,
+    ) -> None:
+        cpu_budget = cpu_budget or get_default_cpu_budget()
+        super().__init__(pool_name, num_workers or cpu_budget, show_pbar)
+        self.fail_fast = fail_fast
+        self.cpu_budget = CpuBudget(cpu_budget)
+        self._cancelled = False
+        self._in_flight: Set["asyncio.Future[None]"] = set()
+        self._queue: "asyncio.PriorityQueue[_QueueItem]" = asyncio.PriorityQueue()  # type: ignore[assignment]
+        self._sequence: Iterator[int] = itertools.count()
+
     @staticmethod
     def log(level: int, message: str, *args: Any, **kwargs: Any) -> None:
         logger.log(level, message, *args, **kwargs)
 
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    async def submit(  # type: ignore[override]
+        self,
+        func: Callable[..., Coroutine[None, None, None]],
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[Mapping[Any, Any]] = None,
+        name: Optional[str] = None,
+        weight: int = 1,
+        priority: float = 0,
+    ) -> None:
+        self.log(
+            logging.DEBUG,
+            "Adding new job '%s' with weight %d and priority %s",
+            name,
+            weight,
+            priority,
+        )
+        await self._queue.put(
+            (
+                -priority,
+                next(self._sequence),
+                (func, args or (), kwargs or {}, name, weight),
+            )
+        )
+
+    def _shutdown_signal(self) -> _QueueItem:
+        return math.inf, next(self._sequence), None
+
+    async def join(self) -> None:
+        self.log(
+            logging.INFO, "Starting join process for worker pool '%s'", self._pool_name
+        )
+        await self._queue.join()
+        for _ in range(self._num_workers):
+            await self._queue.put(self._shutdown_signal())
+        await asyncio.gather(*self._workers)
+        self.log(
+            logging.INFO, "Join process completed for worker pool '%s'", self._pool_name
+        )
+
+    async def worker(self, worker_id: int) -> None:
+        self.log(logging.DEBUG, "Worker %d starting", worker_id)
+        while True:
+            _, _, task = await self._queue.get()
+            if task is None:
+                self.log(logging.DEBUG, "Worker %d received shutdown signal", worker_id)
+                break
+            func, args, kwargs, name, weight = task
+            try:
+                if not self._cancelled:
+                    await self._run_weighted_task(
+                        worker_id, func, args, kwargs, name, weight
+                    )
+            finally:
+                self._queue.task_done()
+
+    async def _run_weighted_task(
+        self,
+        worker_id: int,
+        func: Callable[..., Coroutine[None, None, None]],
+        args: Iterable[Any],
+        kwargs: Mapping[Any, Any],
+        name: Optional[str],
+        weight: int,
+    ) -> None:
+        acquired = await self.cpu_budget.acquire(weight)
+        try:
+            if not self._cancelled:
+                await self._run_task(worker_id, func, args, kwargs, name)
+        finally:
+            await self.cpu_budget.release(acquired)
+
+    async def _run_task(
+        self,
+        worker_id: int,
+        func: Callable[..., Coroutine[None, None, None]],
+        args: Iterable[Any],
+        kwargs: Mapping[Any, Any],
+        name: Optional[str],
+    ) -> None:
+        self.log(logging.INFO, "Task '%s' started on worker %d", name, worker_id)
+        running = asyncio.ensure_future(func(*args, **kwargs))
+        self._in_flight.add(running)
+        try:
+            await running
+            self.log(logging.INFO, "Task '%s' finished on worker %d", name, worker_id)
+        except asyncio.CancelledError:
+            if not self._cancelled:
+                raise
+            self.log(logging.WARNING, "Task '%s' was cancelled", name)
+        except Exception as e:
+            self.log(
+                logging.ERROR,
+                "Task '%s' failed on worker %d: %s: %s",
+                name,
+                worker_id,
+                type(e).__name__,
+                e,
+            )
+            if self.fail_fast:
+                self.cancel(f"task '{name}' failed")
+        finally:
+            self._in_flight.discard(running)
+            if self._pbar:
+                self._pbar.update(1)
+
+    def cancel(self, reason: str) -> None:
+        if self._cancelled:
+            return
+        self._cancelled = True
+        self.log(
+            logging.WARNING,
+            "Cancelling remaining tasks of pool '%s' because %s",
+            self._pool_name,
+            reason,
+        )
+        num_shutdown_signals = 0
+        while not self._queue.empty():
+            _, _, task = self._queue.get_nowait()
+            if task is None:
+                num_shutdown_signals += 1
+            self._queue.task_done()
+        for _ in range(num_shutdown_signals):
+            self._queue.put_nowait(self._shutdown_signal())
+        for running in list(self._in_flight):
+            running.cancel()
+
 
 __all__ = [
     "WorkerPool",
+    "CpuBudget",
+    "get_default_cpu_budget",
 ]
@@ -1,7 +1,7 @@
 import os
 import unittest
 
-from quickpub import CondaPythonProvider, ExitEarlyError
+from quickpub import CondaEnvListCache, CondaPythonProvider, ExitEarlyError
 from quickpub.qa import qa
 
 from tests.base_test_classes import AsyncBaseTestClass
@@ -36,6 +36,11 @@ class TestCondaPythonProvider(AsyncBaseTestClass):
 
     async def test_non_existing_env_should_skip(self) -> None:
         NON_EXISTENT_ENV_NAME: str = "sdjbnglksjdgnwkerjg"
-        with self.assertRaises(ExitEarlyError):
-            async for x in CondaPythonProvider([NON_EXISTENT_ENV_NAME]):
-                pass
+        with temporary_test_directory(change_cwd=False) as tmp_dir:
+            provider = CondaPythonProvider(
+                [NON_EXISTENT_ENV_NAME],
+                env_list_cache=CondaEnvListCache(str(tmp_dir / "cache")),
+            )
+            with self.assertRaises(ExitEarlyError):
+                async for x in provider:
+                    pass
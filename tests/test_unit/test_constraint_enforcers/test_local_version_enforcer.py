@@ -1,6 +1,6 @@
 from quickpub import LocalVersionEnforcer, Version
 
-from tests.base_test_classes import BaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
 
 PACKAGE_NAME: str = "foo"
@@ -35,3 +35,15 @@ class TestLocalVersionEnforcer(BaseTestClass):
                 LocalVersionEnforcer().enforce(
                     name=PACKAGE_NAME, version=LOWEST_VERSION
                 )
+
+
+class TestLocalVersionEnforcerAsync(AsyncBaseTestClass):
+    async def test_enforce_async_raises_enforce_errors(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            dist_dir = tmp_dir / "dist"
+            dist_dir.mkdir()
+            (dist_dir / f"{PACKAGE_NAME}-{LOWEST_VERSION}.tar.gz").touch()
+            with self.assertRaises(LocalVersionEnforcer.EXCEPTION_TYPE):
+                await LocalVersionEnforcer().enforce_async(
+                    name=PACKAGE_NAME, version=LOWEST_VERSION
+                )
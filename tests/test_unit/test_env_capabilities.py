@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock
+
+from quickpub import EnvCapabilities
+from quickpub.executors import CancellableAsyncLayeredCommand
+
+from tests.base_test_classes import AsyncBaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+
+def _make_executor(
+    site_packages: str, location: str = "/envs/env|/envs/env/bin/python"
+) -> AsyncMock:
+    output = json.dumps(
+        {
+            "location": location,
+            "distributions": {"pytest-xdist": "3.5.0", "mypy": "1.8.0"},
+            "site_packages": [site_packages],
+        }
+    )
+    return AsyncMock(return_value=(0, ["", output], []))
+
+
+class TestEnvCapabilities(AsyncBaseTestClass):
+    async def test_detected_once_per_env(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            executor = _make_executor(str(tmp_dir))
+            capabilities = EnvCapabilities()
+            self.assertTrue(await capabilities.has(executor, "env", "pytest_xdist"))
+            self.assertTrue(await capabilities.has(executor, "env", "MyPy"))
+            self.assertFalse(await capabilities.has(executor, "env", "pylint"))
+            executor.assert_called_once()
+            await capabilities.has(executor, "other", "mypy")
+            self.assertEqual(2, executor.call_count)
+
+    async def test_reused_across_runs_until_site_packages_change(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            site_packages = tmp_dir / "site-packages"
+            site_packages.mkdir()
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            await EnvCapabilities(cache_dir).get_distributions(
+                _make_executor(str(site_packages)), "env"
+            )
+
+            executor = _make_executor(str(site_packages))
+            self.assertTrue(
+                await EnvCapabilities(cache_dir).has(executor, "env", "mypy")
+            )
+            executor.assert_called_once()
+            self.assertTrue(executor.call_args.args[0].endswith("--locate"))
+
+            os.utime(site_packages, (0, 0))
+            executor = _make_executor(str(site_packages))
+            await EnvCapabilities(cache_dir).get_distributions(executor, "env")
+            self.assertEqual(2, executor.call_count)
+
+    async def test_env_rebuilt_at_another_location_is_detected_again(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            site_packages = tmp_dir / "site-packages"
+            site_packages.mkdir()
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            await EnvCapabilities(cache_dir).get_distributions(
+                _make_executor(str(site_packages)), "env"
+            )
+
+            executor = _make_executor(
+                str(site_packages), location="/pool/1|/pool/1/bin/python"
+            )
+            capabilities = EnvCapabilities(cache_dir)
+            await capabilities.get_distributions(executor, "env")
+            self.assertEqual(2, executor.call_count)
+            self.assertEqual(
+                "/pool/1|/pool/1/bin/python",
+                await capabilities.get_location(executor, "env"),
+            )
+
+    async def test_failed_probe_reports_nothing_installed(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            capabilities = EnvCapabilities(str(tmp_dir))
+            executor = AsyncMock(return_value=(1, [], ["python: not found"]))
+            self.assertEqual({}, await capabilities.get_distributions(executor, "env"))
+            self.assertFalse(
+                os.path.exists(os.path.join(str(tmp_dir), EnvCapabilities.FILE_NAME))
+            )
+
+    async def test_real_interpreter(self) -> None:
+        capabilities = EnvCapabilities()
+        with CancellableAsyncLayeredCommand() as executor:
+            distributions = await capabilities.get_distributions(
+                executor, "system", python=sys.executable
+            )
+            location = await capabilities.get_location(
+                executor, "system", python=sys.executable
+            )
+        self.assertIn("pytest", distributions)
+        self.assertIn(os.path.realpath(sys.prefix), location or "")
+
+
+if __name__ == "__main__":
+    unittest.main()
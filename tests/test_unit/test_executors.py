@@ -0,0 +1,136 @@
+import asyncio
+import sys
+import time
+import unittest
+
+from quickpub.executors import (
+    CancellableAsyncLayeredCommand,
+    PersistentShellCommand,
+    ShellSession,
+    ShellSessionPool,
+)
+
+from tests.base_test_classes import AsyncBaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+MARKER_FILE_NAME: str = "marker.txt"
+SET_VARIABLE_COMMAND: str = (
+    "set QUICKPUB_TEST=activated"
+    if sys.platform == "win32"
+    else "export QUICKPUB_TEST=activated"
+)
+PRINT_VARIABLE_COMMAND: str = (
+    f"{sys.executable} -c \"import os; print(os.environ.get('QUICKPUB_TEST'))\""
+)
+
+
+class TestCancellableAsyncLayeredCommand(AsyncBaseTestClass):
+    async def test_captures_output_and_exit_code(self) -> None:
+        with CancellableAsyncLayeredCommand() as executor:
+            code, out, err = await executor(
+                f"{sys.executable} -c \"import sys; print('hello'); sys.exit(3)\""
+            )
+        self.assertEqual(code, 3)
+        self.assertEqual(out, ["hello"])
+        self.assertEqual(err, [])
+
+    async def test_cancellation_kills_subprocess(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            marker = tmp_dir / MARKER_FILE_NAME
+            script = f"import time; time.sleep(1); open(r'{marker}', 'w').close()"
+            with CancellableAsyncLayeredCommand() as executor:
+                task = asyncio.ensure_future(
+                    executor(f'{sys.executable} -c "{script}"')
+                )
+                await asyncio.sleep(0.3)
+                start = time.perf_counter()
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                self.assertLess(time.perf_counter() - start, 0.5)
+            await asyncio.sleep(1.2)
+            self.assertFalse(marker.exists())
+
+
+class TestShellSession(AsyncBaseTestClass):
+    async def test_demarcates_output_and_exit_codes(self) -> None:
+        session = ShellSession()
+        await session.start()
+        try:
+            code, out, err = await session.run(
+                f"{sys.executable} -c \"import sys; print('a'); print(''); sys.stderr.write('b'); sys.exit(2)\""
+            )
+            self.assertEqual((code, out, err), (2, ["a", ""], ["b"]))
+            code, out, err = await session.run(
+                f"{sys.executable} -c \"import sys; sys.stdout.write('no newline')\""
+            )
+            self.assertEqual((code, out, err), (0, ["no newline"], []))
+        finally:
+            await session.close()
+
+    async def test_setup_command_runs_once_and_persists(self) -> None:
+        session = ShellSession(SET_VARIABLE_COMMAND)
+        await session.start()
+        try:
+            for _ in range(2):
+                code, out, _ = await session.run(PRINT_VARIABLE_COMMAND)
+                self.assertEqual((code, out), (0, ["activated"]))
+        finally:
+            await session.close()
+
+    async def test_failing_setup_command_raises(self) -> None:
+        session = ShellSession(f'{sys.executable} -c "raise SystemExit(1)"')
+        with self.assertRaises(RuntimeError):
+            await session.start()
+        self.assertFalse(session.alive)
+
+
+class TestShellSessionPool(AsyncBaseTestClass):
+    async def test_sequential_commands_reuse_one_session(self) -> None:
+        pool = ShellSessionPool()
+        try:
+            await pool.run(f'{sys.executable} -c "pass"')
+            await pool.run(f'{sys.executable} -c "pass"')
+            self.assertEqual(len(pool._sessions), 1)
+        finally:
+            await pool.close()
+
+    async def test_concurrent_commands_use_separate_sessions(self) -> None:
+        pool = ShellSessionPool()
+        command = f'{sys.executable} -c "import time; time.sleep(0.3)"'
+        try:
+            await asyncio.gather(pool.run(command), pool.run(command))
+            self.assertEqual(len(pool._sessions), 2)
+        finally:
+            await pool.close()
+
+    async def test_cancelled_command_discards_its_session(self) -> None:
+        pool = ShellSessionPool()
+        try:
+            task = asyncio.ensure_future(
+                pool.run(f'{sys.executable} -c "import time; time.sleep(5)"')
+            )
+            await asyncio.sleep(0.3)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(len(pool._sessions), 0)
+            code, _, _ = await pool.run(f'{sys.executable} -c "pass"')
+            self.assertEqual(code, 0)
+        finally:
+            await pool.close()
+
+
+class TestPersistentShellCommand(AsyncBaseTestClass):
+    async def test_prefix_applies_to_every_command(self) -> None:
+        with PersistentShellCommand(SET_VARIABLE_COMMAND) as executor:
+            try:
+                for _ in range(2):
+                    code, out, _ = await executor(PRINT_VARIABLE_COMMAND)
+                    self.assertEqual((code, out), (0, ["activated"]))
+            finally:
+                await executor.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from quickpub.import_time import (
+    format_slowest_imports,
+    get_total_import_seconds,
+    parse_import_times,
+)
+
+from tests.base_test_classes import BaseTestClass
+
+IMPORTTIME_OUTPUT = [
+    "import time: self [us] | cumulative | imported package",
+    "import time:       120 |        120 |   _io",
+    "MARKER",
+    "import time:       300 |        300 |     mypkg.utils",
+    "import time:      1000 |       1500 |   mypkg.core",
+    "import time:       500 |       2000 | mypkg",
+    "import time:       250 |        250 | other",
+    "some unrelated stderr line",
+]
+
+
+class TestParseImportTimes(BaseTestClass):
+    def test_parses_lines_after_marker(self) -> None:
+        timings = parse_import_times(IMPORTTIME_OUTPUT, "MARKER")
+        self.assertListEqual(
+            ["mypkg.utils", "mypkg.core", "mypkg", "other"],
+            [timing.module for timing in timings],
+        )
+        self.assertListEqual([2, 1, 0, 0], [timing.depth for timing in timings])
+        self.assertAlmostEqual(0.0015, timings[1].cumulative_seconds)
+        self.assertAlmostEqual(0.001, timings[1].self_seconds)
+
+    def test_without_marker_parses_everything(self) -> None:
+        self.assertEqual(5, len(parse_import_times(IMPORTTIME_OUTPUT)))
+        self.assertEqual(5, len(parse_import_times(IMPORTTIME_OUTPUT, "missing")))
+
+    def test_total_counts_top_level_imports_only(self) -> None:
+        timings = parse_import_times(IMPORTTIME_OUTPUT, "MARKER")
+        self.assertAlmostEqual(0.00225, get_total_import_seconds(timings))
+
+    def test_format_slowest_imports(self) -> None:
+        timings = parse_import_times(IMPORTTIME_OUTPUT, "MARKER")
+        lines = format_slowest_imports(timings, limit=2)
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].endswith("mypkg"))
+        self.assertTrue(lines[1].endswith("mypkg.core"))
+
+
+if __name__ == "__main__":
+    unittest.main()
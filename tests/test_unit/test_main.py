@@ -1,5 +1,7 @@
 import asyncio
+import os
 import tarfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -18,12 +20,16 @@ from quickpub.__main__ import (
     _run_constraint_enforcers,
     _run_quality_assurance,
     _create_package_files,
-    _build_and_upload_packages,
+    _stage_package,
+    _build_packages,
+    _discard_built_distributions,
+    _release_distributions,
+    _upload_packages,
     publish,
     main,
 )
 
-from tests.base_test_classes import BaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
 
 
@@ -129,57 +135,57 @@ class TestValidatePublishInputs(BaseTestClass):
         self.assertEqual(result[0], version)
 
 
-class TestRunConstraintEnforcers(BaseTestClass):
-    def test_with_enforcers(self) -> None:
-        enforcer1 = MagicMock()
-        enforcer2 = MagicMock()
+class TestRunConstraintEnforcers(AsyncBaseTestClass):
+    async def test_with_enforcers(self) -> None:
+        enforcer1 = MagicMock(enforce_async=AsyncMock())
+        enforcer2 = MagicMock(enforce_async=AsyncMock())
         enforcers = [enforcer1, enforcer2]
 
-        _run_constraint_enforcers(
+        await _run_constraint_enforcers(
             enforcers=enforcers,  # type: ignore[arg-type]
             name="testpackage",
             version=Version(1, 0, 0),
             demo=False,
         )
 
-        enforcer1.enforce.assert_called_once_with(
+        enforcer1.enforce_async.assert_awaited_once_with(
             name="testpackage", version=Version(1, 0, 0), demo=False
         )
-        enforcer2.enforce.assert_called_once_with(
+        enforcer2.enforce_async.assert_awaited_once_with(
             name="testpackage", version=Version(1, 0, 0), demo=False
         )
 
-    def test_without_enforcers(self) -> None:
-        _run_constraint_enforcers(
+    async def test_without_enforcers(self) -> None:
+        await _run_constraint_enforcers(
             enforcers=None, name="testpackage", version=Version(1, 0, 0), demo=False
         )
 
-    def test_with_empty_enforcers_list(self) -> None:
-        _run_constraint_enforcers(
+    async def test_with_empty_enforcers_list(self) -> None:
+        await _run_constraint_enforcers(
             enforcers=[], name="testpackage", version=Version(1, 0, 0), demo=True
         )
 
-    def test_demo_mode(self) -> None:
-        enforcer = MagicMock()
-        _run_constraint_enforcers(
+    async def test_demo_mode(self) -> None:
+        enforcer = MagicMock(enforce_async=AsyncMock())
+        await _run_constraint_enforcers(
             enforcers=[enforcer],
             name="testpackage",
             version=Version(1, 0, 0),
             demo=True,
         )
-        enforcer.enforce.assert_called_once_with(
+        enforcer.enforce_async.assert_awaited_once_with(
             name="testpackage", version=Version(1, 0, 0), demo=True
         )
 
 
-class TestRunQualityAssurance(BaseTestClass):
+class TestRunQualityAssurance(AsyncBaseTestClass):
     @patch("quickpub.__main__.qa", new_callable=AsyncMock)
-    def test_qa_success(self, mock_qa) -> None:
+    async def test_qa_success(self, mock_qa) -> None:
         mock_qa.return_value = True
         mock_provider = MagicMock()
         mock_pbar = MagicMock()
 
-        _run_quality_assurance(
+        await _run_quality_assurance(
             python_interpreter_provider=mock_provider,
             global_quality_assurance_runners=[],
             name="testpackage",
@@ -192,13 +198,13 @@ class TestRunQualityAssurance(BaseTestClass):
 
     @patch("quickpub.__main__.error")
     @patch("quickpub.__main__.qa", new_callable=AsyncMock)
-    def test_qa_failure(self, mock_qa, mock_error) -> None:
+    async def test_qa_failure(self, mock_qa, mock_error) -> None:
         mock_qa.return_value = False
         mock_provider = MagicMock()
         mock_pbar = MagicMock()
 
         with self.assertRaises(ExitEarlyError):
-            _run_quality_assurance(
+            await _run_quality_assurance(
                 python_interpreter_provider=mock_provider,
                 global_quality_assurance_runners=[],
                 name="testpackage",
@@ -211,13 +217,13 @@ class TestRunQualityAssurance(BaseTestClass):
         mock_error.assert_called_once()
 
     @patch("quickpub.__main__.qa", new_callable=AsyncMock)
-    def test_qa_exit_early_error_propagated(self, mock_qa) -> None:
+    async def test_qa_exit_early_error_propagated(self, mock_qa) -> None:
         mock_qa.side_effect = ExitEarlyError("QA failed")
         mock_provider = MagicMock()
         mock_pbar = MagicMock()
 
         with self.assertRaises(ExitEarlyError):
-            _run_quality_assurance(
+            await _run_quality_assurance(
                 python_interpreter_provider=mock_provider,
                 global_quality_assurance_runners=[],
                 name="testpackage",
@@ -229,13 +235,13 @@ class TestRunQualityAssurance(BaseTestClass):
         mock_qa.assert_called_once()
 
     @patch("quickpub.__main__.qa", new_callable=AsyncMock)
-    def test_qa_other_exception_wrapped(self, mock_qa) -> None:
+    async def test_qa_other_exception_wrapped(self, mock_qa) -> None:
         mock_qa.side_effect = ValueError("Unexpected error")
         mock_provider = MagicMock()
         mock_pbar = MagicMock()
 
         with self.assertRaises(RuntimeError) as context:
-            _run_quality_assurance(
+            await _run_quality_assurance(
                 python_interpreter_provider=mock_provider,
                 global_quality_assurance_runners=[],
                 name="testpackage",
@@ -278,7 +284,7 @@ class TestCreatePackageFiles(BaseTestClass):
 
         mock_create_setup.assert_called_once()
         mock_create_toml.assert_called_once()
-        mock_create_manifest.assert_called_once_with(name="testpackage")
+        mock_create_manifest.assert_called_once_with(name="testpackage", directory=".")
         mock_add_version_to_init.assert_called_once()
 
     @patch("quickpub.__main__.add_version_to_init")
@@ -318,61 +324,100 @@ class TestCreatePackageFiles(BaseTestClass):
         self.assertEqual(call_args.kwargs["scripts"], scripts)
 
 
-class TestBuildAndUploadPackages(BaseTestClass):
-    def test_demo_mode_skips_build_and_upload(self) -> None:
+class TestBuildPackages(BaseTestClass):
+    def test_demo_mode_skips_build(self) -> None:
         build_schema = MagicMock()
-        upload_target = MagicMock()
 
-        _build_and_upload_packages(
-            build_schemas=[build_schema],
-            upload_targets=[upload_target],
-            name="testpackage",
-            version=Version(1, 0, 0),
-            demo=True,
-        )
+        _build_packages(build_schemas=[build_schema], demo=True)
 
         build_schema.build.assert_not_called()
-        upload_target.upload.assert_not_called()
 
-    def test_normal_mode_builds_and_uploads(self) -> None:
-        build_schema = MagicMock()
+    def test_multiple_schemas(self) -> None:
+        build_schema1 = MagicMock()
+        build_schema2 = MagicMock()
+
+        _build_packages(build_schemas=[build_schema1, build_schema2], demo=False)
+
+        build_schema1.build.assert_called_once()
+        build_schema2.build.assert_called_once()
+
+
+class TestUploadPackages(BaseTestClass):
+    def test_demo_mode_skips_upload(self) -> None:
         upload_target = MagicMock()
 
-        _build_and_upload_packages(
-            build_schemas=[build_schema],
+        _upload_packages(
             upload_targets=[upload_target],
             name="testpackage",
             version=Version(1, 0, 0),
-            demo=False,
+            demo=True,
         )
 
-        build_schema.build.assert_called_once()
-        upload_target.upload.assert_called_once_with(
-            name="testpackage", version=Version(1, 0, 0)
-        )
+        upload_target.upload.assert_not_called()
 
-    def test_multiple_schemas_and_targets(self) -> None:
-        build_schema1 = MagicMock()
-        build_schema2 = MagicMock()
+    def test_normal_mode_uploads(self) -> None:
         upload_target1 = MagicMock()
         upload_target2 = MagicMock()
 
-        _build_and_upload_packages(
-            build_schemas=[build_schema1, build_schema2],
+        _upload_packages(
             upload_targets=[upload_target1, upload_target2],
             name="testpackage",
             version=Version(1, 0, 0),
             demo=False,
         )
 
-        build_schema1.build.assert_called_once()
-        build_schema2.build.assert_called_once()
-        upload_target1.upload.assert_called_once()
+        upload_target1.upload.assert_called_once_with(
+            name="testpackage", version=Version(1, 0, 0)
+        )
         upload_target2.upload.assert_called_once()
 
 
+class TestStagedDistributions(BaseTestClass):
+    def test_discard_removes_staged_distributions(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "staging" / "dist").mkdir(parents=True)
+            (tmp_dir / "staging" / "dist" / "testpackage-1.0.0.tar.gz").touch()
+
+            _discard_built_distributions(str(tmp_dir / "staging"))
+
+            self.assertFalse((tmp_dir / "staging" / "dist").exists())
+            self.assertFalse((tmp_dir / "dist").exists())
+
+    def test_release_moves_staged_distributions_into_dist(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "staging" / "dist").mkdir(parents=True)
+            (tmp_dir / "staging" / "dist" / "testpackage-1.0.0.tar.gz").touch()
+            (tmp_dir / "dist").mkdir()
+            (tmp_dir / "dist" / "testpackage-0.9.0.tar.gz").touch()
+
+            _release_distributions(str(tmp_dir / "staging"), demo=False)
+
+            self.assertEqual(
+                ["testpackage-0.9.0.tar.gz", "testpackage-1.0.0.tar.gz"],
+                sorted(p.name for p in (tmp_dir / "dist").iterdir()),
+            )
+            self.assertEqual([], list((tmp_dir / "staging" / "dist").iterdir()))
+
+    def test_release_in_demo_mode_keeps_dist_untouched(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "staging" / "dist").mkdir(parents=True)
+            (tmp_dir / "staging" / "dist" / "testpackage-1.0.0.tar.gz").touch()
+
+            _release_distributions(str(tmp_dir / "staging"), demo=True)
+
+            self.assertFalse((tmp_dir / "dist").exists())
+
+    def test_missing_distributions_are_ignored(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            _discard_built_distributions(str(tmp_dir / "staging"))
+            _release_distributions(str(tmp_dir / "staging"), demo=False)
+            self.assertFalse((tmp_dir / "dist").exists())
+
+
 class TestPublish(BaseTestClass):
-    @patch("quickpub.__main__._build_and_upload_packages")
+    @patch("quickpub.__main__._upload_packages")
+    @patch("quickpub.__main__._build_packages")
+    @patch("quickpub.__main__._stage_package")
     @patch("quickpub.__main__._create_package_files")
     @patch("quickpub.__main__._run_quality_assurance")
     @patch("quickpub.__main__._run_constraint_enforcers")
@@ -385,7 +430,9 @@ class TestPublish(BaseTestClass):
         mock_enforcers,
         mock_qa,
         mock_create_files,
-        mock_build_upload,
+        mock_stage,
+        mock_build,
+        mock_upload,
     ) -> None:
         mock_validate.return_value = (
             Version(1, 0, 0),
@@ -397,6 +444,7 @@ class TestPublish(BaseTestClass):
 
         build_schema = MagicMock()
         upload_target = MagicMock()
+        runner = MagicMock()
 
         publish(
             name="testpackage",
@@ -406,15 +454,22 @@ class TestPublish(BaseTestClass):
             homepage="https://example.com",
             build_schemas=[build_schema],
             upload_targets=[upload_target],
+            global_quality_assurance_runners=[runner],
         )
 
         mock_validate.assert_called_once()
         mock_enforcers.assert_called_once()
         mock_qa.assert_called_once()
         mock_create_files.assert_called_once()
-        mock_build_upload.assert_called_once()
-
-    @patch("quickpub.__main__._build_and_upload_packages")
+        mock_stage.assert_called_once()
+        mock_build.assert_called_once()
+        self.assertEqual(mock_stage.call_args.args[0], mock_build.call_args.args[2])
+        mock_upload.assert_called_once()
+        runner.on_published.assert_called_once_with("testpackage", Version(1, 0, 0))
+
+    @patch("quickpub.__main__._upload_packages")
+    @patch("quickpub.__main__._build_packages")
+    @patch("quickpub.__main__._stage_package")
     @patch("quickpub.__main__._create_package_files")
     @patch("quickpub.__main__._run_quality_assurance")
     @patch("quickpub.__main__._run_constraint_enforcers")
@@ -427,7 +482,9 @@ class TestPublish(BaseTestClass):
         mock_enforcers,
         mock_qa,
         mock_create_files,
-        mock_build_upload,
+        mock_stage,
+        mock_build,
+        mock_upload,
     ) -> None:
         mock_validate.return_value = (
             Version(1, 0, 0),
@@ -451,7 +508,9 @@ class TestPublish(BaseTestClass):
         elapsed_logged = any("Publish finished" in str(call) for call in info_calls)
         self.assertTrue(elapsed_logged)
 
-    @patch("quickpub.__main__._build_and_upload_packages")
+    @patch("quickpub.__main__._upload_packages")
+    @patch("quickpub.__main__._build_packages")
+    @patch("quickpub.__main__._stage_package")
     @patch("quickpub.__main__._create_package_files")
     @patch("quickpub.__main__._run_quality_assurance")
     @patch("quickpub.__main__._run_constraint_enforcers")
@@ -462,7 +521,9 @@ class TestPublish(BaseTestClass):
         mock_enforcers,
         mock_qa,
         mock_create_files,
-        mock_build_upload,
+        mock_stage,
+        mock_build,
+        mock_upload,
     ) -> None:
         mock_validate.return_value = (
             Version(1, 0, 0),
@@ -483,8 +544,71 @@ class TestPublish(BaseTestClass):
             demo=True,
         )
 
-        call_args = mock_build_upload.call_args
-        self.assertEqual(call_args.args[4], True)
+        self.assertEqual(mock_build.call_args.args[1], True)
+        self.assertEqual(mock_upload.call_args.args[3], True)
+
+
+class TestPublishPipeline(BaseTestClass):
+    @patch("quickpub.__main__._release_distributions")
+    @patch("quickpub.__main__._discard_built_distributions")
+    @patch("quickpub.__main__._upload_packages")
+    @patch("quickpub.__main__._build_packages")
+    @patch("quickpub.__main__._stage_package")
+    @patch("quickpub.__main__._create_package_files")
+    @patch("quickpub.__main__._run_quality_assurance")
+    @patch("quickpub.__main__._run_constraint_enforcers")
+    @patch("quickpub.__main__._validate_publish_inputs")
+    def test_build_overlaps_qa_and_is_discarded_when_qa_fails(
+        self,
+        mock_validate,
+        mock_enforcers,
+        mock_qa,
+        mock_create_files,
+        mock_stage,
+        mock_build,
+        mock_upload,
+        mock_discard,
+        mock_release,
+    ) -> None:
+        mock_validate.return_value = (
+            Version(1, 0, 0),
+            "./testpackage",
+            Version(3, 8, 0),
+            [],
+            [],
+        )
+        built = threading.Event()
+        mock_build.side_effect = lambda *args: built.set()
+
+        async def failing_qa(*args, **kwargs) -> None:
+            while not built.is_set():
+                await asyncio.sleep(0.01)
+            raise ExitEarlyError("QA step Failed")
+
+        mock_qa.side_effect = failing_qa
+        runner = MagicMock()
+
+        with self.assertRaises(ExitEarlyError):
+            publish(
+                name="testpackage",
+                author="Test Author",
+                author_email="test@example.com",
+                description="Test description",
+                homepage="https://example.com",
+                build_schemas=[MagicMock()],
+                upload_targets=[MagicMock()],
+                global_quality_assurance_runners=[runner],
+            )
+
+        staging_directory = mock_stage.call_args.args[0]
+        mock_build.assert_called_once()
+        self.assertEqual(staging_directory, mock_build.call_args.args[2])
+        mock_discard.assert_called_once_with(staging_directory)
+        self.assertFalse(os.path.exists(staging_directory))
+        mock_create_files.assert_not_called()
+        mock_release.assert_not_called()
+        mock_upload.assert_not_called()
+        runner.on_published.assert_not_called()
 
 
 class TestMain(BaseTestClass):
@@ -563,6 +687,53 @@ class TestBuiltDistributionHasVersion(BaseTestClass):
                         f"Could not find {init_path_in_archive} in built distribution"
                     )
 
+    def test_staged_build_leaves_project_untouched(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            package_dir = tmp_dir / "testpackage"
+            package_dir.mkdir()
+            (package_dir / "__init__.py").write_text("VALUE = 1\n", encoding="utf8")
+            (tmp_dir / "README.md").write_text("# Test Package\n", encoding="utf8")
+            (tmp_dir / "LICENSE").write_text("MIT License\n", encoding="utf8")
+            staging_dir = tmp_dir / "staging"
+            staging_dir.mkdir()
+
+            _stage_package(
+                str(staging_dir),
+                "testpackage",
+                "./testpackage",
+                "./README.md",
+                "./LICENSE",
+                Version(1, 2, 3),
+                "Test Author",
+                "test@example.com",
+                "Test description",
+                "https://example.com",
+                [],
+                [],
+                Version(3, 8, 0),
+                None,
+            )
+            _build_packages(
+                [SetuptoolsBuildSchema()], demo=False, directory=str(staging_dir)
+            )
+
+            self.assertEqual(
+                "VALUE = 1\n", (package_dir / "__init__.py").read_text(encoding="utf8")
+            )
+            self.assertEqual(
+                ["LICENSE", "README.md", "staging", "testpackage"],
+                sorted(p.name for p in tmp_dir.iterdir()),
+            )
+            tar_path = staging_dir / "dist" / "testpackage-1.2.3.tar.gz"
+            with tarfile.open(tar_path, "r:gz") as tar:
+                init_file_obj = tar.extractfile(
+                    "testpackage-1.2.3/testpackage/__init__.py"
+                )
+                assert init_file_obj is not None
+                self.assertIn(
+                    '__version__ = "1.2.3"', init_file_obj.read().decode("utf8")
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import unittest
+from typing import List
+
+from quickpub import ExitEarlyError
+from quickpub.pipeline import Pipeline, run_in_thread
+
+from tests.base_test_classes import AsyncBaseTestClass
+
+
+class TestPipeline(AsyncBaseTestClass):
+    async def test_dependent_stage_waits_for_dependencies(self) -> None:
+        order: List[str] = []
+
+        async def stage(name: str, delay: float) -> None:
+            await asyncio.sleep(delay)
+            order.append(name)
+
+        pipeline = Pipeline()
+        pipeline.add_stage("slow", lambda: stage("slow", 0.1))
+        pipeline.add_stage("fast", lambda: stage("fast", 0))
+        pipeline.add_stage(
+            "last", lambda: stage("last", 0), depends_on=["slow", "fast"]
+        )
+        await pipeline.run()
+
+        self.assertEqual(order, ["fast", "slow", "last"])
+
+    async def test_independent_stages_overlap(self) -> None:
+        started = asyncio.Event()
+
+        async def waits_for_other() -> None:
+            await asyncio.wait_for(started.wait(), 1)
+
+        async def signals() -> None:
+            started.set()
+
+        pipeline = Pipeline()
+        pipeline.add_stage("waits", waits_for_other)
+        pipeline.add_stage("signals", signals)
+        await pipeline.run()
+
+    async def test_failure_cancels_running_and_skips_dependents(self) -> None:
+        cancelled = asyncio.Event()
+        dependent_ran = False
+
+        async def slow() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def fail() -> None:
+            raise ExitEarlyError("failed")
+
+        async def dependent() -> None:
+            nonlocal dependent_ran
+            dependent_ran = True
+
+        pipeline = Pipeline()
+        pipeline.add_stage("slow", slow)
+        pipeline.add_stage("fail", fail)
+        pipeline.add_stage("dependent", dependent, depends_on=["fail"])
+        with self.assertRaises(ExitEarlyError):
+            await pipeline.run()
+
+        self.assertTrue(cancelled.is_set())
+        self.assertFalse(dependent_ran)
+        self.assertNotIn("dependent", pipeline.started)
+
+    async def test_rollback_only_for_unconsumed_stages(self) -> None:
+        rolled_back: List[str] = []
+
+        async def noop() -> None:
+            return None
+
+        async def fail() -> None:
+            await asyncio.sleep(0.05)
+            raise ExitEarlyError("failed")
+
+        pipeline = Pipeline()
+        pipeline.add_stage(
+            "consumed", noop, rollback=lambda: rolled_back.append("consumed")
+        )
+        pipeline.add_stage("consumer", noop, depends_on=["consumed"])
+        pipeline.add_stage(
+            "unconsumed", noop, rollback=lambda: rolled_back.append("unconsumed")
+        )
+        pipeline.add_stage("gate", fail)
+        pipeline.add_stage("final", noop, depends_on=["unconsumed", "gate"])
+        with self.assertRaises(ExitEarlyError):
+            await pipeline.run()
+
+        self.assertEqual(rolled_back, ["unconsumed"])
+
+    async def test_unknown_dependency_is_rejected(self) -> None:
+        async def noop() -> None:
+            return None
+
+        pipeline = Pipeline()
+        with self.assertRaises(ValueError):
+            pipeline.add_stage("stage", noop, depends_on=["missing"])
+
+    async def test_cancelled_thread_finishes_before_raising(self) -> None:
+        release = threading.Event()
+        finished = threading.Event()
+
+        def blocking() -> None:
+            release.wait(1)
+            finished.set()
+
+        task = asyncio.ensure_future(run_in_thread(blocking))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        release.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(finished.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+from quickpub import CondaEnvListCache
+
+from tests.base_test_classes import AsyncBaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+PREFIXES: Dict[str, str] = {"base": "/opt/conda", "py39": "/opt/conda/envs/py39"}
+METADATA_PATHS_TARGET: str = (
+    "quickpub.strategies.implementations.python_providers.conda_env_list_cache"
+    ".get_conda_metadata_paths"
+)
+
+
+class _Fetcher:
+    def __init__(self, result: Optional[Dict[str, str]] = None) -> None:
+        self.result = PREFIXES if result is None else result
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self) -> Optional[Dict[str, str]]:
+        self.calls += 1
+        return None if self.fail else dict(self.result)
+
+
+class TestCondaEnvListCache(AsyncBaseTestClass):
+    def setUp(self) -> None:
+        super().setUp()
+        CondaEnvListCache.clear_memory()
+
+    def tearDown(self) -> None:
+        CondaEnvListCache.clear_memory()
+        super().tearDown()
+
+    def _metadata_paths(self, tmp_dir) -> List[str]:
+        environments_txt = tmp_dir / "environments.txt"
+        environments_txt.write_text("/opt/conda\n")
+        return [str(environments_txt)]
+
+    async def test_instances_share_one_fetch(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            with patch(
+                METADATA_PATHS_TARGET, return_value=self._metadata_paths(tmp_dir)
+            ):
+                fetch = _Fetcher()
+                first = await CondaEnvListCache(None).get(fetch)
+                second = await CondaEnvListCache(None).get(fetch)
+        self.assertEqual(first, PREFIXES)
+        self.assertEqual(second, PREFIXES)
+        self.assertEqual(fetch.calls, 1)
+
+    async def test_disk_cache_survives_process_restart(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            with patch(
+                METADATA_PATHS_TARGET, return_value=self._metadata_paths(tmp_dir)
+            ):
+                fetch = _Fetcher()
+                await CondaEnvListCache(cache_dir).get(fetch)
+                CondaEnvListCache.clear_memory()
+                result = await CondaEnvListCache(cache_dir).get(fetch)
+        self.assertEqual(result, PREFIXES)
+        self.assertEqual(fetch.calls, 1)
+
+    async def test_metadata_change_invalidates(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            paths = self._metadata_paths(tmp_dir)
+            with patch(METADATA_PATHS_TARGET, return_value=paths):
+                fetch = _Fetcher()
+                await CondaEnvListCache(cache_dir).get(fetch)
+                stat = os.stat(paths[0])
+                os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                await CondaEnvListCache(cache_dir).get(fetch)
+        self.assertEqual(fetch.calls, 2)
+
+    async def test_failed_fetch_is_not_cached(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            with patch(
+                METADATA_PATHS_TARGET, return_value=self._metadata_paths(tmp_dir)
+            ):
+                fetch = _Fetcher()
+                fetch.fail = True
+                self.assertEqual(await CondaEnvListCache(None).get(fetch), {})
+                fetch.fail = False
+                self.assertEqual(await CondaEnvListCache(None).get(fetch), PREFIXES)
+        self.assertEqual(fetch.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
-from typing import AsyncIterator, Tuple, TypeVar
+import sys
+from typing import Any, AsyncIterator, List, Tuple, TypeVar
 
 from danielutils import AsyncWorkerPool
 
-from quickpub import CondaPythonProvider
+from quickpub import CondaPythonProvider, ExitEarlyError
+from quickpub.strategies.implementations.python_providers.conda_python_provider import (
+    get_conda_environment,
+    get_conda_path_entries,
+    parse_conda_env_list,
+)
 
-from tests.base_test_classes import AsyncBaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
 
 T = TypeVar("T")
@@ -46,3 +52,68 @@ class TestCondaPythonProvider(AsyncBaseTestClass):
 
             await pool.start()
             await pool.join()
+
+
+CONDA_ENV_LIST_OUTPUT: List[str] = [
+    "# conda environments:",
+    "#",
+    "base                  *  /opt/conda",
+    "py39                     /opt/conda/envs/py39",
+    "spaced                   /opt/my envs/spaced",
+    "                         /opt/unnamed",
+]
+
+
+class TestParseCondaEnvList(BaseTestClass):
+    def test_named_envs_are_mapped_to_prefixes(self) -> None:
+        self.assertEqual(
+            parse_conda_env_list(CONDA_ENV_LIST_OUTPUT),
+            {
+                "base": "/opt/conda",
+                "py39": "/opt/conda/envs/py39",
+                "spaced": "/opt/my envs/spaced",
+            },
+        )
+
+    def test_environment_prepends_prefix_to_path(self) -> None:
+        environment = get_conda_environment("py39", "/opt/conda/envs/py39")
+        self.assertTrue(
+            environment["PATH"].startswith(
+                get_conda_path_entries("/opt/conda/envs/py39")[0]
+            )
+        )
+        self.assertEqual(environment["CONDA_PREFIX"], "/opt/conda/envs/py39")
+        self.assertEqual(environment["CONDA_DEFAULT_ENV"], "py39")
+
+
+class TestCondaPythonProviderWithoutActivation(AsyncBaseTestClass):
+    async def _first_executor(self, provider: CondaPythonProvider) -> Tuple[str, Any]:
+        provider._env_prefixes = {"py39": "/opt/conda/envs/py39"}
+        async for env_name, executor in provider:
+            return env_name, executor
+        raise RuntimeError("No environment was provided")
+
+    async def test_commands_run_with_computed_environment(self) -> None:
+        for persistent_shell in (True, False):
+            provider = CondaPythonProvider(["py39"], persistent_shell=persistent_shell)
+            env_name, executor = await self._first_executor(provider)
+            with executor:
+                try:
+                    code, out, _ = await executor(
+                        f"{sys.executable} -c \"import os; print(os.environ['CONDA_DEFAULT_ENV'])\""
+                    )
+                finally:
+                    await executor.close()
+            self.assertEqual((env_name, code, out), ("py39", 0, ["py39"]))
+
+    async def test_activate_uses_conda_activate(self) -> None:
+        provider = CondaPythonProvider(["py39"], activate=True)
+        _, executor = await self._first_executor(provider)
+        with executor:
+            self.assertEqual(executor._build_command(), "conda activate py39")
+            self.assertIsNone(executor.environment)
+
+    async def test_unknown_env_raises(self) -> None:
+        provider = CondaPythonProvider(["missing"])
+        with self.assertRaises(ExitEarlyError):
+            await self._first_executor(provider)
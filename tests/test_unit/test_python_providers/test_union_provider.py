@@ -0,0 +1,171 @@
+import asyncio
+import unittest
+from typing import Dict, List, Optional, Set, Tuple
+
+from danielutils.async_.async_layered_command import AsyncLayeredCommand
+
+from quickpub import (
+    DefaultPythonProvider,
+    ExitEarlyError,
+    PythonProvider,
+    UnionProvider,
+)
+from quickpub.executors import CancellableAsyncLayeredCommand
+
+from tests.base_test_classes import AsyncBaseTestClass
+
+
+class _FakeProvider(PythonProvider):
+    def __init__(
+        self,
+        interpreters: Dict[str, Optional[str]],
+        gate: Optional[asyncio.Event] = None,
+        fail: bool = False,
+        exit_on_fail: bool = False,
+    ) -> None:
+        PythonProvider.__init__(
+            self,
+            requested_envs=list(interpreters),
+            explicit_versions=[],
+            exit_on_fail=exit_on_fail,
+        )
+        self.interpreters = interpreters
+        self.gate = gate
+        self.fail = fail
+        self.discovery_started = False
+
+    def get_python_executable_name(self) -> str:
+        return "python"
+
+    async def _get_available_envs_impl(self) -> Set[str]:
+        self.discovery_started = True
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise ExitEarlyError("discovery failed")
+        return set(self.interpreters)
+
+    async def get_interpreter_path(self, env_name: str) -> Optional[str]:
+        return self.interpreters[env_name]
+
+    async def __anext__(self) -> Tuple[str, AsyncLayeredCommand]:
+        await self._get_available_envs()
+        if self.aiter_index >= len(self.requested_envs):
+            raise StopAsyncIteration
+        self.aiter_index += 1
+        return (
+            self.requested_envs[self.aiter_index - 1],
+            CancellableAsyncLayeredCommand(),
+        )
+
+
+async def _collect(provider: PythonProvider) -> List[str]:
+    names = []
+    async for name, executor in provider:
+        with executor:
+            names.append(name)
+    return names
+
+
+class TestUnionProvider(AsyncBaseTestClass):
+    async def test_yields_all_child_envs(self) -> None:
+        provider = UnionProvider(
+            [
+                _FakeProvider({"a": "/envs/a/python", "b": "/envs/b/python"}),
+                _FakeProvider({"c": "/envs/c/python"}),
+            ]
+        )
+        self.assertListEqual(["a", "b", "c"], await _collect(provider))
+
+    async def test_system_env_is_recognized(self) -> None:
+        provider = UnionProvider(
+            [_FakeProvider({"a": "/envs/a/python"}), DefaultPythonProvider()]
+        )
+        self.assertListEqual(["a", "system"], await _collect(provider))
+        self.assertTrue(provider.is_system_interpreter("system"))
+        self.assertFalse(provider.is_system_interpreter("a"))
+
+    async def test_discovery_runs_concurrently(self) -> None:
+        gate = asyncio.Event()
+        slow = _FakeProvider({"slow": "/envs/slow/python"}, gate=gate)
+        fast = _FakeProvider({"fast": "/envs/fast/python"})
+        provider = UnionProvider([fast, slow]).__aiter__()
+
+        name, executor = await provider.__anext__()
+        with executor:
+            pass
+        self.assertEqual("fast", name)
+        self.assertTrue(slow.discovery_started)
+
+        gate.set()
+        name, executor = await provider.__anext__()
+        with executor:
+            pass
+        self.assertEqual("slow", name)
+        with self.assertRaises(StopAsyncIteration):
+            await provider.__anext__()
+
+    async def test_skips_envs_with_same_interpreter(self) -> None:
+        provider = UnionProvider(
+            [
+                _FakeProvider({"base": "/opt/conda/bin/python"}),
+                _FakeProvider({"system": "/opt/conda/bin/python", "x": None}),
+                _FakeProvider({"y": None}),
+            ]
+        )
+        self.assertListEqual(["base", "x", "y"], await _collect(provider))
+        self.assertEqual(
+            "/opt/conda/bin/python", await provider.get_interpreter_path("base")
+        )
+
+    async def test_earlier_child_wins_duplicates_whatever_discovers_first(
+        self,
+    ) -> None:
+        gate = asyncio.Event()
+        slow = _FakeProvider({"base": "/opt/conda/bin/python"}, gate=gate)
+        fast = _FakeProvider({"x": None, "system": "/opt/conda/bin/python"})
+        provider = UnionProvider([slow, fast]).__aiter__()
+
+        name, executor = await provider.__anext__()
+        with executor:
+            pass
+        self.assertEqual("x", name)
+        next_env = asyncio.ensure_future(provider.__anext__())
+        await asyncio.sleep(0)
+        self.assertFalse(next_env.done())
+
+        gate.set()
+        name, executor = await next_env
+        with executor:
+            pass
+        self.assertEqual("base", name)
+        with self.assertRaises(StopAsyncIteration):
+            await provider.__anext__()
+
+    async def test_exit_on_fail_follows_each_child(self) -> None:
+        provider = UnionProvider(
+            [
+                _FakeProvider({"strict": None}, exit_on_fail=True),
+                _FakeProvider({"lenient": None}, exit_on_fail=False),
+            ]
+        )
+        self.assertListEqual(["strict", "lenient"], await _collect(provider))
+        self.assertTrue(provider.get_exit_on_fail("strict"))
+        self.assertFalse(provider.get_exit_on_fail("lenient"))
+
+    async def test_discovery_failure_propagates(self) -> None:
+        gate = asyncio.Event()
+        slow = _FakeProvider({"slow": None}, gate=gate)
+        provider = UnionProvider([slow, _FakeProvider({"bad": None}, fail=True)])
+        with self.assertRaises(ExitEarlyError):
+            await _collect(provider)
+
+    async def test_available_envs_is_union(self) -> None:
+        provider = UnionProvider(
+            [_FakeProvider({"a": None}), _FakeProvider({"a": None, "b": None})]
+        )
+        self.assertSetEqual({"a", "b"}, await provider._get_available_envs())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+import unittest
+from typing import List
+
+from quickpub import UvPythonProvider, VenvPool
+
+from tests.base_test_classes import AsyncBaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+
+class _RecordingUvPythonProvider(UvPythonProvider):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.commands: List[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def _run_build_step(self, command: str) -> None:
+        self.commands.append(command)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+    async def _build_venv(self, interpreter: str, path: str) -> None:
+        await super()._build_venv(interpreter, path)
+        os.makedirs(path)
+
+
+class TestUvPythonProvider(AsyncBaseTestClass):
+    async def test_builds_with_uv_and_shared_cache(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            provider = _RecordingUvPythonProvider(
+                [sys.executable],
+                requirements=["requests>=2.25.0"],
+                pool=VenvPool(str(tmp_dir / "venvs")),
+                cache_dir=str(tmp_dir / "uv"),
+                offline=True,
+            )
+            async for _, executor in provider:
+                with executor:
+                    pass
+        create, install = provider.commands
+        cache_option = f'--cache-dir "{os.path.abspath(str(tmp_dir / "uv"))}"'
+        self.assertTrue(create.startswith('"uv" venv'))
+        self.assertIn("--seed", create)
+        self.assertIn(f'--python "{sys.executable}"', create)
+        self.assertTrue(install.startswith('"uv" pip install'))
+        self.assertIn('"requests>=2.25.0"', install)
+        for command in (create, install):
+            self.assertIn(cache_option, command)
+            self.assertIn("--offline", command)
+
+    async def test_added_requirements_are_installed(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            provider = _RecordingUvPythonProvider(
+                [sys.executable],
+                requirements=["pytest"],
+                pool=VenvPool(str(tmp_dir / "venvs")),
+                cache_dir=None,
+            )
+            provider.add_requirements(["requests>=2.25.0", "pytest"])
+            async for _, executor in provider:
+                with executor:
+                    pass
+        _, install = provider.commands
+        self.assertTrue(install.endswith('"pytest" "requests>=2.25.0"'))
+
+    async def test_added_requirements_can_be_ignored(self) -> None:
+        provider = UvPythonProvider(
+            [sys.executable], requirements=["pytest"], auto_install_dependencies=False
+        )
+        provider.add_requirements(["requests>=2.25.0"])
+        self.assertEqual(["pytest"], provider.requirements)
+
+    async def test_envs_are_built_concurrently(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            interpreters = []
+            for name in ("a", "b"):
+                interpreter = tmp_dir / name
+                interpreter.write_text("")
+                interpreters.append(str(interpreter))
+            provider = _RecordingUvPythonProvider(
+                interpreters, pool=VenvPool(str(tmp_dir / "venvs")), cache_dir=None
+            )
+            async for _, executor in provider:
+                with executor:
+                    pass
+        self.assertEqual(2, len(provider.commands))
+        self.assertEqual(2, provider.max_running)
+        self.assertTrue(all("--cache-dir" not in c for c in provider.commands))
+
+
+if __name__ == "__main__":
+    unittest.main()
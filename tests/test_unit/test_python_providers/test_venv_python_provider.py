@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+from typing import List
+
+from quickpub import ExitEarlyError, VenvPool, VenvPythonProvider
+
+from tests.base_test_classes import AsyncBaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+
+class _CountingVenvPythonProvider(VenvPythonProvider):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.builds: List[str] = []
+
+    def _get_create_command(self, interpreter: str, path: str) -> str:
+        self.builds.append(path)
+        return super()._get_create_command(interpreter, path) + " --without-pip"
+
+
+class TestVenvPool(AsyncBaseTestClass):
+    async def test_key_depends_on_requirements_not_their_order(self) -> None:
+        key = VenvPool.get_key(sys.executable, ["a", "b"])
+        self.assertEqual(key, VenvPool.get_key(sys.executable, ["b", "a"]))
+        self.assertNotEqual(key, VenvPool.get_key(sys.executable, ["a"]))
+
+    async def test_failed_build_is_removed_and_retried(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            pool = VenvPool(str(tmp_dir / "venvs"))
+            calls = []
+
+            async def build(path: str) -> None:
+                calls.append(path)
+                os.makedirs(path)
+                if len(calls) == 1:
+                    raise RuntimeError("build failed")
+
+            with self.assertRaises(RuntimeError):
+                await pool.acquire("key", build)
+            self.assertFalse(os.path.exists(pool.get_path("key")))
+            self.assertFalse(pool.is_ready("key"))
+
+            path = await pool.acquire("key", build)
+            await pool.acquire("key", build)
+            self.assertEqual(2, len(calls))
+            self.assertTrue(pool.is_ready("key"))
+            self.assertFalse(os.path.exists(os.path.join(pool.pool_dir, "key.lock")))
+            self.assertEqual(pool.get_path("key"), path)
+
+
+class TestVenvPythonProvider(AsyncBaseTestClass):
+    async def test_env_is_built_once_and_reused(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            pool = VenvPool(str(tmp_dir / "venvs"))
+            builds = []
+            for _ in range(2):
+                provider = _CountingVenvPythonProvider(
+                    [sys.executable], pool=pool, persistent_shell=False
+                )
+                async for name, executor in provider:
+                    with executor:
+                        code, out, _ = await executor(
+                            'python -c "import sys; print(sys.prefix)"'
+                        )
+                self.assertEqual(sys.executable, name)
+                self.assertEqual(0, code)
+                expected = pool.get_path(VenvPool.get_key(sys.executable, [], "venv"))
+                self.assertEqual(
+                    os.path.realpath(expected), os.path.realpath(out[0].strip())
+                )
+                builds.append(len(provider.builds))
+            self.assertListEqual([1, 0], builds)
+
+    async def test_missing_interpreter_raises(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            provider = VenvPythonProvider(
+                ["no-such-python-interpreter"], pool=VenvPool(str(tmp_dir))
+            )
+            with self.assertRaises(ExitEarlyError):
+                async for _ in provider:
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,154 +1,135 @@
 import asyncio
+import json
+import sys
 import unittest
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from quickpub import ExitEarlyError, Version, Dependency
+from quickpub.executors import CancellableAsyncLayeredCommand
 from quickpub.qa import (
-    global_import_sanity_check,
-    _get_installed_packages,
+    ENV_PROBE_PATH,
+    _run_env_probe,
     _check_dependency_satisfaction,
-    validate_dependencies,
+    probe_environment,
     run_config,
-    _setup_qa_environment,
     _submit_qa_tasks,
     _execute_qa_tasks,
     qa,
-    is_task_run_success,
     VERSION_REGEX,
 )
+from quickpub.qa_report import QAReport, QATaskStatus
+from quickpub.strategies import QARunResult
+from quickpub.worker_pool import WorkerPool
 
 from tests.base_test_classes import AsyncBaseTestClass
-
-
-class TestGlobalImportSanityCheck(AsyncBaseTestClass):
-    async def test_success(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
-
+from tests.test_helpers import temporary_test_directory
+
+
+def _probe_output(
+    versions: Dict[str, Optional[str]],
+    import_error: Optional[str] = None,
+    import_seconds: float = 0.25,
+) -> Tuple[int, List[str], List[str]]:
+    return (
+        0,
+        [
+            "",
+            json.dumps(
+                {
+                    "versions": versions,
+                    "import_error": import_error,
+                    "import_seconds": import_seconds,
+                }
+            ),
+        ],
+        [],
+    )
+
+
+class TestRunEnvProbe(AsyncBaseTestClass):
+    async def test_parse_probe_output(self) -> None:
         executor = AsyncMock()
-        executor.return_value = (0, [], [])
-
-        pbar = MagicMock()
-
-        await global_import_sanity_check(
-            package_name="testpackage",
-            executor=executor,
-            is_system_interpreter=False,
-            env_name="testenv",
-            task_id=0,
-            pbar=pbar,
+        executor.return_value = _probe_output(
+            {
+                "package1": "1.0.0",
+                "package2": "2.1",
+                "package3": "1.26.4.post1",
+                "package4": "invalid",
+                "package5": None,
+            }
         )
 
-        self.assertTrue(is_task_run_success[0])
-        pbar.update.assert_called_once_with(1)
-
-    async def test_failure(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
-
-        executor = AsyncMock()
-        executor.return_value = (1, [], ["error message"])
-
-        pbar = MagicMock()
-
-        with self.assertRaises(ExitEarlyError):
-            await global_import_sanity_check(
-                package_name="testpackage",
-                executor=executor,
-                is_system_interpreter=False,
-                env_name="testenv",
-                task_id=0,
-                pbar=pbar,
-            )
-
-        self.assertFalse(is_task_run_success[0])
-        pbar.update.assert_called_once_with(1)
-
-    async def test_exception_handling(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
-
-        executor = AsyncMock()
-        executor.side_effect = ValueError("Unexpected error")
-
-        pbar = MagicMock()
-
-        with self.assertRaises(ValueError):
-            await global_import_sanity_check(
-                package_name="testpackage",
-                executor=executor,
-                is_system_interpreter=False,
-                env_name="testenv",
-                task_id=0,
-                pbar=pbar,
-            )
-
-        self.assertFalse(is_task_run_success[0])
-        pbar.update.assert_called_once_with(1)
-
-    async def test_system_interpreter(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
-
-        executor = AsyncMock()
-        executor.return_value = (0, [], [])
-
-        await global_import_sanity_check(
-            package_name="testpackage",
-            executor=executor,
-            is_system_interpreter=True,
-            env_name="testenv",
-            task_id=0,
-            pbar=None,
+        result = await _run_env_probe(
+            executor,
+            "testenv",
+            "testpackage",
+            ["package1", "package2", "package3", "package4", "package5"],
         )
 
-        call_args = executor.call_args[0][0]
-        self.assertIn("python", call_args.lower())
+        pkg1 = result.installed["package1"]
+        assert isinstance(pkg1, Dependency)
+        self.assertEqual(pkg1.ver, Version(1, 0, 0))
 
+        pkg2 = result.installed["package2"]
+        assert isinstance(pkg2, Dependency)
+        self.assertEqual(pkg2.ver, Version(2, 1, 0))
 
-class TestGetInstalledPackages(AsyncBaseTestClass):
-    async def test_parse_pip_list_output(self) -> None:
-        executor = AsyncMock()
-        executor.return_value = (
-            0,
-            [
-                "Package    Version",
-                "---------- -------",
-                "package1   1.0.0",
-                "package2   2.0.0",
-                "package3   invalid",
-            ],
-            [],
-        )
+        pkg3 = result.installed["package3"]
+        assert isinstance(pkg3, Dependency)
+        self.assertEqual(pkg3.ver, Version(1, 26, 4))
 
-        result = await _get_installed_packages(executor, "testenv")
+        self.assertEqual(result.installed["package4"], "invalid")
+        self.assertNotIn("package5", result.installed)
+        self.assertIsNone(result.import_error)
+        self.assertEqual(0.25, result.import_seconds)
 
-        self.assertIn("package1", result)
-        self.assertIsInstance(result["package1"], Dependency)
-        pkg1 = result["package1"]
-        assert isinstance(pkg1, Dependency)
-        self.assertEqual(pkg1.ver, Version(1, 0, 0))
+    async def test_probe_runs_env_interpreter_once(self) -> None:
+        executor = AsyncMock()
+        executor.return_value = _probe_output({})
 
-        self.assertIn("package2", result)
-        self.assertIsInstance(result["package2"], Dependency)
+        await _run_env_probe(executor, "testenv", "testpackage", ["pkg-a", "pkg_b"])
 
-        self.assertIn("package3", result)
-        self.assertEqual(result["package3"], "invalid")
+        executor.assert_called_once()
+        command = executor.call_args[0][0]
+        self.assertTrue(command.startswith(f'python -X importtime "{ENV_PROBE_PATH}"'))
+        self.assertTrue(command.endswith('"testpackage" "pkg-a" "pkg_b"'))
 
-    async def test_pip_list_failure(self) -> None:
+    async def test_probe_failure(self) -> None:
         executor = AsyncMock()
         executor.return_value = (1, [], ["error"])
 
         with self.assertRaises(ExitEarlyError):
-            await _get_installed_packages(executor, "testenv")
-
-    async def test_empty_pip_list(self) -> None:
-        executor = AsyncMock()
-        executor.return_value = (0, ["Package    Version", "---------- -------"], [])
-
-        result = await _get_installed_packages(executor, "testenv")
-        self.assertEqual(len(result), 0)
+            await _run_env_probe(executor, "testenv", "testpackage", ["pkg"])
+
+    async def test_real_interpreter(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            package = tmp_dir / "probedpackage"
+            package.mkdir()
+            (package / "__init__.py").write_text("VALUE = 1\n")
+            broken = tmp_dir / "brokenpackage"
+            broken.mkdir()
+            (broken / "__init__.py").write_text("raise ImportError('broken')\n")
+
+            with CancellableAsyncLayeredCommand() as executor:
+                ok = await _run_env_probe(
+                    executor,
+                    "system",
+                    "probedpackage",
+                    ["pytest", "no-such-distribution"],
+                    sys.executable,
+                )
+                failed = await _run_env_probe(
+                    executor, "system", "brokenpackage", [], sys.executable
+                )
+
+        self.assertIsNone(ok.import_error)
+        self.assertIsInstance(ok.installed["pytest"], Dependency)
+        self.assertNotIn("no-such-distribution", ok.installed)
+        self.assertIn("probedpackage", [t.module for t in ok.import_timings])
+        self.assertNotIn("json", [t.module for t in ok.import_timings])
+        assert failed.import_error is not None
+        self.assertIn("ImportError: broken", failed.import_error)
 
 
 class TestCheckDependencySatisfaction(unittest.TestCase):
@@ -197,95 +178,104 @@ class TestCheckDependencySatisfaction(unittest.TestCase):
         self.assertIn("not currently supported", result[0][1])
 
 
-class TestValidateDependencies(AsyncBaseTestClass):
-    async def test_success(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+class TestProbeEnvironment(AsyncBaseTestClass):
+    async def _probe(
+        self,
+        executor: AsyncMock,
+        required: List[Dependency],
+        validation_exit_on_fail: bool = True,
+    ) -> Tuple[QAReport, MagicMock]:
+        report = QAReport()
+        report.add_task("dependencies", "testenv")
+        report.add_task("import", "testenv")
+        pbar = MagicMock()
+        try:
+            await probe_environment(
+                validation_exit_on_fail=validation_exit_on_fail,
+                package_name="testpackage",
+                required_dependencies=required,
+                executor=executor,
+                is_system_interpreter=False,
+                env_name="testenv",
+                report=report,
+                dependencies_task_id=0,
+                import_task_id=1,
+                pbar=pbar,
+            )
+        finally:
+            self.report, self.pbar = report, pbar
+        return report, pbar
 
+    async def test_success(self) -> None:
         executor = AsyncMock()
-        executor.return_value = (
-            0,
-            [
-                "Package    Version",
-                "---------- -------",
-                "pkg1       2.0.0",
-            ],
-            [],
+        executor.return_value = _probe_output({"pkg1": "2.0.0"})
+
+        report, pbar = await self._probe(
+            executor, [Dependency("pkg1", ">=", Version(1, 0, 0))]
         )
 
-        required = [Dependency("pkg1", ">=", Version(1, 0, 0))]
-        pbar = MagicMock()
+        executor.assert_called_once()
+        self.assertTrue(report[0].passed)
+        self.assertTrue(report[1].passed)
+        self.assertIn("0.250s", report[1].output[0])
+        pbar.update.assert_called_once_with(2)
 
-        await validate_dependencies(
-            validation_exit_on_fail=True,
-            required_dependencies=required,
-            executor=executor,
-            env_name="testenv",
-            task_id=0,
-            pbar=pbar,
-        )
+    async def test_missing_dependency(self) -> None:
+        executor = AsyncMock()
+        executor.return_value = _probe_output({"pkg1": None})
 
-        self.assertTrue(is_task_run_success[0])
-        pbar.update.assert_called_once_with(1)
+        with self.assertRaises(ExitEarlyError):
+            await self._probe(executor, [Dependency("pkg1", ">=", Version(1, 0, 0))])
 
-    async def test_failure_exit_on_fail(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        self.assertFalse(self.report[0].passed)
+        self.assertTrue(self.report[1].passed)
+        self.pbar.update.assert_called_once_with(2)
 
+    async def test_import_failure(self) -> None:
         executor = AsyncMock()
-        executor.return_value = (
-            0,
-            [
-                "Package    Version",
-                "---------- -------",
-            ],
-            [],
+        executor.return_value = _probe_output(
+            {}, import_error="Traceback (most recent call last):\nImportError: boom\n"
         )
 
-        required = [Dependency("pkg1", ">=", Version(1, 0, 0))]
-        pbar = MagicMock()
+        with self.assertRaises(ExitEarlyError) as context:
+            await self._probe(executor, [])
 
-        with self.assertRaises(ExitEarlyError):
-            await validate_dependencies(
-                validation_exit_on_fail=True,
-                required_dependencies=required,
-                executor=executor,
-                env_name="testenv",
-                task_id=0,
-                pbar=pbar,
-            )
+        self.assertIn("ImportError: boom", str(context.exception))
+        self.assertTrue(self.report[0].passed)
+        self.assertFalse(self.report[1].passed)
 
-        self.assertFalse(is_task_run_success[0])
+    async def test_validation_disabled_skips_metadata(self) -> None:
+        executor = AsyncMock()
+        executor.return_value = _probe_output({})
 
-    async def test_exception_handling(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        report, _ = await self._probe(
+            executor,
+            [Dependency("pkg1", ">=", Version(1, 0, 0))],
+            validation_exit_on_fail=False,
+        )
 
+        self.assertTrue(executor.call_args[0][0].endswith('"testpackage"'))
+        self.assertTrue(report[0].passed)
+
+    async def test_exception_handling(self) -> None:
         executor = AsyncMock()
         executor.side_effect = ValueError("Unexpected error")
 
-        pbar = MagicMock()
-
         with self.assertRaises(ValueError):
-            await validate_dependencies(
-                validation_exit_on_fail=True,
-                required_dependencies=[],
-                executor=executor,
-                env_name="testenv",
-                task_id=0,
-                pbar=pbar,
-            )
+            await self._probe(executor, [Dependency("pkg1", ">=", Version(1, 0, 0))])
 
-        self.assertFalse(is_task_run_success[0])
+        self.assertFalse(self.report[0].passed)
+        self.assertFalse(self.report[1].passed)
+        self.pbar.update.assert_called_once_with(2)
 
 
 class TestRunConfig(AsyncBaseTestClass):
     async def test_success(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        report = QAReport()
+        report.add_task("task", "testenv")
 
         runner = MagicMock()
-        runner.run = AsyncMock()
+        runner.run = AsyncMock(return_value=QARunResult(0.9, ["output"]))
 
         executor = AsyncMock()
 
@@ -296,6 +286,7 @@ class TestRunConfig(AsyncBaseTestClass):
             async_executor=executor,
             runner=runner,
             config_id=1,
+            report=report,
             task_id=0,
             is_system_interpreter=False,
             validation_exit_on_fail=True,
@@ -303,13 +294,15 @@ class TestRunConfig(AsyncBaseTestClass):
             pbar=pbar,
         )
 
-        self.assertTrue(is_task_run_success[0])
+        self.assertTrue(report[0].passed)
+        self.assertEqual(report[0].score, 0.9)
+        self.assertEqual(report[0].output, ["output"])
         runner.run.assert_called_once()
         pbar.update.assert_called_once_with(1)
 
     async def test_exit_early_error(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        report = QAReport()
+        report.add_task("task", "testenv")
 
         runner = MagicMock()
         runner.run = AsyncMock(side_effect=ExitEarlyError("QA failed"))
@@ -323,6 +316,7 @@ class TestRunConfig(AsyncBaseTestClass):
                 async_executor=executor,
                 runner=runner,
                 config_id=1,
+                report=report,
                 task_id=0,
                 is_system_interpreter=False,
                 validation_exit_on_fail=True,
@@ -330,11 +324,11 @@ class TestRunConfig(AsyncBaseTestClass):
                 pbar=pbar,
             )
 
-        self.assertFalse(is_task_run_success[0])
+        self.assertFalse(report[0].passed)
 
     async def test_other_exception_with_exit_on_fail(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        report = QAReport()
+        report.add_task("task", "testenv")
 
         runner = MagicMock()
         runner.run = AsyncMock(side_effect=ValueError("Unexpected error"))
@@ -348,6 +342,7 @@ class TestRunConfig(AsyncBaseTestClass):
                 async_executor=executor,
                 runner=runner,
                 config_id=1,
+                report=report,
                 task_id=0,
                 is_system_interpreter=False,
                 validation_exit_on_fail=True,
@@ -355,11 +350,11 @@ class TestRunConfig(AsyncBaseTestClass):
                 pbar=pbar,
             )
 
-        self.assertFalse(is_task_run_success[0])
+        self.assertFalse(report[0].passed)
 
     async def test_other_exception_without_exit_on_fail(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.append(False)
+        report = QAReport()
+        report.add_task("task", "testenv")
 
         runner = MagicMock()
         runner.run = AsyncMock(side_effect=ValueError("Unexpected error"))
@@ -372,6 +367,7 @@ class TestRunConfig(AsyncBaseTestClass):
             async_executor=executor,
             runner=runner,
             config_id=1,
+            report=report,
             task_id=0,
             is_system_interpreter=False,
             validation_exit_on_fail=False,
@@ -379,26 +375,12 @@ class TestRunConfig(AsyncBaseTestClass):
             pbar=pbar,
         )
 
-        self.assertFalse(is_task_run_success[0])
-
-
-class TestSetupQaEnvironment(unittest.TestCase):
-    def test_default_python_provider(self) -> None:
-        from quickpub.strategies import DefaultPythonProvider
-
-        provider = DefaultPythonProvider()
-        result = _setup_qa_environment(provider)
-        self.assertTrue(result)
-
-    def test_non_default_python_provider(self) -> None:
-        provider = MagicMock()
-        result = _setup_qa_environment(provider)
-        self.assertFalse(result)
+        self.assertFalse(report[0].passed)
 
 
 class TestSubmitQaTasks(AsyncBaseTestClass):
     async def test_submit_tasks(self) -> None:
-        is_task_run_success.clear()
+        report = QAReport()
 
         async def mock_provider_iter() -> AsyncIterator[tuple[str, Any]]:
             from typing import AsyncIterator, Any
@@ -410,11 +392,13 @@ class TestSubmitQaTasks(AsyncBaseTestClass):
             yield ("env1", executor)
 
         provider = MagicMock()
-        provider.exit_on_fail = True
+        provider.get_exit_on_fail.return_value = True
+        provider.is_system_interpreter.return_value = False
         provider.__aiter__ = lambda self: mock_provider_iter()  # type: ignore[assignment]
 
         pool = MagicMock()
         pool.submit = AsyncMock()
+        pool.cancelled = False
 
         pbar = MagicMock()
 
@@ -424,39 +408,45 @@ class TestSubmitQaTasks(AsyncBaseTestClass):
             package_name="testpackage",
             src_folder_path="./testpackage",
             dependencies=[],
-            is_system_interpreter=False,
             pool=pool,
+            report=report,
             pbar=pbar,
         )
 
         self.assertGreater(total, 0)
-        self.assertEqual(len(is_task_run_success), total)
+        self.assertEqual(len(report), total)
+        self.assertTrue(all(task.status == QATaskStatus.PENDING for task in report))
 
 
 class TestExecuteQaTasks(AsyncBaseTestClass):
     async def test_all_success(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.extend([True, True, True])
+        report = QAReport()
+        for task_id in range(3):
+            report.add_task(f"task{task_id}", "testenv")
+            report.mark_passed(task_id)
 
         pool = MagicMock()
         pool.start = AsyncMock()
         pool.join = AsyncMock()
 
-        result = await _execute_qa_tasks(pool, total=3, qa_start_time=0.0)
+        result = await _execute_qa_tasks(pool, report=report, qa_start_time=0.0)
 
         self.assertTrue(result)
-        pool.start.assert_called_once()
         pool.join.assert_called_once()
 
     async def test_some_failures(self) -> None:
-        is_task_run_success.clear()
-        is_task_run_success.extend([True, False, True])
+        report = QAReport()
+        for task_id in range(3):
+            report.add_task(f"task{task_id}", "testenv")
+        report.mark_passed(0)
+        report.mark_failed(1)
+        report.mark_passed(2)
 
         pool = MagicMock()
         pool.start = AsyncMock()
         pool.join = AsyncMock()
 
-        result = await _execute_qa_tasks(pool, total=3, qa_start_time=0.0)
+        result = await _execute_qa_tasks(pool, report=report, qa_start_time=0.0)
 
         self.assertFalse(result)
 
@@ -465,14 +455,12 @@ class TestQa(AsyncBaseTestClass):
     @patch("quickpub.qa._execute_qa_tasks")
     @patch("quickpub.qa._submit_qa_tasks")
     @patch("quickpub.qa.WorkerPool")
-    @patch("quickpub.qa._setup_qa_environment")
     async def test_qa_workflow(
-        self, mock_setup, mock_worker_pool, mock_submit, mock_execute
+        self, mock_worker_pool, mock_submit, mock_execute
     ) -> None:
-        is_task_run_success.clear()
-
-        mock_setup.return_value = False
         mock_worker_pool.return_value = MagicMock()
+        mock_worker_pool.return_value.start = AsyncMock()
+        mock_worker_pool.return_value.started = False
         mock_submit.return_value = 5
         mock_execute.return_value = True
 
@@ -491,10 +479,126 @@ class TestQa(AsyncBaseTestClass):
         )
 
         self.assertTrue(result)
-        mock_setup.assert_called_once_with(provider)
+        provider.add_requirements.assert_called_once_with([])
+        mock_worker_pool.return_value.start.assert_called_once()
         mock_submit.assert_called_once()
         mock_execute.assert_called_once()
 
+    @patch("quickpub.qa._execute_qa_tasks", return_value=True)
+    @patch("quickpub.qa._submit_qa_tasks")
+    @patch("quickpub.qa.WorkerPool")
+    async def test_runner_tools_are_added_to_requirements(
+        self, mock_worker_pool, mock_submit, mock_execute
+    ) -> None:
+        from quickpub import MypyRunner, PytestRunner, UnittestRunner
+
+        mock_worker_pool.return_value = MagicMock()
+        mock_worker_pool.return_value.start = AsyncMock()
+        provider = MagicMock()
+        await qa(
+            python_provider=provider,
+            quality_assurance_strategies=[
+                MypyRunner(),
+                PytestRunner(),
+                UnittestRunner(),
+                PytestRunner(),
+            ],
+            package_name="testpackage",
+            src_folder_path="./testpackage",
+            dependencies=[Dependency("requests", ">=", Version(2, 25, 0))],
+        )
+        provider.add_requirements.assert_called_once_with(
+            ["requests>=2.25.0", "mypy", "pytest"]
+        )
+
+    async def test_tasks_run_while_envs_are_provided(self) -> None:
+        first_probed = asyncio.Event()
+
+        async def execute(
+            *args: Any, **kwargs: Any
+        ) -> Tuple[int, List[str], List[str]]:
+            first_probed.set()
+            return _probe_output({})
+
+        def make_executor() -> AsyncMock:
+            executor = AsyncMock(side_effect=execute)
+            executor.__enter__ = MagicMock(return_value=executor)
+            executor.__exit__ = MagicMock(return_value=None)
+            return executor
+
+        async def provide() -> AsyncIterator[Tuple[str, Any]]:
+            yield "first", make_executor()
+            await asyncio.wait_for(first_probed.wait(), timeout=5)
+            yield "second", make_executor()
+
+        provider = MagicMock()
+        provider.get_exit_on_fail.return_value = True
+        provider.is_system_interpreter.return_value = False
+        provider.__aiter__ = lambda self: provide()  # type: ignore[assignment]
+        report = QAReport()
+
+        result = await qa(
+            python_provider=provider,
+            quality_assurance_strategies=[],
+            package_name="testpackage",
+            src_folder_path="./testpackage",
+            dependencies=[],
+            report=report,
+        )
+
+        self.assertTrue(result)
+        self.assertEqual({"first", "second"}, {task.env_name for task in report})
+
+    async def test_longest_historical_task_is_dequeued_first(self) -> None:
+        from quickpub import MypyRunner, PylintRunner
+
+        started: List[str] = []
+
+        async def fake_probe_environment(*args: Any) -> None:
+            started.append("probe")
+
+        async def fake_run_config(
+            env_name: str, executor: Any, runner: Any, *args: Any, **kwargs: Any
+        ) -> None:
+            started.append(runner.__class__.__qualname__)
+
+        async def provide() -> AsyncIterator[Tuple[str, Any]]:
+            executor = MagicMock()
+            executor.prev = None
+            yield "env", executor
+
+        provider = MagicMock()
+        provider.get_exit_on_fail.return_value = True
+        provider.is_system_interpreter.return_value = False
+        provider.__aiter__ = lambda self: provide()  # type: ignore[assignment]
+        durations = {
+            "Validate dependencies for env 'env'": 2.0,
+            "Run config for 'env' + 'MypyRunner'": 5.0,
+            "Run config for 'env' + 'PylintRunner'": 30.0,
+        }
+        history = MagicMock()
+        history.get_priority.side_effect = durations.__getitem__
+        submit = WorkerPool.submit
+
+        async def yielding_submit(self: WorkerPool, *args: Any, **kwargs: Any) -> None:
+            await submit(self, *args, **kwargs)
+            await asyncio.sleep(0)
+
+        with patch("quickpub.qa.probe_environment", fake_probe_environment), patch(
+            "quickpub.qa.run_config", fake_run_config
+        ), patch.object(WorkerPool, "submit", yielding_submit):
+            await qa(
+                python_provider=provider,
+                quality_assurance_strategies=[MypyRunner(), PylintRunner()],
+                package_name="testpackage",
+                src_folder_path="./testpackage",
+                dependencies=[],
+                num_workers=1,
+                history=history,
+            )
+
+        self.assertEqual(["PylintRunner", "MypyRunner", "probe"], started)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,218 @@
+import json
+import os
+import unittest
+from typing import List
+from unittest.mock import AsyncMock
+
+from danielutils import LayeredCommand
+
+from quickpub import QAResultCache, EnvCapabilities, ExitEarlyError
+from quickpub.cache import JsonFileCache, hash_paths
+from quickpub.strategies import QualityAssuranceRunner
+
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+LOCATION: str = "/env|/env/bin/python"
+
+
+class _ScoreRunner(QualityAssuranceRunner):
+    def __init__(self, bound: str = ">=0.5") -> None:
+        QualityAssuranceRunner.__init__(self, name="score", bound=bound)
+
+    def _build_command(self, target: str, use_system_interpreter: bool = False) -> str:
+        return f"score {target}"
+
+    def _install_dependencies(self, base: LayeredCommand) -> None:
+        return None
+
+    def _calculate_score(
+        self, ret: int, command_output: List[str], *, verbose: bool = False
+    ) -> float:
+        return float(command_output[-1])
+
+
+def _make_executor(score: str, location: str = LOCATION) -> AsyncMock:
+    capabilities_output = json.dumps(
+        {
+            "location": location,
+            "distributions": {"pkg1": "1.0.0"},
+            "site_packages": [],
+        }
+    )
+
+    async def execute(command: str, **kwargs: object) -> tuple:
+        if "capabilities_probe" in command:
+            return 0, [capabilities_output], []
+        return 0, [score], []
+
+    executor = AsyncMock(side_effect=execute)
+    executor._build_command = lambda command: command
+    return executor
+
+
+def _runner_calls(executor: AsyncMock) -> List[str]:
+    return [
+        call.args[0]
+        for call in executor.call_args_list
+        if "capabilities_probe" not in call.args[0]
+    ]
+
+
+class TestJsonFileCache(BaseTestClass):
+    def test_values_persist_across_instances(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            path = str(tmp_dir / "nested" / "cache.json")
+            JsonFileCache(path).set("key", {"value": 1})
+            self.assertEqual(JsonFileCache(path).get("key"), {"value": 1})
+
+    def test_corrupt_file_is_ignored(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            path = tmp_dir / "cache.json"
+            path.write_text("{not json")
+            self.assertIsNone(JsonFileCache(str(path)).get("key"))
+
+
+class TestHashPaths(BaseTestClass):
+    def test_content_change_changes_hash(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            module = tmp_dir / "module.py"
+            module.write_text("x = 1\n")
+            before = hash_paths([str(tmp_dir)])
+            module.write_text("x = 2\n")
+            self.assertNotEqual(before, hash_paths([str(tmp_dir)]))
+
+    def test_version_assignment_is_ignored(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            init = tmp_dir / "__init__.py"
+            init.write_text('import os\n__version__ = "1.0.0"\n')
+            before = hash_paths([str(tmp_dir)])
+            init.write_text('import os\n__version__ = "1.0.1"\n')
+            self.assertEqual(before, hash_paths([str(tmp_dir)]))
+
+    def test_bytecode_is_ignored(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "module.py").write_text("x = 1\n")
+            before = hash_paths([str(tmp_dir)])
+            cache_dir = tmp_dir / "__pycache__"
+            cache_dir.mkdir()
+            (cache_dir / "module.cpython-311.pyc").write_bytes(b"\0")
+            self.assertEqual(before, hash_paths([str(tmp_dir)]))
+
+
+class TestQAResultCache(AsyncBaseTestClass):
+    async def test_hit_skips_runner_command(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "module.py").write_text("x = 1\n")
+            runner = _ScoreRunner()
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+
+            first = _make_executor("0.9")
+            await runner.run(
+                str(tmp_dir), first, env_name="env", cache=QAResultCache(cache_dir)
+            )
+            self.assertEqual(len(_runner_calls(first)), 1)
+
+            second = _make_executor("0.9")
+            await runner.run(
+                str(tmp_dir), second, env_name="env", cache=QAResultCache(cache_dir)
+            )
+            self.assertEqual(_runner_calls(second), [])
+
+    async def test_source_change_invalidates(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            module = tmp_dir / "module.py"
+            module.write_text("x = 1\n")
+            runner = _ScoreRunner()
+            cache = QAResultCache(str(tmp_dir / ".quickpub_cache"))
+            await runner.run(
+                str(tmp_dir), _make_executor("0.9"), env_name="env", cache=cache
+            )
+
+            module.write_text("x = 2\n")
+            executor = _make_executor("0.9")
+            await runner.run(str(tmp_dir), executor, env_name="env", cache=cache)
+            self.assertEqual(len(_runner_calls(executor)), 1)
+
+    async def test_env_at_another_location_misses(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "module.py").write_text("x = 1\n")
+            runner = _ScoreRunner()
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            await runner.run(
+                str(tmp_dir),
+                _make_executor("0.9"),
+                env_name="env",
+                cache=QAResultCache(cache_dir),
+            )
+
+            executor = _make_executor("0.9", location="/pool/1|/pool/1/bin/python")
+            await runner.run(
+                str(tmp_dir), executor, env_name="env", cache=QAResultCache(cache_dir)
+            )
+            self.assertEqual(len(_runner_calls(executor)), 1)
+
+    async def test_uncacheable_runner_always_runs(self) -> None:
+        class _UncacheableRunner(_ScoreRunner):
+            def is_cacheable(self) -> bool:
+                return False
+
+        with temporary_test_directory() as tmp_dir:
+            runner = _UncacheableRunner()
+            cache = QAResultCache(str(tmp_dir / ".quickpub_cache"))
+            for _ in range(2):
+                executor = _make_executor("0.9")
+                await runner.run(str(tmp_dir), executor, env_name="env", cache=cache)
+                self.assertEqual(len(_runner_calls(executor)), 1)
+                self.assertEqual(len(executor.call_args_list), 1)
+
+    async def test_failing_score_is_not_cached(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            runner = _ScoreRunner()
+            cache_dir = str(tmp_dir / ".quickpub_cache")
+            with self.assertRaises(RuntimeError) as e:
+                await runner.run(
+                    str(tmp_dir),
+                    _make_executor("0.1"),
+                    env_name="env",
+                    cache=QAResultCache(cache_dir),
+                )
+            self.assertIsInstance(e.exception.__cause__, ExitEarlyError)
+            self.assertFalse(
+                os.path.exists(os.path.join(cache_dir, QAResultCache.FILE_NAME))
+            )
+
+    async def test_env_fingerprint_computed_once_per_env(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            cache = QAResultCache(str(tmp_dir))
+            executor = _make_executor("1")
+            first = await cache.get_env_fingerprint(executor, "env")
+            second = await cache.get_env_fingerprint(executor, "env")
+            self.assertEqual(first, second)
+            executor.assert_called_once()
+
+    async def test_failed_fingerprint_disables_caching(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            cache = QAResultCache(str(tmp_dir))
+            executor = AsyncMock(return_value=(1, [], ["python: not found"]))
+            key = await cache.build_key(
+                _ScoreRunner(), str(tmp_dir), "score", executor, env_name="env"
+            )
+            self.assertIsNone(key)
+
+    async def test_fingerprint_reuses_capabilities_detection(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            cache = QAResultCache(str(tmp_dir))
+            capabilities = EnvCapabilities()
+            executor = _make_executor("1")
+            await capabilities.get_distributions(executor, "env")
+            self.assertIsNotNone(
+                await cache.get_env_fingerprint(
+                    executor, "env", capabilities=capabilities
+                )
+            )
+            executor.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
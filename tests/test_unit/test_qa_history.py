@@ -0,0 +1,52 @@
+import math
+import time
+import unittest
+
+from quickpub import QADurationHistory, QAReport
+
+from tests.base_test_classes import BaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+
+def _finished_report(*, cached: bool = False) -> QAReport:
+    report = QAReport()
+    task_id = report.add_task("slow", "env", "Runner")
+    report.start(task_id)
+    time.sleep(0.01)
+    report.mark_passed(task_id, score=1.0, cached=cached)
+    report.add_task("never ran", "env")
+    report.cancel_pending()
+    return report
+
+
+class TestQADurationHistory(BaseTestClass):
+    def test_unmeasured_task_gets_highest_priority(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            history = QADurationHistory(str(tmp_dir))
+            self.assertIsNone(history.get_expected_duration("task"))
+            self.assertEqual(history.get_priority("task"), math.inf)
+
+    def test_durations_persist_across_instances(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            QADurationHistory(str(tmp_dir)).record(_finished_report())
+            history = QADurationHistory(str(tmp_dir))
+            duration = history.get_expected_duration("slow")
+            assert duration is not None
+            self.assertGreaterEqual(duration, 0.01)
+            self.assertEqual(history.get_priority("slow"), duration)
+
+    def test_cancelled_tasks_are_not_recorded(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            history = QADurationHistory(str(tmp_dir))
+            history.record(_finished_report())
+            self.assertIsNone(history.get_expected_duration("never ran"))
+
+    def test_cached_runs_are_not_recorded(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            history = QADurationHistory(str(tmp_dir))
+            history.record(_finished_report(cached=True))
+            self.assertIsNone(history.get_expected_duration("slow"))
+
+
+if __name__ == "__main__":
+    unittest.main()
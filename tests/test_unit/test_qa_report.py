@@ -0,0 +1,60 @@
+import unittest
+
+from quickpub import QAReport, QATaskStatus
+
+from tests.base_test_classes import BaseTestClass
+
+
+class TestQAReport(BaseTestClass):
+    def test_new_tasks_are_pending(self) -> None:
+        report = QAReport()
+        task_id = report.add_task("task", "env", "PytestRunner")
+        self.assertEqual(report[task_id].status, QATaskStatus.PENDING)
+        self.assertEqual(report[task_id].runner_name, "PytestRunner")
+        self.assertFalse(report.success)
+
+    def test_success_requires_all_tasks_passed(self) -> None:
+        report = QAReport()
+        first = report.add_task("first", "env")
+        second = report.add_task("second", "env")
+        report.mark_passed(first, score=1.0)
+        self.assertFalse(report.success)
+        report.mark_passed(second)
+        self.assertTrue(report.success)
+
+    def test_failure_keeps_previous_output(self) -> None:
+        report = QAReport()
+        task_id = report.add_task("task", "env")
+        report.mark_failed(task_id, output=["stderr line"])
+        report.mark_failed(task_id, error="boom")
+        self.assertEqual(report[task_id].output, ["stderr line"])
+        self.assertEqual(report[task_id].error, "boom")
+        self.assertEqual(report.failed_tasks, [report[task_id]])
+
+    def test_duration_is_recorded_for_started_tasks(self) -> None:
+        report = QAReport()
+        task_id = report.add_task("task", "env")
+        report.start(task_id)
+        report.mark_passed(task_id)
+        duration = report[task_id].duration
+        assert duration is not None
+        self.assertGreaterEqual(duration, 0.0)
+
+    def test_cancel_pending_leaves_finished_tasks(self) -> None:
+        report = QAReport()
+        finished = report.add_task("finished", "env")
+        pending = report.add_task("pending", "env")
+        report.mark_failed(finished)
+        report.cancel_pending()
+        self.assertEqual(report[finished].status, QATaskStatus.FAILED)
+        self.assertEqual(report[pending].status, QATaskStatus.CANCELLED)
+
+    def test_reports_are_independent(self) -> None:
+        first, second = QAReport(), QAReport()
+        first.add_task("task", "env")
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
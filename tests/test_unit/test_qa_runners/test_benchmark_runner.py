@@ -0,0 +1,130 @@
+import json
+import os
+import unittest
+from typing import Dict, List
+
+from quickpub import BenchmarkRunner, ExitEarlyError, Version
+from quickpub.benchmark_probe import RESULT_MARKER
+
+from tests.base_test_classes import BaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+PYTHON = "cpython-3.11"
+
+
+def _probe_output(benchmarks: Dict[str, float], python: str = PYTHON) -> List[str]:
+    return [
+        "============ 2 passed in 1.00s ============",
+        RESULT_MARKER,
+        json.dumps({"python": python, "benchmarks": benchmarks}),
+    ]
+
+
+def _write_baseline(
+    baseline_dir: str, version: str, benchmarks: Dict[str, float]
+) -> None:
+    directory = os.path.join(baseline_dir, PYTHON)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{version}.json"), "w", encoding="utf8") as f:
+        json.dump({"statistic": "median", "benchmarks": benchmarks}, f)
+
+
+class TestBenchmarkRunner(BaseTestClass):
+    def test_worst_slowdown_against_latest_older_version(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            baseline_dir = str(tmp_dir / "baselines")
+            _write_baseline(baseline_dir, "1.0.0", {"a": 1.0, "b": 1.0})
+            _write_baseline(baseline_dir, "1.1.0", {"a": 0.5, "b": 2.0})
+            _write_baseline(baseline_dir, "2.0.0", {"a": 10.0, "b": 10.0})
+            runner = BenchmarkRunner(
+                bound="<=2", version="1.2.0", baseline_dir=baseline_dir
+            )
+            baseline = runner.load_baseline(PYTHON)
+            assert baseline is not None
+            self.assertEqual(Version(1, 1, 0), baseline[0])
+            score = runner._calculate_score(0, _probe_output({"a": 0.75, "b": 1.0}))
+            self.assertAlmostEqual(1.5, score)
+
+    def test_passing_run_becomes_baseline_of_published_version(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            baseline_dir = str(tmp_dir / "baselines")
+            _write_baseline(baseline_dir, "1.0.0", {"a": 1.0})
+            runner = BenchmarkRunner(baseline_dir=baseline_dir)
+            self.assertAlmostEqual(
+                1.1, runner._calculate_score(0, _probe_output({"a": 1.1}))
+            )
+            self.assertFalse(
+                os.path.exists(os.path.join(baseline_dir, PYTHON, "1.0.1.json"))
+            )
+            runner.on_published("pkg", Version(1, 0, 1))
+            later = BenchmarkRunner(baseline_dir=baseline_dir)
+            baseline = later.load_baseline(PYTHON)
+            assert baseline is not None
+            self.assertEqual(Version(1, 0, 1), baseline[0])
+            self.assertAlmostEqual(
+                1.0, later._calculate_score(0, _probe_output({"a": 1.1}))
+            )
+
+    def test_explicit_version_names_the_baseline(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            baseline_dir = str(tmp_dir / "baselines")
+            runner = BenchmarkRunner(version="2.0.0", baseline_dir=baseline_dir)
+            runner._calculate_score(0, _probe_output({"a": 1.0}))
+            runner.on_published("pkg", Version(1, 0, 1))
+            self.assertTrue(
+                os.path.exists(os.path.join(baseline_dir, PYTHON, "2.0.0.json"))
+            )
+
+    def test_failing_run_is_not_stored(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            baseline_dir = str(tmp_dir / "baselines")
+            _write_baseline(baseline_dir, "1.0.0", {"a": 1.0})
+            runner = BenchmarkRunner(version="1.0.1", baseline_dir=baseline_dir)
+            self.assertAlmostEqual(
+                1.5, runner._calculate_score(0, _probe_output({"a": 1.5}))
+            )
+            runner.on_published("pkg", Version(1, 0, 1))
+            self.assertFalse(
+                os.path.exists(os.path.join(baseline_dir, PYTHON, "1.0.1.json"))
+            )
+
+    def test_baselines_are_per_python(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            baseline_dir = str(tmp_dir / "baselines")
+            _write_baseline(baseline_dir, "1.0.0", {"a": 1.0})
+            runner = BenchmarkRunner(version="1.0.1", baseline_dir=baseline_dir)
+            output = _probe_output({"a": 5.0}, python="pypy-3.9")
+            self.assertEqual(1.0, runner._calculate_score(0, output))
+
+    def test_no_baseline_scores_one(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            runner = BenchmarkRunner(baseline_dir=str(tmp_dir / "baselines"))
+            self.assertEqual(1.0, runner._calculate_score(0, _probe_output({"a": 1})))
+            self.assertFalse(os.path.exists(str(tmp_dir / "baselines")))
+
+    def test_failed_suite_raises(self) -> None:
+        runner = BenchmarkRunner()
+        with self.assertRaises(ExitEarlyError):
+            runner._calculate_score(1, _probe_output({"a": 1.0}))
+        with self.assertRaises(ExitEarlyError):
+            runner._calculate_score(2, ["ERROR: usage: pytest"])
+
+    def test_invalid_statistic(self) -> None:
+        with self.assertRaises(ValueError):
+            BenchmarkRunner(statistic="p99")
+
+    def test_command(self) -> None:
+        command = BenchmarkRunner(target="./bench", statistic="min")._build_command(
+            "./pkg"
+        )
+        self.assertTrue(command.startswith("python "))
+        self.assertTrue(command.endswith('"./bench" min'))
+        self.assertFalse(BenchmarkRunner().is_cacheable())
+
+    def test_cpu_weight(self) -> None:
+        self.assertEqual(os.cpu_count() or 1, BenchmarkRunner().get_cpu_weight())
+        self.assertEqual(1, BenchmarkRunner(exclusive=False).get_cpu_weight())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import unittest
+
+from quickpub import ExitEarlyError, ImportTimeRunner
+from quickpub.executors import CancellableAsyncLayeredCommand
+from quickpub.import_time_probe import RUN_MARKER
+
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+
+def _run_output(
+    index: int, cumulative_us: int, code: int = 0, package: str = "mypkg"
+) -> list:
+    return [
+        f"{RUN_MARKER} {package} {index} {code}",
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 | site",
+        "import time:       200 |        200 |   json",
+        f"import time:       300 | {cumulative_us:10d} | {package}",
+    ]
+
+
+class TestImportTimeRunnerScore(BaseTestClass):
+    def setUp(self) -> None:
+        super().setUp()
+        self.runner = ImportTimeRunner(bound="<=0.25", runs=3)
+
+    def test_median_of_package_cumulative_time(self) -> None:
+        lines = _run_output(0, 300000) + _run_output(1, 100000) + _run_output(2, 200000)
+        self.assertAlmostEqual(0.2, self.runner._calculate_score(0, lines))
+
+    def test_failed_import_raises(self) -> None:
+        lines = _run_output(0, 300000) + [
+            f"{RUN_MARKER} mypkg 1 1",
+            "ModuleNotFoundError: No module named 'mypkg'",
+        ]
+        with self.assertRaises(ExitEarlyError) as context:
+            self.runner._calculate_score(0, lines)
+        self.assertIn("No module named 'mypkg'", str(context.exception))
+
+    def test_package_is_read_from_the_output(self) -> None:
+        self.runner._build_command("./otherpkg")
+        lines = [
+            *_run_output(0, 100000),
+            "import time:       400 |     400000 | otherpkg",
+        ]
+        self.assertAlmostEqual(0.1, self.runner._calculate_score(0, lines))
+        lines = [
+            *_run_output(0, 300000, package="otherpkg"),
+            "import time:       400 |     400000 | mypkg",
+        ]
+        self.assertAlmostEqual(0.3, self.runner._calculate_score(0, lines))
+
+    def test_no_runs_raises(self) -> None:
+        with self.assertRaises(ExitEarlyError) as context:
+            ImportTimeRunner(package="mypkg", runs=3)._calculate_score(
+                1, ["python: can't open file"]
+            )
+        self.assertIn(" mypkg 3 ", str(context.exception))
+
+    def test_command(self) -> None:
+        command = ImportTimeRunner(runs=4)._build_command("./src/mypkg")
+        self.assertTrue(command.startswith("python "))
+        self.assertIn(" mypkg 4 ", command)
+        self.assertTrue(command.endswith(f'"{os.path.abspath("src")}"'))
+        self.assertIn(
+            " othername ",
+            ImportTimeRunner(package="othername")._build_command("./src/mypkg"),
+        )
+
+    def test_cpu_weight(self) -> None:
+        self.assertEqual(1, ImportTimeRunner().get_cpu_weight())
+        self.assertEqual(
+            os.cpu_count() or 1, ImportTimeRunner(exclusive=True).get_cpu_weight()
+        )
+
+    def test_invalid_runs(self) -> None:
+        with self.assertRaises(ValueError):
+            ImportTimeRunner(runs=0)
+
+
+class TestImportTimeRunner(AsyncBaseTestClass):
+    async def test_bound_is_enforced(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            package = tmp_dir / "slowpkg"
+            package.mkdir()
+            (package / "__init__.py").write_text("import time\ntime.sleep(0.05)\n")
+
+            with CancellableAsyncLayeredCommand() as executor:
+                result = await ImportTimeRunner(bound="<=5", runs=2).run(
+                    str(package),
+                    executor,
+                    env_name="system",
+                    use_system_interpreter=True,
+                )
+                self.assertGreaterEqual(result.score, 0.05)
+                with self.assertRaises(RuntimeError):
+                    await ImportTimeRunner(bound="<=0.01", runs=1).run(
+                        str(package),
+                        executor,
+                        env_name="system",
+                        use_system_interpreter=True,
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 from quickpub import MypyRunner, DefaultPythonProvider, Bound, ExitEarlyError
 
-from tests.base_test_classes import AsyncBaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
 
 TEMP_VENV_NAME: str = "temp_clean_venv"
@@ -142,6 +142,67 @@ class TestMypyRunner(AsyncBaseTestClass):
             with base:
                 await runner.run(target=str(tmp_dir), executor=base, env_name=env_name)
 
+    async def test_daemon_reuses_server_and_cache(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "__init__.py").touch()
+            (tmp_dir / "main.py").write_text('x: int = "a"\n')
+            env_name, base = await self._setup_provider()
+            runner = MypyRunner(bound="<=1", daemon=True, daemon_timeout=60)
+            env_dir = runner.get_env_dir(env_name)
+            assert env_dir is not None
+            status_file = os.path.join(env_dir, "dmypy.json")
+            try:
+                with base:
+                    for _ in range(2):
+                        result = await runner.run(
+                            target=str(tmp_dir), executor=base, env_name=env_name
+                        )
+                        self.assertEqual(1, result.score)
+                self.assertTrue(os.path.isfile(status_file))
+            finally:
+                with base:
+                    await base(
+                        f'{sys.executable} -m mypy.dmypy --status-file "{status_file}" stop',
+                        command_raise_on_fail=False,
+                    )
+
+
+class TestMypyRunnerBuildCommand(BaseTestClass):
+    def test_cache_dir_per_env_and_config(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            (tmp_dir / "mypy.ini").touch()
+            runner = MypyRunner(cache_dir="./cache")
+            configured = MypyRunner(configuration_path="mypy.ini", cache_dir="./cache")
+            env_dirs = {
+                runner.get_env_dir("env"),
+                runner.get_env_dir("other env"),
+                configured.get_env_dir("env"),
+            }
+            self.assertEqual(3, len(env_dirs))
+            command = runner._build_command("./pkg", env_name="env")
+            self.assertIn(f'--cache-dir "{runner.get_env_dir("env")}"', command)
+            self.assertIn("-m mypy --cache-dir", command)
+
+    def test_cache_dir_can_be_disabled(self) -> None:
+        runner = MypyRunner(cache_dir=None)
+        self.assertIsNone(runner.get_env_dir("env"))
+        self.assertNotIn("--cache-dir", runner._build_command("./pkg", env_name="env"))
+
+    def test_daemon_command(self) -> None:
+        runner = MypyRunner(cache_dir="./cache", daemon=True, daemon_timeout=30)
+        command = runner._build_command("./pkg", env_name="env")
+        env_dir = runner.get_env_dir("env")
+        assert env_dir is not None
+        status_file = os.path.join(env_dir, "dmypy.json")
+        self.assertIn(
+            f'-m mypy.dmypy --status-file "{status_file}" run --timeout 30 --', command
+        )
+        self.assertTrue(command.endswith(" ./pkg"))
+
+    def test_daemon_requires_module_invocation(self) -> None:
+        with self.assertRaises(ValueError):
+            MypyRunner(daemon=True, cache_dir=None)
+
 
 #
 # import os.path
@@ -1,9 +1,10 @@
+import json
 import os.path
 import sys
 import unittest
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from quickpub import PylintRunner, DefaultPythonProvider, Bound, ExitEarlyError
 
@@ -142,3 +143,133 @@ class TestPylintRunner(AsyncBaseTestClass):
             runner = PylintRunner(executable_path=exe_path, bound=f"<={NUM_ERRORS}")
             with base:
                 await runner.run(target=str(tmp_dir), executor=base, env_name=env_name)
+
+    async def test_cached_report_is_reused_until_any_file_changes(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            package = tmp_dir / "pkg"
+            package.mkdir()
+            (package / "__init__.py").write_text('"""Package."""\n')
+            (package / "a.py").write_text('"""A."""\n\nVALUE = 1\n')
+            (package / "b.py").write_text("import os\n")
+            env_name, base = await self._setup_provider()
+            runner = PylintRunner(bound=">=0", jobs=2)
+            with base:
+                first = await runner.run(
+                    target=str(package), executor=base, env_name=env_name
+                )
+                cache_path = runner.get_cache_path(env_name)
+                assert cache_path is not None
+                with open(cache_path) as f:
+                    cache = json.load(f)
+                cached_b = cache["files"][str((package / "b.py").resolve())]
+                self.assertEqual(1, cached_b["stats"]["warning"])
+                cache["score"] = 10.0
+                with open(cache_path, "w") as f:
+                    json.dump(cache, f)
+
+                second = await runner.run(
+                    target=str(package), executor=base, env_name=env_name
+                )
+                self.assertEqual(1, second.score)
+
+                (package / "a.py").write_text('"""A."""\n\nVALUE = 2\n')
+                third = await runner.run(
+                    target=str(package), executor=base, env_name=env_name
+                )
+            self.assertLess(first.score, 1)
+            self.assertEqual(first.score, third.score)
+            for result in (first, second, third):
+                self.assertIsNotNone(PylintRunner._parse_report(result.output))
+
+
+class TestPylintRunnerBuildCommand(unittest.TestCase):
+    def test_cached_command(self) -> None:
+        runner = PylintRunner(jobs=3, cache_dir="./cache")
+        command = runner._build_command("./pkg", env_name="env")
+        self.assertIn(f'--cache "{runner.get_cache_path("env")}" --jobs 3', command)
+        self.assertTrue(command.startswith('python "'))
+        self.assertTrue(command.endswith(" ./pkg"))
+        self.assertNotEqual(runner.get_cache_path("env"), runner.get_cache_path("env2"))
+
+    def test_uncached_command(self) -> None:
+        runner = PylintRunner(jobs=2, cache_dir=None)
+        self.assertIsNone(runner.get_cache_path("env"))
+        self.assertTrue(
+            runner._build_command("./pkg", env_name="env").endswith(
+                "-m pylint --jobs 2 ./pkg"
+            )
+        )
+
+    @patch(
+        "quickpub.strategies.implementations.quality_assurance_runners.pylint_qa_runner.os.cpu_count",
+        return_value=6,
+    )
+    def test_jobs_default_to_all_cores(self, _: Any) -> None:
+        self.assertEqual(6, PylintRunner().get_cpu_weight())
+        self.assertEqual(2, PylintRunner(jobs=2).get_cpu_weight())
+        with self.assertRaises(RuntimeError):
+            PylintRunner(jobs=0)
+
+
+JSON2_REPORT: str = """{
+    "messages": [
+        {"type": "convention", "symbol": "missing-module-docstring", "path": "pkg/a.py"},
+        {"type": "warning", "symbol": "unused-import", "path": "pkg/a.py"},
+        {"type": "convention", "symbol": "missing-module-docstring", "path": "pkg/b.py"}
+    ],
+    "statistics": {
+        "messageTypeCount": {"fatal": 0, "error": 0, "warning": 1, "refactor": 0, "convention": 2, "info": 0},
+        "modulesLinted": 2,
+        "score": 7.5
+    }
+}"""
+
+
+class TestPylintRunnerJsonReport(AsyncBaseTestClass):
+    async def test_score_from_json2_report(self) -> None:
+        runner = PylintRunner()
+        self.assertEqual(0.75, runner._calculate_score(16, JSON2_REPORT.splitlines()))
+
+    async def test_file_breakdown(self) -> None:
+        report = json.loads(JSON2_REPORT)
+        self.assertEqual(
+            {
+                "pkg/a.py": {"convention": 1, "warning": 1},
+                "pkg/b.py": {"convention": 1},
+            },
+            PylintRunner.get_file_breakdown(report),
+        )
+
+    async def test_no_statements_scores_perfect(self) -> None:
+        lines = [
+            json.dumps(
+                {
+                    "messages": [],
+                    "statistics": {"messageTypeCount": {}, "score": None},
+                }
+            )
+        ]
+        self.assertEqual(1, PylintRunner()._calculate_score(0, lines))
+
+    async def test_text_report_is_still_supported(self) -> None:
+        lines = [
+            "************* Module pkg.a",
+            "pkg/a.py:1:0: C0114: Missing module docstring (missing-module-docstring)",
+            "",
+            "-----------------------------------",
+            "Your code has been rated at 8.50/10",
+            "",
+        ]
+        self.assertEqual(0.85, PylintRunner()._calculate_score(16, lines))
+
+    async def test_uncached_command_requests_json2_from_pylint_3(self) -> None:
+        runner = PylintRunner(cache_dir=None)
+        for version, expected in (("3.2.0", True), ("2.17.7", False), ("", False)):
+            capabilities = Mock()
+            capabilities.get_distributions = AsyncMock(
+                return_value={"pylint": version} if version else {}
+            )
+            command = await runner._build_command_for_env(
+                "./pkg", Mock(), capabilities, env_name="env"
+            )
+            self.assertEqual(expected, "--output-format=json2" in command)
@@ -1,12 +1,21 @@
+import json
 import unittest
 from typing import List
 
+from quickpub.pytest_probe import RESULT_MARKER
 from quickpub.strategies.implementations.quality_assurance_runners.pytest_qa_runner import (
     PytestRunner,
 )
 from quickpub.enforcers import ExitEarlyError
 
 
+def _report_lines(
+    passed: int = 0, failed: int = 0, errors: int = 0, skipped: int = 0
+) -> List[str]:
+    counts = {"passed": passed, "failed": failed, "errors": errors, "skipped": skipped}
+    return [RESULT_MARKER, json.dumps({"counts": counts, "durations": {}})]
+
+
 class TestPytestCalculateScore(unittest.TestCase):
     """Test cases for PytestRunner._calculate_score method."""
 
@@ -18,92 +27,42 @@ class TestPytestCalculateScore(unittest.TestCase):
 
     def test_perfect_score_all_tests_pass(self) -> None:
         """Test perfect score when all tests pass."""
-        lines = ["============ 5 passed in 2.1s ============"]
-        score = self.runner._calculate_score(0, lines)
+        score = self.runner._calculate_score(0, _report_lines(passed=5))
         self.assertEqual(score, 1.0)
 
     def test_score_with_failures(self) -> None:
         """Test score calculation with failures."""
-        lines = ["============ 2 failed, 10 passed in 5.23s ============"]
-        score = self.runner._calculate_score(1, lines)
-        expected_score = 10 / (10 + 2 + 0)
-        self.assertEqual(score, expected_score)
-
-    def test_score_with_failures_first(self) -> None:
-        """Test score when failed comes before passed."""
-        lines = ["============ 3 failed, 7 passed in 3.5s ============"]
-        score = self.runner._calculate_score(1, lines)
-        expected_score = 7 / (7 + 3 + 0)
-        self.assertEqual(score, expected_score)
-
-    def test_score_with_passed_first(self) -> None:
-        """Test score when passed comes before failed."""
-        lines = ["============ 10 passed, 2 failed in 5.23s ============"]
-        score = self.runner._calculate_score(1, lines)
-        expected_score = 10 / (10 + 2 + 0)
-        self.assertEqual(score, expected_score)
-
-    def test_score_with_skipped_tests(self) -> None:
-        """Test score calculation with skipped tests."""
-        lines = ["============ 247 passed, 3 skipped in 116.62s ============"]
-        score = self.runner._calculate_score(0, lines)
-        expected_score = 247 / (247 + 0 + 3)
-        self.assertEqual(score, expected_score)
+        score = self.runner._calculate_score(1, _report_lines(passed=10, failed=2))
+        self.assertEqual(score, 10 / (10 + 2 + 0))
+
+    def test_errors_count_as_failures(self) -> None:
+        """Test that errored tests are scored like failed ones."""
+        score = self.runner._calculate_score(1, _report_lines(passed=3, errors=1))
+        self.assertEqual(score, 3 / 4)
 
     def test_score_with_skipped_reduces_score(self) -> None:
         """Test that skipped tests reduce the score (not counted as passed)."""
-        lines = ["============ 10 passed, 5 skipped in 2.1s ============"]
-        score = self.runner._calculate_score(0, lines)
-        expected_score = 10 / (10 + 0 + 5)
-        self.assertEqual(score, expected_score)
+        score = self.runner._calculate_score(0, _report_lines(passed=10, skipped=5))
+        self.assertEqual(score, 10 / (10 + 0 + 5))
         self.assertLess(score, 1.0)
 
-    def test_score_with_warnings(self) -> None:
-        """Test score calculation with warnings."""
-        lines = ["============ 100 passed, 1 warning in 10.5s ============"]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 1.0)
-
-    def test_score_with_skipped_and_warnings(self) -> None:
-        """Test score calculation with skipped tests and warnings."""
-        lines = [
-            "============ 247 passed, 3 skipped, 1 warning in 116.62s (0:01:56) ============"
-        ]
-        score = self.runner._calculate_score(0, lines)
-        expected_score = 247 / (247 + 0 + 3)
-        self.assertEqual(score, expected_score)
-
-    def test_score_with_time_in_parentheses(self) -> None:
-        """Test score calculation with time format in parentheses."""
-        lines = ["============ 50 passed in 5.5s (0:00:05) ============"]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 1.0)
-
-    def test_score_with_all_components(self) -> None:
-        """Test score calculation with all components: failed, passed, skipped, warnings, and time."""
-        lines = [
-            "============ 2 failed, 245 passed, 3 skipped, 1 warning in 116.62s (0:01:56) ============"
-        ]
-        score = self.runner._calculate_score(1, lines)
-        expected_score = 245 / (245 + 2 + 3)
-        self.assertEqual(score, expected_score)
-
     def test_score_with_only_failed(self) -> None:
         """Test score calculation with only failed tests."""
-        lines = ["============ 5 failed in 2.1s ============"]
-        score = self.runner._calculate_score(1, lines)
+        score = self.runner._calculate_score(1, _report_lines(failed=5))
         self.assertEqual(score, 0.0)
 
-    def test_no_tests_ran(self) -> None:
-        """Test score when no tests ran."""
-        lines = ["no tests ran"]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 0.5)
+    def test_output_before_the_report_is_ignored(self) -> None:
+        """Test that pytest's own output, summary line included, doesn't affect the score."""
+        lines = [
+            "test_file.py::test_function PASSED",
+            "============ 2 passed in 1.5s ============",
+            *_report_lines(passed=1, failed=1),
+        ]
+        self.assertEqual(self.runner._calculate_score(1, lines), 0.5)
 
-    def test_no_tests_ran_case_insensitive(self) -> None:
-        """Test score when no tests ran (case insensitive)."""
-        lines = ["NO TESTS RAN"]
-        score = self.runner._calculate_score(0, lines)
+    def test_no_tests_collected(self) -> None:
+        """Test score when pytest collected no tests."""
+        score = self.runner._calculate_score(5, _report_lines())
         self.assertEqual(score, 0.5)
 
     def test_no_output_returns_no_output_score(self) -> None:
@@ -112,36 +71,17 @@ class TestPytestCalculateScore(unittest.TestCase):
         score = self.runner._calculate_score(0, lines)
         self.assertEqual(score, 0.0)
 
-    def test_no_passed_or_failed_returns_no_tests_score(self) -> None:
-        """Test score when output has no passed or failed counts."""
-        lines = ["============ in 2.1s ============"]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 0.5)
-
-    def test_malformed_output_raises_exception(self) -> None:
-        """Test that malformed output raises ExitEarlyError."""
-        lines = ["This is not a valid pytest output line"]
-        with self.assertRaises(ExitEarlyError) as context:
-            self.runner._calculate_score(0, lines)
-        self.assertIn("Can't calculate score for pytest", str(context.exception))
-
-    def test_finds_summary_line_from_multiple_lines(self) -> None:
-        """Test that the method finds the summary line from multiple lines of output."""
-        lines = [
-            "test_file.py::test_function PASSED",
-            "test_file.py::test_function2 PASSED",
-            "============ 2 passed in 1.5s ============",
-            "Some other output line",
-        ]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 1.0)
-
-    def test_finds_summary_line_with_warnings_after(self) -> None:
-        """Test that the method finds summary line even when warnings appear after."""
-        lines = [
-            "============ 10 passed in 5.0s ============",
-            "warnings summary",
-            "some warning message",
-        ]
-        score = self.runner._calculate_score(0, lines)
-        self.assertEqual(score, 1.0)
+    def test_missing_report_marker_raises_exception(self) -> None:
+        """Test that output without the probe's report raises ExitEarlyError, even with a pytest summary line."""
+        for lines in (
+            ["This is not a valid pytest output line"],
+            ["============ 5 passed in 2.1s ============"],
+        ):
+            with self.assertRaises(ExitEarlyError) as context:
+                self.runner._calculate_score(0, lines)
+            self.assertIn("no pytest report", str(context.exception))
+
+    def test_malformed_report_raises_exception(self) -> None:
+        """Test that a report line that isn't JSON raises ExitEarlyError."""
+        with self.assertRaises(ExitEarlyError):
+            self.runner._calculate_score(0, [RESULT_MARKER, "not json"])
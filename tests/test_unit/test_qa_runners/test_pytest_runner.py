@@ -1,7 +1,15 @@
+import json
+import sys
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from quickpub import DefaultPythonProvider, PytestRunner, ExitEarlyError
+from quickpub import (
+    DefaultPythonProvider,
+    PytestRunner,
+    ExitEarlyError,
+    PerTestDurationHistory,
+)
+from quickpub.pytest_probe import read_report
 
 from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
@@ -37,11 +45,9 @@ class TestPytestRunner(AsyncBaseTestClass):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
-            """
-            )
+            """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -59,14 +65,12 @@ import pytest
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
         
 def test_add():
     assert 1 + 1 == 2        
-                    """
-            )
+                    """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -83,14 +87,12 @@ def test_add():
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
 
 def test_add():
     assert 1 + 1 == 1        
-                    """
-            )
+                    """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -108,8 +110,7 @@ def test_add():
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
 
 def test_add():
@@ -117,8 +118,7 @@ def test_add():
     
 def test_add2():
     assert 1 + 1 == 2        
-                            """
-            )
+                            """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -134,8 +134,7 @@ def test_add2():
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
 
 def test_add():
@@ -143,8 +142,7 @@ def test_add():
     
 def test_add2():
     assert 1 + 1 == 2        
-                            """
-            )
+                            """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -162,8 +160,7 @@ def test_add2():
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import pytest
 
 def test_add():
@@ -171,8 +168,7 @@ def test_add():
     
 def test_add2():
     assert 1 + 1 == 2         
-                            """
-            )
+                            """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -184,47 +180,179 @@ def test_add2():
                     env_name=env_name,  # type: ignore
                 )
 
-
-class TestPytestRunnerBuildCommand(BaseTestClass):
-
-    @patch(
-        "quickpub.strategies.implementations.quality_assurance_runners.pytest_qa_runner.subprocess.run"
-    )
-    def test_build_command_uses_xdist_when_available(self, mock_run) -> None:
+    async def test_outcomes_and_durations_from_report(self) -> None:
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
-            mock_run.return_value = Mock(returncode=0)
-            runner = PytestRunner()
+            test_file = tmp_dir / TEST_FILE_PATH
+            test_file.write_text("""
+import pytest
 
-            command = runner._build_command(target=str(tmp_dir / "tests"))
+def test_add():
+    assert 1 + 1 == 2
 
-            self.assertIn("-n auto", command)
-            mock_run.assert_called_once()
+def test_fail():
+    assert False
 
-    @patch(
-        "quickpub.strategies.implementations.quality_assurance_runners.pytest_qa_runner.subprocess.run"
-    )
-    def test_build_command_skips_xdist_when_missing(self, mock_run) -> None:
-        with temporary_test_directory() as tmp_dir:
-            (tmp_dir / "__init__.py").touch()
-            mock_run.return_value = Mock(returncode=1)
-            runner = PytestRunner()
+@pytest.mark.skip
+def test_skip():
+    pass
+""")
+            env_name, base = await self._setup_provider()
+            base._instance_flush_stdout = False
+            base._instance_flush_stderr = False
+            history = PerTestDurationHistory(str(tmp_dir / ".quickpub_cache"))
+            runner = PytestRunner(
+                bound=">=0.3",
+                target=str(tmp_dir),
+                output_tail=5,
+                test_durations=history,
+            )
+            with base:  # type: ignore
+                result = await runner.run(
+                    target=str(tmp_dir),
+                    executor=base,  # type: ignore
+                    env_name=env_name,  # type: ignore
+                )
+            self.assertAlmostEqual(1 / 3, result.score)
+            self.assertLessEqual(len(result.output), 7)
+            with open(
+                tmp_dir / ".quickpub_cache" / PerTestDurationHistory.FILE_NAME
+            ) as f:
+                test_ids = list(json.load(f))
+            self.assertEqual(3, len(test_ids))
+            self.assertTrue(
+                any(test_id.endswith("test_foo.test_add") for test_id in test_ids)
+            )
 
-            command = runner._build_command(target=str(tmp_dir / "tests"))
 
-            self.assertNotIn("-n auto", command)
-            mock_run.assert_called_once()
+class TestPytestProbe(BaseTestClass):
+    def test_read_report(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            report = tmp_dir / "report.xml"
+            report.write_text("""<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+<testcase classname="tests.test_a" name="test_pass" time="0.5" />
+<testcase classname="tests.test_a" name="test_fail" time="1.0"><failure message="x" /></testcase>
+<testcase classname="tests.test_a" name="test_teardown" time="0.1"><failure /><error /></testcase>
+<testcase classname="tests.test_a" name="test_skip" time="0"><skipped /></testcase>
+<testcase classname="" name="tests.test_b" time="0.2"><error message="collection failure" /></testcase>
+</testsuite></testsuites>""")
+            counts, durations = read_report(str(report))
+            self.assertEqual(
+                {"passed": 1, "failed": 2, "errors": 1, "skipped": 1}, counts
+            )
+            self.assertEqual(0.5, durations["tests.test_a.test_pass"])
+            self.assertEqual(0.2, durations["tests.test_b"])
 
-    @patch(
-        "quickpub.strategies.implementations.quality_assurance_runners.pytest_qa_runner.subprocess.run"
-    )
-    def test_build_command_respects_configured_workers(self, mock_run) -> None:
+    def test_missing_report(self) -> None:
         with temporary_test_directory() as tmp_dir:
-            (tmp_dir / "__init__.py").touch()
-            mock_run.return_value = Mock(returncode=0)
-            runner = PytestRunner(xdist_workers=4)
+            counts, durations = read_report(str(tmp_dir / "report.xml"))
+            self.assertIsNone(counts)
+            self.assertEqual({}, durations)
+
+    def test_report_line_is_preferred_over_summary(self) -> None:
+        runner = PytestRunner(no_tests_score=0.5)
+        lines = [
+            "============ 5 passed in 2.1s ============",
+            "quickpub-pytest-results",
+            '{"counts": {"passed": 1, "failed": 0, "errors": 1, "skipped": 0}, "durations": {}}',
+        ]
+        self.assertEqual(0.5, runner._calculate_score(1, lines))
+
+    def test_only_no_tests_collected_scores_no_tests_score(self) -> None:
+        runner = PytestRunner(no_tests_score=0.5)
+        empty = [
+            "quickpub-pytest-results",
+            '{"counts": {"passed": 0, "failed": 0, "errors": 0, "skipped": 0}, "durations": {}}',
+        ]
+        self.assertEqual(0.5, runner._calculate_score(5, empty))
+        with self.assertRaises(ExitEarlyError):
+            runner._calculate_score(1, empty)
+
+    def test_missing_report_raises(self) -> None:
+        lines = [
+            "/usr/bin/python: No module named pytest",
+            "quickpub-pytest-results",
+            '{"counts": null, "durations": {}}',
+        ]
+        with self.assertRaises(ExitEarlyError):
+            PytestRunner()._calculate_score(1, lines)
+
+    def test_error_exit_codes_raise(self) -> None:
+        lines = [
+            "ERROR: usage: pytest [options] [file_or_dir]",
+            "quickpub-pytest-results",
+            '{"counts": {"passed": 3, "failed": 0, "errors": 0, "skipped": 0}, "durations": {}}',
+        ]
+        for ret in (2, 3, 4):
+            with self.assertRaises(ExitEarlyError):
+                PytestRunner()._calculate_score(ret, lines)
+
+
+def _capabilities(has_xdist: bool) -> Mock:
+    capabilities = Mock()
+    capabilities.has = AsyncMock(return_value=has_xdist)
+    return capabilities
+
 
-            command = runner._build_command(target=str(tmp_dir / "tests"))
+class TestPytestRunnerBuildCommandForEnv(AsyncBaseTestClass):
+    async def test_build_command_uses_xdist_when_available(self) -> None:
+        capabilities = _capabilities(True)
+        command = await PytestRunner()._build_command_for_env(
+            "./pkg", Mock(), capabilities, env_name="env"
+        )
 
-            self.assertIn("-n 4", command)
-            mock_run.assert_called_once()
+        self.assertIn("-n auto", command)
+        capabilities.has.assert_awaited_once()
+        self.assertEqual("pytest-xdist", capabilities.has.await_args.args[2])
+
+    async def test_env_interpreter_is_probed_and_run(self) -> None:
+        capabilities = _capabilities(True)
+        command = await PytestRunner()._build_command_for_env(
+            "./pkg", Mock(), capabilities, env_name="env"
+        )
+        self.assertTrue(command.startswith("python "))
+        self.assertEqual("python", capabilities.has.await_args.kwargs["python"])
+
+        command = await PytestRunner()._build_command_for_env(
+            "./pkg",
+            Mock(),
+            capabilities,
+            env_name="system",
+            use_system_interpreter=True,
+        )
+        self.assertTrue(command.startswith(sys.executable))
+        self.assertEqual(sys.executable, capabilities.has.await_args.kwargs["python"])
+
+    async def test_build_command_skips_xdist_when_missing(self) -> None:
+        command = await PytestRunner()._build_command_for_env(
+            "./pkg", Mock(), _capabilities(False), env_name="env"
+        )
+
+        self.assertNotIn("-n auto", command)
+
+    async def test_build_command_respects_configured_workers(self) -> None:
+        command = await PytestRunner(xdist_workers=4)._build_command_for_env(
+            "./pkg", Mock(), _capabilities(True), env_name="env"
+        )
+
+        self.assertIn("-n 4", command)
+
+
+class TestPytestRunnerBuildCommand(BaseTestClass):
+    def test_build_command_does_not_spawn_processes(self) -> None:
+        with patch("subprocess.run") as mock_run, patch("subprocess.Popen") as popen:
+            command = PytestRunner()._build_command("./pkg")
+        self.assertNotIn("-n auto", command)
+        mock_run.assert_not_called()
+        popen.assert_not_called()
+
+    def test_cpu_weight_matches_configured_workers(self) -> None:
+        self.assertEqual(PytestRunner(xdist_workers=3).get_cpu_weight(), 3)
+
+    @patch(
+        "quickpub.strategies.implementations.quality_assurance_runners.pytest_qa_runner.os.cpu_count",
+        return_value=6,
+    )
+    def test_cpu_weight_auto_uses_all_cores(self, _) -> None:
+        self.assertEqual(PytestRunner().get_cpu_weight(), 6)
@@ -1,9 +1,16 @@
+import json
 import os
 import unittest
 
-from quickpub import UnittestRunner, DefaultPythonProvider, ExitEarlyError
+from quickpub import (
+    UnittestRunner,
+    DefaultPythonProvider,
+    ExitEarlyError,
+    PerTestDurationHistory,
+)
+from quickpub.unittest_probe import format_summary, split_into_shards
 
-from tests.base_test_classes import AsyncBaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 from tests.test_helpers import temporary_test_directory
 
 TEST_FILE_PATH: str = "test_foo.py"
@@ -44,14 +51,12 @@ class TestUnittestRunner(AsyncBaseTestClass):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
     pass
-                """
-            )
+                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -69,16 +74,14 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
 
     def test_add(self):
         assert 1 + 1 == 2        
-                        """
-            )
+                        """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -94,16 +97,14 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
 
     def test_add(self):
         assert 1 + 1 == 1       
-                        """
-            )
+                        """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -121,8 +122,7 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
@@ -132,8 +132,7 @@ class TestFoo(unittest.TestCase):
         
     def test_add2(self):
         assert 1 + 1 == 1    
-                                """
-            )
+                                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -149,8 +148,7 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
@@ -160,8 +158,7 @@ class TestFoo(unittest.TestCase):
         
     def test_add2(self):
         assert 1 + 1 == 1    
-                                """
-            )
+                                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -179,8 +176,7 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
@@ -190,8 +186,7 @@ class TestFoo(unittest.TestCase):
         
     def test_add2(self):
         assert 1 + 1 == 1    
-                                """
-            )
+                                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -209,8 +204,7 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
@@ -220,8 +214,7 @@ class TestFoo(unittest.TestCase):
 
     def test_add2():
         assert 1 + 1 == 1    
-                                """
-            )
+                                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -241,8 +234,7 @@ class TestFoo(unittest.TestCase):
         with temporary_test_directory() as tmp_dir:
             (tmp_dir / "__init__.py").touch()
             test_file = tmp_dir / TEST_FILE_PATH
-            test_file.write_text(
-                """
+            test_file.write_text("""
 import unittest
 
 class TestFoo(unittest.TestCase):
@@ -255,8 +247,7 @@ class TestFoo(unittest.TestCase):
            
     def test_add3(self):
         assert 1 + 1 == 2  
-                                """
-            )
+                                """)
             env_name, base = await self._setup_provider()
             base._instance_flush_stdout = False
             base._instance_flush_stderr = False
@@ -269,3 +260,81 @@ class TestFoo(unittest.TestCase):
                     executor=base,  # type: ignore
                     env_name=env_name,  # type: ignore
                 )
+
+    async def test_sharded_run(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            for i in range(3):
+                (tmp_dir / f"test_shard_{i}.py").write_text(f"""
+import unittest
+
+class TestShard{i}(unittest.TestCase):
+    def test_pass(self):
+        assert True
+
+    def test_maybe_fail(self):
+        assert {i} != 1
+""")
+            env_name, base = await self._setup_provider()
+            base._instance_flush_stdout = False
+            base._instance_flush_stderr = False
+            history = PerTestDurationHistory(str(tmp_dir / "cache"))
+            runner = UnittestRunner(
+                bound=">=0", target=str(tmp_dir), shards=2, test_durations=history
+            )
+            self.assertEqual(2, runner.get_cpu_weight())
+            with base:  # type: ignore
+                result = await runner.run(
+                    target=str(tmp_dir),
+                    executor=base,  # type: ignore
+                    env_name=env_name,  # type: ignore
+                )
+            self.assertAlmostEqual(5 / 6, result.score)
+            self.assertEqual(
+                2, sum(line.startswith("Shard ") for line in result.output)
+            )
+            with open(history.path) as f:
+                self.assertEqual(6, len(json.load(f)))
+            self.assertIsNotNone(
+                history.get_expected_duration("test_shard_1.TestShard1.test_pass")
+            )
+
+
+class TestUnittestShards(BaseTestClass):
+    def test_classes_are_balanced_by_duration(self) -> None:
+        test_cases = {
+            "a.TestA": ["a.TestA.test_1", "a.TestA.test_2"],
+            "b.TestB": ["b.TestB.test_1"],
+            "c.TestC": ["c.TestC.test_1"],
+        }
+        durations = {
+            "a.TestA.test_1": 1.0,
+            "a.TestA.test_2": 1.0,
+            "b.TestB.test_1": 2.5,
+            "c.TestC.test_1": 0.5,
+        }
+        self.assertEqual(
+            [
+                ["b.TestB.test_1"],
+                ["a.TestA.test_1", "a.TestA.test_2", "c.TestC.test_1"],
+            ],
+            split_into_shards(test_cases, durations, 2),
+        )
+
+    def test_no_more_shards_than_classes(self) -> None:
+        shards = split_into_shards({"a.TestA": ["a.TestA.test_1"]}, {}, 4)
+        self.assertEqual([["a.TestA.test_1"]], shards)
+        self.assertEqual([], split_into_shards({}, {}, 4))
+
+    def test_summary_is_scored_like_unittest_output(self) -> None:
+        counts = {"run": 4, "failures": 1, "errors": 1, "skipped": 1}
+        lines = format_summary(counts, 1.5).splitlines()
+        self.assertEqual(0.5, UnittestRunner()._calculate_score(1, lines))
+        lines = format_summary({"run": 2, "skipped": 1}, 0.1).splitlines()
+        self.assertEqual("OK (skipped=1)", lines[-1])
+        self.assertEqual(1, UnittestRunner()._calculate_score(0, lines))
+
+    def test_invalid_shards(self) -> None:
+        with self.assertRaises(RuntimeError):
+            UnittestRunner(shards=0)
+        with self.assertRaises(RuntimeError):
+            UnittestRunner(shards="many")  # type: ignore
@@ -0,0 +1,198 @@
+import os
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from quickpub import (
+    DefaultPythonProvider,
+    PytestRunner,
+    TestImpactAnalysis,
+    UnittestRunner,
+)
+from quickpub.impact_probe import apply_selection, get_inputs_key, select
+
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
+from tests.test_helpers import temporary_test_directory
+
+SOURCE_A: str = "/project/pkg/a.py"
+SOURCE_B: str = "/project/pkg/b.py"
+TEST_A: str = "/project/tests/test_a.py"
+TEST_B: str = "/project/tests/test_b.py"
+INDEX = {
+    "inputs": "key",
+    "baseline": {SOURCE_A: "a", SOURCE_B: "b", TEST_A: "ta", TEST_B: "tb"},
+    "tests": {
+        TEST_A: [SOURCE_A, TEST_A],
+        TEST_B: [SOURCE_A, SOURCE_B, TEST_B],
+    },
+}
+
+
+class TestSelect(BaseTestClass):
+    def test_unchanged_files_select_nothing(self) -> None:
+        selected, _ = select(INDEX, "key", dict(INDEX["baseline"]))  # type: ignore
+        self.assertEqual([], selected)
+
+    def test_changed_source_selects_its_tests(self) -> None:
+        hashes = dict(INDEX["baseline"], **{SOURCE_B: "changed"})  # type: ignore
+        self.assertEqual([TEST_B], select(INDEX, "key", hashes)[0])
+        hashes = dict(INDEX["baseline"], **{SOURCE_A: "changed"})  # type: ignore
+        self.assertEqual([TEST_A, TEST_B], select(INDEX, "key", hashes)[0])
+
+    def test_changed_test_selects_itself(self) -> None:
+        hashes = dict(INDEX["baseline"], **{TEST_A: "changed"})  # type: ignore
+        self.assertEqual([TEST_A], select(INDEX, "key", hashes)[0])
+
+    def test_stale_index_runs_everything(self) -> None:
+        baseline = dict(INDEX["baseline"])  # type: ignore
+        self.assertIsNone(select(INDEX, "other key", baseline)[0])
+        self.assertIsNone(select({}, "key", baseline)[0])
+        new_file = dict(baseline, **{"/project/pkg/c.py": "c"})
+        self.assertIsNone(select(INDEX, "key", new_file)[0])
+        unexercised = dict(INDEX, tests={TEST_A: [SOURCE_A, TEST_A]})
+        self.assertIsNone(
+            select(unexercised, "key", dict(baseline, **{SOURCE_B: "changed"}))[0]
+        )
+
+    def test_upgraded_distribution_runs_everything(self) -> None:
+        key = get_inputs_key("pytest", ["pytest"], [], ["dep==1.0", "pytest==8.0"])
+        upgraded = get_inputs_key("pytest", ["pytest"], [], ["dep==1.1", "pytest==8.0"])
+        self.assertNotEqual(key, upgraded)
+        index = dict(INDEX, inputs=key)
+        baseline = dict(INDEX["baseline"])  # type: ignore
+        self.assertEqual([], select(index, key, baseline)[0])
+        self.assertIsNone(select(index, upgraded, baseline)[0])
+
+    def test_apply_selection(self) -> None:
+        tests = os.path.abspath("tests")
+        self.assertEqual(
+            ["pytest", "-q", os.path.join(tests, "sub", "test_a.py")],
+            apply_selection(
+                "pytest",
+                ["pytest", "-q", "./tests"],
+                [os.path.join(tests, "sub", "test_a.py")],
+                tests,
+            ),
+        )
+
+    def test_apply_selection_names_unittest_tests(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            tests = str(tmp_dir.resolve() / "tests")
+            os.makedirs(os.path.join(tests, "impact_sub"))
+            Path(tests, "impact_sub", "__init__.py").touch()
+            Path(tests, "impact_sub", "test_impact_selected.py").write_text(
+                "import unittest\n\n\n"
+                "class TestSelected(unittest.TestCase):\n"
+                "    def test_one(self):\n        pass\n\n"
+                "    def test_two(self):\n        pass\n"
+            )
+            Path(tests, "test_impact_broken.py").write_text("import missing_module\n")
+            try:
+                self.assertEqual(
+                    [
+                        "unittest",
+                        "impact_sub.test_impact_selected.TestSelected.test_one",
+                        "impact_sub.test_impact_selected.TestSelected.test_two",
+                        "test_impact_broken",
+                    ],
+                    apply_selection(
+                        "unittest",
+                        ["unittest", "discover", "-s", "./tests"],
+                        [
+                            os.path.join(
+                                tests, "impact_sub", "test_impact_selected.py"
+                            ),
+                            os.path.join(tests, "test_impact_broken.py"),
+                        ],
+                        tests,
+                    ),
+                )
+            finally:
+                sys.path.remove(tests)
+                for module in list(sys.modules):
+                    if module.startswith(("impact_sub", "test_impact_")):
+                        del sys.modules[module]
+
+
+def _write_project(root: Path) -> None:
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").touch()
+    (root / "pkg" / "a.py").write_text("def fa():\n    return 1\n")
+    (root / "pkg" / "b.py").write_text("def fb():\n    return 2\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_a.py").write_text(
+        "import unittest\nfrom pkg.a import fa\n\n\n"
+        "class TestA(unittest.TestCase):\n"
+        "    def test_a(self):\n        self.assertEqual(1, fa())\n"
+    )
+    (root / "tests" / "test_b.py").write_text(
+        "import unittest\nfrom pkg.b import fb\n\n\n"
+        "class TestB(unittest.TestCase):\n"
+        "    def test_b(self):\n        self.assertEqual(2, fb())\n"
+    )
+
+
+class TestTestImpactAnalysis(AsyncBaseTestClass):
+    async def _setup_provider(self) -> Tuple:
+        async for name, base in DefaultPythonProvider():
+            base.prev = None
+            base._instance_flush_stdout = False  # type: ignore
+            base._instance_flush_stderr = False  # type: ignore
+            return name, base
+        raise RuntimeError("No Python provider found")
+
+    async def _assert_affected_tests_run(self, runner_class: type) -> List[List[str]]:
+        with temporary_test_directory() as tmp_dir:
+            _write_project(tmp_dir)
+            env_name, base = await self._setup_provider()
+            impact = TestImpactAnalysis("./pkg", cache_dir=str(tmp_dir / "cache"))
+            runner = runner_class(bound=">=1", target="./tests", test_impact=impact)
+            reports, outputs = [], []
+            for change in (None, "b.py", None):
+                if change is not None:
+                    with open(tmp_dir / "pkg" / change, "a") as f:
+                        f.write("# changed\n")
+                with base:  # type: ignore
+                    result = await runner.run(
+                        target="./pkg", executor=base, env_name=env_name
+                    )
+                self.assertEqual(1, result.score)
+                outputs.append(result.output)
+                report = TestImpactAnalysis.read_report(result.output)
+                assert report is not None
+                reports.append(report)
+            self.assertEqual(
+                ["full", "selected", "skipped"], [r["mode"] for r in reports]
+            )
+            self.assertEqual(
+                [str((tmp_dir / "tests" / "test_b.py").resolve())],
+                reports[1]["tests"],
+            )
+        return outputs
+
+    async def test_pytest_runs_affected_tests(self) -> None:
+        await self._assert_affected_tests_run(PytestRunner)
+
+    async def test_unittest_runs_affected_tests(self) -> None:
+        outputs = await self._assert_affected_tests_run(UnittestRunner)
+        self.assertIn("Ran 2 tests", [line.split(" in ")[0] for line in outputs[0]])
+        self.assertIn("Ran 1 test", [line.split(" in ")[0] for line in outputs[1]])
+
+    async def test_failed_run_keeps_changes_selected(self) -> None:
+        with temporary_test_directory() as tmp_dir:
+            _write_project(tmp_dir)
+            env_name, base = await self._setup_provider()
+            impact = TestImpactAnalysis("./pkg", cache_dir=str(tmp_dir / "cache"))
+            runner = PytestRunner(bound=">=0", target="./tests", test_impact=impact)
+            scores = []
+            for source in (None, "def fb():\n    return 3\n", None):
+                if source is not None:
+                    (tmp_dir / "pkg" / "b.py").write_text(source)
+                with base:  # type: ignore
+                    result = await runner.run(
+                        target="./pkg", executor=base, env_name=env_name
+                    )
+                scores.append(result.score)
+                report = TestImpactAnalysis.read_report(result.output)
+            self.assertEqual([1, 0, 0], scores)
+            self.assertEqual("selected", report["mode"])  # type: ignore
@@ -1,10 +1,14 @@
+import asyncio
 import logging
+import math
 import unittest
+from typing import List
 from unittest.mock import patch
 
-from quickpub.worker_pool import WorkerPool
+from quickpub import ExitEarlyError
+from quickpub.worker_pool import CpuBudget, WorkerPool
 
-from tests.base_test_classes import BaseTestClass
+from tests.base_test_classes import AsyncBaseTestClass, BaseTestClass
 
 
 class TestWorkerPool(BaseTestClass):
@@ -41,5 +45,131 @@ class TestWorkerPool(BaseTestClass):
         )
 
 
+class TestWorkerPoolFailFast(AsyncBaseTestClass):
+    async def _run_pool(self, fail_fast: bool) -> List[str]:
+        completed: List[str] = []
+
+        async def fail() -> None:
+            raise ExitEarlyError("failed")
+
+        async def slow(name: str) -> None:
+            await asyncio.sleep(0.5)
+            completed.append(name)
+
+        pool = WorkerPool("test", num_workers=2, fail_fast=fail_fast, cpu_budget=2)
+        await pool.submit(slow, args=["in-flight"], name="in-flight")
+        await pool.submit(fail, name="fail")
+        await pool.submit(slow, args=["queued"], name="queued")
+        await pool.start()
+        await pool.join()
+        self.assertEqual(pool.cancelled, fail_fast)
+        return completed
+
+    async def test_without_fail_fast_all_tasks_complete(self) -> None:
+        completed = await self._run_pool(fail_fast=False)
+        self.assertEqual(sorted(completed), ["in-flight", "queued"])
+
+    async def test_fail_fast_cancels_in_flight_and_queued_tasks(self) -> None:
+        completed = await asyncio.wait_for(self._run_pool(fail_fast=True), 0.4)
+        self.assertEqual(completed, [])
+
+    async def test_cancel_is_idempotent(self) -> None:
+        pool = WorkerPool("test", num_workers=1)
+        pool.cancel("first")
+        pool.cancel("second")
+        await pool.start()
+        await pool.join()
+        self.assertTrue(pool.cancelled)
+
+
+class TestWorkerPoolCpuBudget(AsyncBaseTestClass):
+    async def test_weight_is_capped_at_total(self) -> None:
+        budget = CpuBudget(2)
+        self.assertEqual(await budget.acquire(8), 2)
+        self.assertEqual(budget.available, 0)
+        await budget.release(2)
+        self.assertEqual(budget.available, 2)
+
+    async def test_non_positive_budget_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            CpuBudget(0)
+
+    async def test_worker_count_defaults_to_cpu_budget(self) -> None:
+        self.assertEqual(WorkerPool("test", cpu_budget=3)._num_workers, 3)
+
+    async def test_heavy_task_does_not_overlap_light_tasks(self) -> None:
+        running: List[str] = []
+        overlaps: List[List[str]] = []
+
+        async def task(name: str) -> None:
+            running.append(name)
+            overlaps.append(list(running))
+            await asyncio.sleep(0.05)
+            running.remove(name)
+
+        pool = WorkerPool("test", cpu_budget=2)
+        await pool.submit(task, args=["light1"], name="light1")
+        await pool.submit(task, args=["heavy"], name="heavy", weight=2)
+        await pool.submit(task, args=["light2"], name="light2")
+        await pool.start()
+        await pool.join()
+        self.assertEqual(len(overlaps), 3)
+        for snapshot in overlaps:
+            if "heavy" in snapshot:
+                self.assertEqual(snapshot, ["heavy"])
+
+    async def test_waiters_are_served_in_arrival_order(self) -> None:
+        budget = CpuBudget(2)
+        await budget.acquire(2)
+        heavy = asyncio.ensure_future(budget.acquire(2))
+        await asyncio.sleep(0)
+        light = asyncio.ensure_future(budget.acquire(1))
+        await asyncio.sleep(0)
+
+        await budget.release(1)
+        await asyncio.sleep(0)
+        self.assertFalse(heavy.done())
+        self.assertFalse(light.done())
+
+        await budget.release(1)
+        await asyncio.sleep(0)
+        self.assertTrue(heavy.done())
+        self.assertFalse(light.done())
+
+        await budget.release(2)
+        self.assertEqual(await light, 1)
+        self.assertEqual(budget.available, 1)
+
+    async def test_cancelled_waiter_does_not_block_the_queue(self) -> None:
+        budget = CpuBudget(2)
+        await budget.acquire(1)
+        heavy = asyncio.ensure_future(budget.acquire(2))
+        await asyncio.sleep(0)
+        light = asyncio.ensure_future(budget.acquire(1))
+        await asyncio.sleep(0)
+        self.assertFalse(light.done())
+
+        heavy.cancel()
+        self.assertEqual(await light, 1)
+        self.assertEqual(budget.available, 0)
+
+
+class TestWorkerPoolPriority(AsyncBaseTestClass):
+    async def test_higher_priority_starts_first(self) -> None:
+        started: List[str] = []
+
+        async def task(name: str) -> None:
+            started.append(name)
+
+        pool = WorkerPool("test", cpu_budget=1)
+        await pool.submit(task, args=["short"], name="short", priority=1)
+        await pool.submit(task, args=["unknown"], name="unknown", priority=math.inf)
+        await pool.submit(task, args=["long"], name="long", priority=10)
+        await pool.submit(task, args=["also short"], name="also short", priority=1)
+        await pool.start()
+        await pool.join()
+        self.assertEqual(started, ["unknown", "long", "short", "also short"])
+
+
 if __name__ == "__main__":
     unittest.main()